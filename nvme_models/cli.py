@@ -37,7 +37,12 @@ def cli(ctx, config):
     """
     ctx.ensure_object(dict)
     ctx.obj['config'] = load_config(config)
-    ctx.obj['storage'] = NVMeStorageManager(ctx.obj['config'].to_dict())
+    # Start verify's mount and disk checks while the command loads. The tree
+    # walk is left out: most runs are not --deep, and a deep run overlaps it
+    # with the other checks anyway
+    ctx.obj['storage'] = NVMeStorageManager(ctx.obj['config'].to_dict(),
+                                            prefetch=ctx.invoked_subcommand == 'verify',
+                                            prefetch_scan=False)
 
 
 @cli.command()
@@ -197,8 +202,10 @@ def download(ctx, model_id, provider, revision, token, no_verify_mount):
               default='text', help='Output format')
 @click.option('--no-verify-mount', is_flag=True, default=False,
               help='Skip NVMe mount verification')
+@click.option('--deep', is_flag=True, default=False,
+              help='Walk the tree for directory sizes and model counts')
 @click.pass_context
-def verify(ctx, format, no_verify_mount):
+def verify(ctx, format, no_verify_mount, deep):
     """Verify NVMe storage configuration.
     
     Checks:
@@ -206,7 +213,7 @@ def verify(ctx, format, no_verify_mount):
     - Directory structure
     - Environment variables
     - Disk usage
-    - Downloaded models
+    - Downloaded models (with --deep)
     """
     storage = ctx.obj['storage']
     
@@ -217,7 +224,7 @@ def verify(ctx, format, no_verify_mount):
             sys.exit(1)
     
     with console.status("[bold green]Verifying configuration...") as status:
-        results = storage.verify(output_format=format)
+        results = storage.verify(output_format=format, deep=deep)
     
     if format == 'json':
         # Output JSON
@@ -284,8 +291,10 @@ def verify(ctx, format, no_verify_mount):
             console.print(f"  Available: {usage['available_gb']}GB")
         
         # Model count
-        model_count = summary.get('model_files_found', 0)
-        if model_count > 0:
+        model_count = summary.get('model_files_found')
+        if model_count is None:
+            console.print("\n[dim]Model files: (not computed — use --deep)[/dim]")
+        elif model_count > 0:
             console.print(f"\n[green]Found {model_count} model files[/green]")
         else:
             console.print("\n[yellow]No model files found yet[/yellow]")
@@ -306,8 +315,10 @@ def verify(ctx, format, no_verify_mount):
               default='all', help='Filter by provider')
 @click.option('--no-verify-mount', is_flag=True, default=False,
               help='Skip NVMe mount verification')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Ignore cached Ollama/vLLM listings and rescan')
 @click.pass_context
-def list_models(ctx, provider, no_verify_mount):
+def list_models(ctx, provider, no_verify_mount, no_cache):
     """List downloaded models.
     
     Shows all downloaded models with their sizes and providers.
@@ -331,12 +342,12 @@ def list_models(ctx, provider, no_verify_mount):
     if provider in ['all', 'ollama']:
         from .models.ollama import OllamaHandler
         ollama_handler = OllamaHandler(ctx.obj['config'].to_dict())
-        all_models.extend(ollama_handler.list_models())
+        all_models.extend(ollama_handler.list_models(refresh=no_cache))
     
     if provider in ['all', 'vllm']:
         from .models.vllm import VLLMHandler
         vllm_handler = VLLMHandler(ctx.obj['config'].to_dict())
-        all_models.extend(vllm_handler.list_models())
+        all_models.extend(vllm_handler.list_models(refresh=no_cache))
     
     if not all_models:
         console.print("[yellow]No models found[/yellow]")
@@ -536,7 +547,8 @@ def info(ctx, model_name, provider, no_verify_mount):
     # Show model info if available
     if 'model_info' in results:
         console.print("\n[bold]Model Details:[/bold]")
-        console.print(results['model_info'])
+        # ollama show output contains brackets such as "[/INST]", not markup
+        console.print(results['model_info'], markup=False, highlight=False)
     
     # Overall status
     status_msg = {
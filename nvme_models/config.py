@@ -1,9 +1,10 @@
 """Configuration module for NVMe model storage."""
 
 import os
+import json
 import yaml
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ class Config:
         'storage': {
             'nvme_path': '/mnt/nvme',
             'require_mount': True,
+            'trust_path': False,
             'min_free_space_gb': 50
         },
         'providers': {
@@ -32,7 +34,8 @@ class Config:
             },
             'ollama': {
                 'models_dir': '${nvme_path}/ollama',
-                'default_tag': 'latest'
+                'default_tag': 'latest',
+                'api_url': 'http://localhost:11434'
             },
             'vllm': {
                 'models_dir': '${nvme_path}/models',
@@ -60,6 +63,7 @@ class Config:
         self.config_path = config_path
         self.config = self._load_config()
         self._substitute_variables()
+        self._flat = self._flatten()
         self._setup_logging()
     
     def _load_config(self) -> Dict:
@@ -68,7 +72,8 @@ class Config:
         Returns:
             Dict: Configuration dictionary
         """
-        config = self.DEFAULT_CONFIG.copy()
+        # Fresh deep copy so nested sections are never shared with DEFAULT_CONFIG
+        config = json.loads(_DEFAULT_JSON)
         
         # Try to load from file
         if self.config_path and Path(self.config_path).exists():
@@ -198,21 +203,54 @@ class Config:
         
         # Add file handler if log file is specified
         if log_file:
+            # Skip if an earlier Config already attached a handler for this file
+            root_logger = logging.getLogger()
+            existing = {getattr(h, 'baseFilename', None) for h in root_logger.handlers}
+            if os.path.abspath(log_file) in existing:
+                return
+            
             try:
                 log_path = Path(log_file)
                 log_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                file_handler = logging.FileHandler(log_file)
+                # delay=True defers open() until the first record is written
+                file_handler = logging.FileHandler(log_file, delay=True)
                 file_handler.setFormatter(
                     logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
                 )
-                logging.getLogger().addHandler(file_handler)
+                root_logger.addHandler(file_handler)
             except Exception as e:
                 logger.warning(f"Failed to set up file logging: {e}")
     
+    def _flatten(self) -> Dict[Tuple[str, ...], Any]:
+        """Build a flat lookup table of the leaf values in the configuration.
+        
+        Sections are not indexed: a stored reference would keep serving a
+        dictionary that ``self.config`` no longer holds, so get() reads them
+        from the live tree instead.
+        
+        Returns:
+            Dict mapping key-path tuples to leaf values
+        """
+        flat = {}
+        stack = [((), self.config)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                path = prefix + (key,)
+                if isinstance(value, dict):
+                    stack.append((path, value))
+                else:
+                    flat[path] = value
+        return flat
+    
     def get(self, *keys: str, default: Any = None) -> Any:
         """Get a configuration value by key path.
         
+        Leaf values come from a table that set() rebuilds, so a leaf
+        assigned directly into ``self.config`` is not seen until the next
+        set(). Sections are always the live dictionaries.
+        
         Args:
             *keys: Path to configuration value
             default: Default value if not found
@@ -220,13 +258,19 @@ class Config:
         Returns:
             Configuration value or default
         """
-        current = self.config
+        if self._flat is None:
+            self._flat = self._flatten()
+        try:
+            return self._flat[keys]
+        except KeyError:
+            pass
+        
+        node = self.config
         for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
+            if not isinstance(node, dict) or key not in node:
                 return default
-        return current
+            node = node[key]
+        return node
     
     def set(self, *keys: str, value: Any):
         """Set a configuration value by key path.
@@ -247,6 +291,9 @@ class Config:
         
         # Set the value
         current[keys[-1]] = value
+        
+        # Rebuild the flat lookup table on next get()
+        self._flat = None
     
     def save(self, path: Optional[str] = None):
         """Save configuration to file.
@@ -292,6 +339,10 @@ class Config:
         return self.config.copy()
 
 
+# Serialized once at import; json.loads is a cheap C-level deep copy
+_DEFAULT_JSON = json.dumps(Config.DEFAULT_CONFIG)
+
+
 def load_config(config_path: Optional[str] = None) -> Config:
     """Load configuration from file or defaults.
     
@@ -1,32 +1,46 @@
 """Model provider handlers."""
 
+from importlib import import_module
 from typing import Optional, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Provider name -> (submodule, handler class name)
+_PROVIDERS = {
+    'hf': ('huggingface', 'HuggingFaceHandler'),
+    'huggingface': ('huggingface', 'HuggingFaceHandler'),
+    'ollama': ('ollama', 'OllamaHandler'),
+    'vllm': ('vllm', 'VLLMHandler'),
+}
+
+# Handler classes resolved so far, keyed by provider name
+_HANDLERS: Dict[str, type] = {}
+
 
 def get_provider_handler(provider: str, config: Dict):
     """Get the appropriate provider handler.
     
+    Handler modules are imported on first use and the resolved class is
+    cached, so repeated lookups skip the import machinery.
+    
     Args:
         provider: Provider name ('hf', 'ollama', 'vllm')
         config: Configuration dictionary
-        
+    
     Returns:
         Provider handler instance or None
     """
     provider = provider.lower()
     
-    if provider in ['hf', 'huggingface']:
-        from .huggingface import HuggingFaceHandler
-        return HuggingFaceHandler(config)
-    elif provider == 'ollama':
-        from .ollama import OllamaHandler
-        return OllamaHandler(config)
-    elif provider == 'vllm':
-        from .vllm import VLLMHandler
-        return VLLMHandler(config)
-    else:
-        logger.error(f"Unknown provider: {provider}")
-        return None
\ No newline at end of file
+    handler_cls = _HANDLERS.get(provider)
+    if handler_cls is None:
+        target = _PROVIDERS.get(provider)
+        if target is None:
+            logger.error(f"Unknown provider: {provider}")
+            return None
+        module_name, class_name = target
+        handler_cls = getattr(import_module(f'.{module_name}', __name__), class_name)
+        _HANDLERS[provider] = handler_cls
+    
+    return handler_cls(config)
@@ -0,0 +1,97 @@
+"""On-disk cache for provider model listings."""
+
+import os
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'nvme_models'
+DEFAULT_CACHE_TTL = 300
+
+
+class _CacheMixin:
+    """Stores one JSON entry per provider under ``CACHE_DIR``.
+    
+    Entries are tagged with a caller-supplied key (typically a directory
+    mtime) and a timestamp; a lookup only hits when the key still matches
+    and the entry is younger than the TTL. Setting ``<PROVIDER>_DISABLE_CACHE``
+    in the environment bypasses the cache entirely.
+    """
+    
+    _cache_provider = ''
+    
+    def _cache_enabled(self) -> bool:
+        """Check whether caching is enabled for this provider."""
+        flag = os.environ.get(f'{self._cache_provider.upper()}_DISABLE_CACHE', '')
+        return flag.lower() in ('', '0', 'false', 'no')
+    
+    def _cache_file(self) -> Path:
+        """Return the cache file path for this provider."""
+        return CACHE_DIR / f'{self._cache_provider}.json'
+    
+    def _cache_get(self, key: Any, ttl: float = DEFAULT_CACHE_TTL) -> Optional[Any]:
+        """Return the cached value for ``key`` if present and fresh.
+        
+        Args:
+            key: JSON-serializable validity key
+            ttl: Maximum age of the entry in seconds
+        
+        Returns:
+            Cached value, or None on miss
+        """
+        if not self._cache_enabled():
+            return None
+        
+        try:
+            with open(self._cache_file(), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if entry.get('key') != key or time.time() - entry.get('time', 0) > ttl:
+            return None
+        
+        return entry.get('value')
+    
+    def _cache_set(self, key: Any, value: Any) -> None:
+        """Store ``value`` under ``key``, replacing any previous entry.
+        
+        Args:
+            key: JSON-serializable validity key
+            value: JSON-serializable value
+        """
+        if not self._cache_enabled():
+            return
+        
+        cache_file = self._cache_file()
+        temp_file = cache_file.with_name(f'.{cache_file.name}.{os.getpid()}')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w') as f:
+                json.dump({'key': key, 'time': time.time(), 'value': value}, f)
+            os.replace(temp_file, cache_file)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Could not write {self._cache_provider} cache: {e}")
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+    
+    def _cache_clear(self) -> None:
+        """Drop the cached entry for this provider."""
+        try:
+            self._cache_file().unlink()
+        except OSError:
+            pass
+
+
+def _mtime_ns(path) -> int:
+    """Return the modification time of ``path`` in ns, or 0 if it is missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
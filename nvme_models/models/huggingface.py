@@ -8,24 +8,74 @@ from pathlib import Path
 from typing import Dict, Optional
 import logging
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 
 from ..validators import Validator, ValidationError, SecurityValidator
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson's C codec for model metadata files when it is installed
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _dir_size(path) -> Optional[int]:
+    """Get the total size in bytes of all files under a directory.
+    
+    Walks the tree with ``os.scandir`` so directory entries carry their
+    file type and only regular files are stat'ed. Symlinked files count
+    at their target size; symlinked directories are not descended into.
+    
+    Args:
+        path: Directory path
+        
+    Returns:
+        int: Size in bytes, or None if the directory could not be walked
+    """
+    total = 0
+    stack = [os.fspath(path)]
+    try:
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        total += entry.stat().st_size
+    except OSError as e:
+        logger.debug(f"Could not compute size of {path}: {e}")
+        return None
+    return total
+
 
 class HuggingFaceHandler:
     """Handles HuggingFace model operations."""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, models_dir: Optional[str] = None):
         """Initialize HuggingFace handler.
         
         Args:
             config: Configuration dictionary
+            models_dir: Override for the configured models directory
         """
         self.config = config
         self.cache_dir = Path(config['providers']['huggingface']['cache_dir'])
-        self.models_dir = Path(config['providers']['huggingface']['models_dir'])
+        self.models_dir = Path(models_dir or config['providers']['huggingface']['models_dir'])
         self.use_symlinks = config['providers']['huggingface'].get('use_symlinks', False)
         self.resume_downloads = config['providers']['huggingface'].get('resume_downloads', True)
         
@@ -56,8 +106,6 @@ class HuggingFaceHandler:
             raise
         try:
             # Try to get model info from HuggingFace API
-            import requests
-            
             api_url = f"https://huggingface.co/api/models/{model_id}"
             response = requests.get(api_url, timeout=10)
             
@@ -146,11 +194,11 @@ class HuggingFaceHandler:
             temp_dir.mkdir(parents=True, exist_ok=True)
             
             try:
-                # Run download command
-                result = subprocess.run(
+                # Run download command; stderr is only read if it fails
+                subprocess.run(
                     cmd,
-                    capture_output=True,
-                    text=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
                     check=True
                 )
                 
@@ -164,26 +212,24 @@ class HuggingFaceHandler:
                 
                 # Create model info file
                 info_file = target_dir / 'model_info.json'
-                with open(info_file, 'w') as f:
-                    import time
-                    json.dump({
+                with open(info_file, 'wb') as f:
+                    f.write(_json_dumps({
                         'model_id': model_id,
                         'revision': revision,
                         'provider': 'huggingface',
                         'download_date': time.ctime()
-                    }, f, indent=2)
+                    }))
                 
                 logger.info(f"Successfully downloaded {model_id} to {target_dir}")
                 
                 # Report size
-                size = sum(f.stat().st_size for f in target_dir.rglob('*') if f.is_file())
-                size_gb = size / (1024**3)
+                size_gb = (_dir_size(target_dir) or 0) / (1024**3)
                 logger.info(f"Model size: {size_gb:.2f} GB")
                 
                 return True
                 
             except subprocess.CalledProcessError as e:
-                logger.error(f"Download failed: {e.stderr}")
+                logger.error(f"Download failed: {e.stderr.decode('utf-8', 'replace')}")
                 # Clean up temp directory
                 if temp_dir.exists():
                     shutil.rmtree(temp_dir)
@@ -207,32 +253,38 @@ class HuggingFaceHandler:
         if not self.models_dir.exists():
             return models
         
-        for model_dir in self.models_dir.iterdir():
-            if model_dir.is_dir() and not model_dir.name.startswith('.'):
-                model_info = {
-                    'name': model_dir.name,
-                    'path': str(model_dir),
-                    'provider': 'huggingface'
-                }
-                
-                # Try to read model info file
-                info_file = model_dir / 'model_info.json'
-                if info_file.exists():
-                    try:
-                        with open(info_file, 'r') as f:
-                            stored_info = json.load(f)
-                            model_info.update(stored_info)
-                    except:
-                        pass
-                
-                # Calculate size
+        model_dirs = [
+            d for d in self.models_dir.iterdir()
+            if d.is_dir() and not d.name.startswith('.')
+        ]
+        if not model_dirs:
+            return models
+        
+        # Size directories concurrently; stat() releases the GIL
+        with ThreadPoolExecutor(max_workers=min(16, len(model_dirs))) as executor:
+            sizes = dict(zip(model_dirs, executor.map(_dir_size, model_dirs)))
+        
+        for model_dir in model_dirs:
+            model_info = {
+                'name': model_dir.name,
+                'path': str(model_dir),
+                'provider': 'huggingface'
+            }
+            
+            # Try to read model info file
+            info_file = model_dir / 'model_info.json'
+            if info_file.exists():
                 try:
-                    size = sum(f.stat().st_size for f in model_dir.rglob('*') if f.is_file())
-                    model_info['size_gb'] = round(size / (1024**3), 2)
+                    with open(info_file, 'rb') as f:
+                        stored_info = _json_loads(f.read())
+                        model_info.update(stored_info)
                 except:
-                    model_info['size_gb'] = 0
-                
-                models.append(model_info)
+                    pass
+            
+            size = sizes[model_dir]
+            model_info['size_gb'] = round(size / (1024**3), 2) if size is not None else 0
+            
+            models.append(model_info)
         
         return models
     
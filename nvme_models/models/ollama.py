@@ -1,20 +1,89 @@
 """Ollama model provider handler."""
 
 import os
+import re
+import asyncio
 import subprocess
 import json
+import time
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# The ollama client is optional; run_batch falls back to threaded HTTP calls
+try:
+    from ollama import AsyncClient
+except ImportError:
+    AsyncClient = None
 
 from ..validators import Validator, ValidationError, SecurityValidator
+from ._cache import _CacheMixin, _mtime_ns
 
 logger = logging.getLogger(__name__)
 
+# Common Ollama model sizes in GB (quantized), keyed by (family, parameter count)
+_OLLAMA_SIZE_TABLE = {
+    ('llama2', '7b'): 4, ('llama2', '13b'): 8, ('llama2', '70b'): 40,
+    ('llama3', '8b'): 5, ('llama3', '70b'): 40,
+    ('mistral', '7b'): 4,
+    ('mixtral', '8x7b'): 26, ('mixtral', '8x22b'): 65,
+    ('codellama', '7b'): 4, ('codellama', '13b'): 8, ('codellama', '34b'): 20, ('codellama', '70b'): 40,
+    ('phi', '2.7b'): 2,
+    ('gemma', '2b'): 2, ('gemma', '7b'): 5,
+    ('qwen', '0.5b'): 1, ('qwen', '1.8b'): 2, ('qwen', '4b'): 3, ('qwen', '7b'): 5,
+    ('qwen', '14b'): 9, ('qwen', '32b'): 20, ('qwen', '72b'): 42,
+}
+
+# Family name followed (anywhere later) by a parameter count such as 7b, 2.7b or 8x7b
+_OLLAMA_SIZE_RE = re.compile(
+    r'(codellama|llama2|llama3|mistral|mixtral|phi|gemma|qwen).*?(\d+(?:\.\d+)?(?:x\d+)?b)'
+)
+
+# Shared across handler instances so the API connection is kept alive
+_session = requests.Session()
+
+
+def _show_summary(info: Dict) -> str:
+    """Render an /api/show response in the layout of ``ollama show``.
+    
+    License, template, modelfile and tensor metadata are left out, so the
+    HTTP path yields the same kind of text as the CLI fallback.
+    
+    Args:
+        info: /api/show response
+        
+    Returns:
+        str: Model details and parameters
+    """
+    details = info.get('details') or {}
+    model_info = info.get('model_info') or {}
+    architecture = model_info.get('general.architecture') or details.get('family')
+    rows = [
+        ('architecture', architecture),
+        ('parameters', details.get('parameter_size')),
+        ('context length', model_info.get(f'{architecture}.context_length')),
+        ('quantization', details.get('quantization_level')),
+    ]
+    lines = ['  Model']
+    lines.extend(f'    {key:<20}{value}' for key, value in rows if value)
+    
+    parameters = [line.strip() for line in (info.get('parameters') or '').splitlines() if line.strip()]
+    if parameters:
+        lines.extend(['', '  Parameters'])
+        for line in parameters:
+            key, _, value = line.partition(' ')
+            lines.append(f'    {key:<20}{value.strip()}')
+    return '\n'.join(lines)
 
-class OllamaHandler:
+
+class OllamaHandler(_CacheMixin):
     """Handles Ollama model operations."""
     
+    _cache_provider = 'ollama'
+    
     def __init__(self, config: Dict):
         """Initialize Ollama handler.
         
@@ -24,6 +93,9 @@ class OllamaHandler:
         self.config = config
         self.models_dir = Path(config['providers']['ollama']['models_dir'])
         self.default_tag = config['providers']['ollama'].get('default_tag', 'latest')
+        self.api_url = config['providers']['ollama'].get('api_url', 'http://localhost:11434').rstrip('/')
+        self._session = _session
+        self._service_ok_until = 0.0
         
         # Ensure directory exists
         self.models_dir.mkdir(parents=True, exist_ok=True)
@@ -49,46 +121,67 @@ class OllamaHandler:
             raise
         # Ollama models are typically quantized, so smaller than raw weights
         model_lower = model_name.lower()
+        if ':' not in model_lower:
+            model_lower = f"{model_lower}:{self.default_tag}"
         
-        # Extract size from model name
-        if ':' in model_lower:
-            base_model, tag = model_lower.split(':', 1)
-        else:
-            base_model = model_lower
-            tag = self.default_tag
-        
-        # Common Ollama model sizes (quantized)
-        size_map = {
-            'llama2': {'7b': 4, '13b': 8, '70b': 40},
-            'llama3': {'8b': 5, '70b': 40},
-            'mistral': {'7b': 4},
-            'mixtral': {'8x7b': 26, '8x22b': 65},
-            'codellama': {'7b': 4, '13b': 8, '34b': 20, '70b': 40},
-            'phi': {'2.7b': 2},
-            'gemma': {'2b': 2, '7b': 5},
-            'qwen': {'0.5b': 1, '1.8b': 2, '4b': 3, '7b': 5, '14b': 9, '32b': 20, '72b': 42}
-        }
-        
-        # Try to match model name
-        for model_family, sizes in size_map.items():
-            if model_family in base_model:
-                for size_str, size_gb in sizes.items():
-                    if size_str in tag or size_str in base_model:
-                        return size_gb
+        match = _OLLAMA_SIZE_RE.search(model_lower)
+        if match:
+            size_gb = _OLLAMA_SIZE_TABLE.get(match.groups())
+            if size_gb is not None:
+                return size_gb
         
         # Fallback to pattern-based estimation
         return Validator.estimate_model_size(model_name, 'ollama')
     
+    def _api_get(self, path: str) -> Dict:
+        """Issue a GET request against the Ollama HTTP API.
+        
+        Args:
+            path: API path relative to the base URL (e.g., 'api/tags')
+            
+        Returns:
+            Dict: Decoded JSON response
+        """
+        response = self._session.get(f"{self.api_url}/{path}", timeout=5)
+        response.raise_for_status()
+        return response.json()
+    
     def check_ollama_service(self) -> bool:
         """Check if Ollama service is running.
         
+        A successful check is trusted for two seconds, so the nested checks
+        made by a single command (e.g. verify_model -> list_models) only
+        probe the service once.
+        
+        Returns:
+            bool: True if service is running, False otherwise
+        """
+        if time.monotonic() < self._service_ok_until:
+            return True
+        
+        running = self._probe_ollama_service()
+        self._service_ok_until = time.monotonic() + 2.0 if running else 0.0
+        return running
+    
+    def _probe_ollama_service(self) -> bool:
+        """Probe the Ollama API, falling back to the CLI if it is unreachable.
+        
         Returns:
             bool: True if service is running, False otherwise
         """
+        try:
+            return self._session.get(self.api_url, timeout=1).status_code < 500
+        except requests.ConnectionError:
+            pass
+        except requests.RequestException:
+            return False
+        
+        # API not reachable at the configured URL; let the CLI resolve the host
         try:
             result = subprocess.run(
                 ['ollama', 'list'],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=5
             )
             return result.returncode == 0
@@ -113,9 +206,18 @@ class OllamaHandler:
                 start_new_session=True
             )
             
-            # Wait a moment for service to start
-            import time
-            time.sleep(2)
+            # Poll for readiness with exponential backoff rather than a fixed wait
+            deadline = time.monotonic() + 10
+            delay = 0.05
+            while time.monotonic() < deadline:
+                try:
+                    if self._session.get(self.api_url, timeout=0.5).status_code < 500:
+                        self._service_ok_until = time.monotonic() + 2.0
+                        return True
+                except requests.RequestException:
+                    pass
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
             
             return self.check_ollama_service()
             
@@ -156,33 +258,39 @@ class OllamaHandler:
             
             logger.info(f"Pulling Ollama model: {model_name}")
             
-            # Run ollama pull command
-            result = subprocess.run(
+            # Run ollama pull command, streaming progress instead of buffering it
+            process = subprocess.Popen(
                 ['ollama', 'pull', model_name],
-                capture_output=True,
-                text=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1
             )
             
-            if result.returncode == 0:
+            last_line = ''
+            for line in process.stderr:
+                line = line.strip()
+                if line:
+                    logger.debug(f"ollama pull: {line}")
+                    last_line = line
+            process.wait()
+            
+            if process.returncode == 0:
                 logger.info(f"Successfully pulled {model_name}")
+                self._cache_clear()
                 
                 # Try to get actual model size
-                list_result = subprocess.run(
-                    ['ollama', 'list'],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if list_result.returncode == 0:
-                    for line in list_result.stdout.split('\n'):
-                        if model_name in line:
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                logger.info(f"Model size: {parts[1]}")
+                try:
+                    for model in self._api_get('api/tags').get('models', []):
+                        if model.get('name') == model_name:
+                            logger.info(f"Model size: {model.get('size', 0) / (1024**3):.2f} GB")
+                            break
+                except (requests.RequestException, ValueError):
+                    pass
                 
                 return True
             else:
-                logger.error(f"Failed to pull model: {result.stderr}")
+                logger.error(f"Failed to pull model: {last_line}")
                 return False
                 
         except ValidationError as e:
@@ -192,63 +300,90 @@ class OllamaHandler:
             logger.error(f"Unexpected error during pull: {e}")
             return False
     
-    def list_models(self) -> List[Dict]:
+    def _cache_key(self) -> List:
+        """Return the listing cache key for the Ollama store.
+        
+        Pulls and removals add or unlink blobs, bumping the mtime of the
+        blobs directory, so one stat validates the cache.
+        """
+        return [self.api_url, str(self.models_dir), _mtime_ns(self.models_dir / 'blobs')]
+    
+    def list_models(self, refresh: bool = False) -> List[Dict]:
         """List Ollama models.
         
+        Args:
+            refresh: Ignore any cached listing and query the service
+        
         Returns:
             list: List of model information dictionaries
         """
         models = []
         
         try:
+            # Checked before the cache so a stopped service never lists models
             if not self.check_ollama_service():
                 logger.warning("Ollama service is not running")
                 return models
             
-            result = subprocess.run(
-                ['ollama', 'list'],
-                capture_output=True,
-                text=True
-            )
+            cache_key = self._cache_key()
+            if not refresh:
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
             
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                
-                # Skip header line
-                if len(lines) > 1:
-                    for line in lines[1:]:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            model_info = {
-                                'name': parts[0],
-                                'size': parts[1] if len(parts) > 1 else 'unknown',
-                                'provider': 'ollama',
-                                'path': str(self.models_dir)
-                            }
-                            
-                            # Try to parse size to GB
-                            size_str = parts[1] if len(parts) > 1 else ''
-                            if 'GB' in size_str:
-                                try:
-                                    model_info['size_gb'] = float(size_str.replace('GB', ''))
-                                except:
-                                    pass
-                            elif 'MB' in size_str:
-                                try:
-                                    model_info['size_gb'] = float(size_str.replace('MB', '')) / 1024
-                                except:
-                                    pass
-                            
-                            # Add modified time if available
-                            if len(parts) >= 4:
-                                model_info['modified'] = ' '.join(parts[3:])
-                            
-                            models.append(model_info)
+            try:
+                data = self._api_get('api/tags')
+            except requests.ConnectionError:
+                # The CLI listing has no sizes and is empty on failure, so it is not cached
+                return self._list_models_cli()
+            
+            for model in data.get('models', []):
+                details = model.get('details') or {}
+                models.append({
+                    'name': model['name'],
+                    'size_gb': round(model.get('size', 0) / (1024**3), 2),
+                    'parameter_size': details.get('parameter_size'),
+                    'quantization': details.get('quantization_level'),
+                    'modified': model.get('modified_at'),
+                    'provider': 'ollama',
+                    'path': str(self.models_dir)
+                })
+            
+            self._cache_set(cache_key, models)
         except Exception as e:
             logger.error(f"Failed to list Ollama models: {e}")
         
         return models
     
+    def _list_models_cli(self) -> List[Dict]:
+        """List Ollama model names from ``ollama list`` output.
+        
+        Used only when the HTTP API cannot be reached. The CLI table carries
+        sizes only as human-readable strings, so just the names are taken.
+        
+        Returns:
+            list: List of model information dictionaries
+        """
+        result = subprocess.run(
+            ['ollama', 'list'],
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            return []
+        
+        # Skip header line; the name is always the first column
+        return [
+            {
+                'name': line.split(None, 1)[0],
+                'provider': 'ollama',
+                'path': str(self.models_dir)
+            }
+            for line in result.stdout.splitlines()[1:]
+            if line.strip()
+        ]
+    
     def delete_model(self, model_name: str) -> bool:
         """Delete an Ollama model.
         
@@ -272,15 +407,16 @@ class OllamaHandler:
             
             result = subprocess.run(
                 ['ollama', 'rm', model_name],
-                capture_output=True,
-                text=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             
             if result.returncode == 0:
                 logger.info(f"Successfully deleted {model_name}")
+                self._cache_clear()
                 return True
             else:
-                logger.error(f"Failed to delete model: {result.stderr}")
+                logger.error(f"Failed to delete model: {result.stderr.decode('utf-8', 'replace')}")
                 return False
                 
         except Exception as e:
@@ -310,35 +446,189 @@ class OllamaHandler:
                 logger.error("Ollama service is not running")
                 return None
             
-            # Build command
-            cmd = ['ollama', 'run']
+            return ''.join(self._stream_generate(model_name, prompt, **kwargs)).strip()
+            
+        except requests.Timeout:
+            logger.error("Model inference timed out")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to run model: {e}")
+            return None
+    
+    def run_model_stream(self, model_name: str, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream inference output from an Ollama model as it is generated.
+        
+        Args:
+            model_name: Model name to run
+            prompt: Input prompt
+            **kwargs: Additional parameters (temperature, max_tokens, timeout)
+            
+        Returns:
+            Iterator[str]: Response fragments in generation order. Transport
+            errors are raised from the iterator as ``requests`` exceptions.
+        """
+        # Validate model name
+        try:
+            SecurityValidator.validate_model_id(model_name, provider='ollama')
+            logger.debug(f"Model name validation successful for: {model_name}")
+        except ValidationError as e:
+            logger.error(f"Model name validation failed for {model_name}: {e}")
+            raise
+        return self._stream_generate(model_name, prompt, **kwargs)
+    
+    def _stream_generate(self, model_name: str, prompt: str, **kwargs) -> Iterator[str]:
+        """Yield response fragments from a streaming /api/generate call."""
+        with self._session.post(
+            f"{self.api_url}/api/generate",
+            json={
+                'model': model_name,
+                'prompt': prompt,
+                'stream': True,
+                'options': self._generate_options(kwargs)
+            },
+            stream=True,
+            timeout=kwargs.get('timeout', 60)
+        ) as response:
+            response.raise_for_status()
             
-            # Add parameters
-            if 'temperature' in kwargs:
-                cmd.extend(['--temperature', str(kwargs['temperature'])])
+            # NDJSON: one object per newline-terminated line; the last line
+            # may lack its terminator, which iter_lines still yields
+            for line in response.iter_lines(delimiter=b'\n'):
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if 'error' in chunk:
+                    raise RuntimeError(chunk['error'])
+                yield chunk.get('response', '')
+                if chunk.get('done'):
+                    break
+    
+    def _generate_options(self, kwargs: Dict) -> Dict:
+        """Build the Ollama ``options`` payload from run parameters."""
+        options = {}
+        if kwargs.get('temperature') is not None:
+            options['temperature'] = kwargs['temperature']
+        if kwargs.get('max_tokens') is not None:
+            options['num_predict'] = kwargs['max_tokens']
+        return options
+    
+    async def _arun_one(self, client, model_name: str, prompt: str, **kwargs) -> Optional[str]:
+        """Run a single prompt through the async Ollama client."""
+        try:
+            response = await client.generate(
+                model=model_name,
+                prompt=prompt,
+                options=self._generate_options(kwargs)
+            )
+            return response['response']
+        except Exception as e:
+            logger.error(f"Batch prompt failed for {model_name}: {e}")
+            return None
+    
+    async def _arun_batch(self, model_name: str, prompts: List[str], **kwargs) -> List[Optional[str]]:
+        """Run all prompts concurrently on one async client."""
+        client = AsyncClient(host=self.api_url, timeout=kwargs.get('timeout', 60))
+        return await asyncio.gather(
+            *[self._arun_one(client, model_name, prompt, **kwargs) for prompt in prompts]
+        )
+    
+    def _run_one_http(self, model_name: str, prompt: str, **kwargs) -> Optional[str]:
+        """Run a single prompt through /api/generate without streaming."""
+        try:
+            response = self._session.post(
+                f"{self.api_url}/api/generate",
+                json={
+                    'model': model_name,
+                    'prompt': prompt,
+                    'stream': False,
+                    'options': self._generate_options(kwargs)
+                },
+                timeout=kwargs.get('timeout', 60)
+            )
+            response.raise_for_status()
+            return response.json()['response']
+        except Exception as e:
+            logger.error(f"Batch prompt failed for {model_name}: {e}")
+            return None
+    
+    def run_batch(self, model_name: str, prompts: List[str], **kwargs) -> List[Optional[str]]:
+        """Run inference for several prompts concurrently.
+        
+        Requests are issued together so the server can interleave them; how
+        many actually run in parallel is governed by the server's
+        ``OLLAMA_NUM_PARALLEL`` setting. Uses the ``ollama`` package's
+        AsyncClient when installed, otherwise concurrent HTTP requests. Must
+        not be called from a running event loop.
+        
+        Args:
+            model_name: Model name to run
+            prompts: Input prompts
+            **kwargs: Additional parameters (temperature, max_tokens, timeout)
+            
+        Returns:
+            list: Model output per prompt, in order; None for failed prompts
+        """
+        # Validate model name
+        try:
+            SecurityValidator.validate_model_id(model_name, provider='ollama')
+            logger.debug(f"Model name validation successful for: {model_name}")
+        except ValidationError as e:
+            logger.error(f"Model name validation failed for {model_name}: {e}")
+            raise
+        
+        if not prompts:
+            return []
+        
+        if not self.check_ollama_service():
+            logger.error("Ollama service is not running")
+            return [None] * len(prompts)
+        
+        if AsyncClient is not None:
+            return asyncio.run(self._arun_batch(model_name, prompts, **kwargs))
+        
+        with ThreadPoolExecutor(max_workers=min(16, len(prompts))) as executor:
+            return list(executor.map(
+                lambda prompt: self._run_one_http(model_name, prompt, **kwargs), prompts
+            ))
+    
+    def _show(self, model_name: str) -> Optional[Dict]:
+        """Fetch model details from the /api/show endpoint.
+        
+        Args:
+            model_name: Model name to look up
             
-            cmd.extend([model_name, prompt])
+        Returns:
+            Dict: Model details, or None if the model does not exist
+        """
+        response = self._session.post(
+            f"{self.api_url}/api/show",
+            json={'name': model_name},
+            timeout=10
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+    
+    def _show_cli(self, model_name: str) -> Optional[str]:
+        """Fetch model details from ``ollama show`` output.
+        
+        Args:
+            model_name: Model name to look up
             
-            # Run command
+        Returns:
+            str: Command output, or None if it failed
+        """
+        try:
             result = subprocess.run(
-                cmd,
+                ['ollama', 'show', model_name],
                 capture_output=True,
                 text=True,
-                timeout=kwargs.get('timeout', 60)
+                timeout=30
             )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logger.error(f"Model run failed: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Model inference timed out")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to run model: {e}")
+        except (subprocess.TimeoutExpired, FileNotFoundError):
             return None
+        return result.stdout if result.returncode == 0 else None
     
     def verify_model(self, model_name: str) -> Dict:
         """Verify an Ollama model.
@@ -377,9 +667,15 @@ class OllamaHandler:
             'message': 'Ollama service is running'
         })
         
-        # Check if model exists
-        models = self.list_models()
-        model_found = any(m['name'] == model_name for m in models)
+        # Check if model exists; /api/show also returns its details
+        try:
+            show = self._show(model_name)
+            model_found = show is not None
+            model_info = _show_summary(show) if model_found else None
+        except requests.RequestException:
+            # API unavailable; fall back to the CLI listing and ollama show
+            model_found = any(m['name'] == model_name for m in self.list_models())
+            model_info = self._show_cli(model_name) if model_found else None
         
         if model_found:
             results['checks'].append({
@@ -388,29 +684,19 @@ class OllamaHandler:
                 'message': f'Model {model_name} is available'
             })
             
-            # Try to get model info
-            try:
-                result = subprocess.run(
-                    ['ollama', 'show', model_name],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode == 0:
-                    results['checks'].append({
-                        'check': 'info',
-                        'status': 'passed',
-                        'message': 'Model information retrieved successfully'
-                    })
-                    results['model_info'] = result.stdout
-                else:
-                    results['checks'].append({
-                        'check': 'info',
-                        'status': 'warning',
-                        'message': 'Could not retrieve model information'
-                    })
-            except:
-                pass
+            if model_info is not None:
+                results['checks'].append({
+                    'check': 'info',
+                    'status': 'passed',
+                    'message': 'Model information retrieved successfully'
+                })
+                results['model_info'] = model_info
+            else:
+                results['checks'].append({
+                    'check': 'info',
+                    'status': 'warning',
+                    'message': 'Could not retrieve model information'
+                })
             
             results['status'] = 'success'
         else:
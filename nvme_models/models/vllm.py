@@ -1,20 +1,137 @@
 """vLLM model provider handler."""
 
 import os
-import json
 import shutil
 from pathlib import Path
 from typing import Dict, Optional, List
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import yaml
 
 from ..validators import Validator, ValidationError, SecurityValidator
+from ._cache import _CacheMixin, _mtime_ns
+from .huggingface import HuggingFaceHandler, _dir_size, _json_loads
 
 logger = logging.getLogger(__name__)
 
+# Prefer libyaml's C emitter when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YAMLDumper
+except ImportError:
+    from yaml import SafeDumper as _YAMLDumper
+
+# Model architectures known to be served by vLLM
+_VLLM_SUPPORTED_ARCHS = frozenset({
+    'LlamaForCausalLM',
+    'MistralForCausalLM',
+    'GPT2LMHeadModel',
+    'GPTNeoXForCausalLM',
+    'FalconForCausalLM',
+    'MPTForCausalLM',
+    'BaichuanForCausalLM',
+    'QWenLMHeadModel'
+})
+
+# Check status severity, and the overall status for each severity
+_CHECK_RANK = {'passed': 0, 'warning': 1, 'failed': 2}
+_OVERALL_STATUS = ('success', 'warning', 'error')
+
+# Files that mark a model directory's weights and tokenizer
+_WEIGHT_SUFFIXES = ('.safetensors', '.bin', '.pt')
+_TOKENIZER_FILES = frozenset({'tokenizer.json', 'tokenizer_config.json', 'tokenizer.model'})
+
+
+@lru_cache(maxsize=64, typed=True)
+def _render_deployment_yaml(model_name: str, image: str, replicas: int,
+                            gpu_memory_utilization: float, tensor_parallel_size: int,
+                            gpu_count: int) -> str:
+    """Render the Kubernetes deployment manifest for a vLLM model.
+    
+    Bulk exports tend to repeat the same parameters, so rendered manifests
+    are memoized. The cache is typed because 1, 1.0 and True compare equal
+    but render differently.
+    
+    Args:
+        model_name: Model directory name
+        image: vLLM container image
+        replicas: Number of replicas
+        gpu_memory_utilization: Fraction of GPU memory vLLM may use
+        tensor_parallel_size: Tensor parallel degree
+        gpu_count: GPUs requested per pod
+        
+    Returns:
+        str: Deployment YAML
+    """
+    deployment = {
+        'apiVersion': 'apps/v1',
+        'kind': 'Deployment',
+        'metadata': {
+            'name': f'vllm-{model_name}',
+            'labels': {
+                'app': 'vllm',
+                'model': model_name
+            }
+        },
+        'spec': {
+            'replicas': replicas,
+            'selector': {
+                'matchLabels': {
+                    'app': 'vllm',
+                    'model': model_name
+                }
+            },
+            'template': {
+                'metadata': {
+                    'labels': {
+                        'app': 'vllm',
+                        'model': model_name
+                    }
+                },
+                'spec': {
+                    'containers': [{
+                        'name': 'vllm',
+                        'image': image,
+                        'args': [
+                            '--model', f'/mnt/nvme/models/{model_name}',
+                            '--gpu-memory-utilization', str(gpu_memory_utilization),
+                            '--tensor-parallel-size', str(tensor_parallel_size)
+                        ],
+                        'ports': [{
+                            'containerPort': 8000,
+                            'name': 'http'
+                        }],
+                        'volumeMounts': [{
+                            'name': 'nvme-storage',
+                            'mountPath': '/mnt/nvme'
+                        }],
+                        'resources': {
+                            'limits': {
+                                'nvidia.com/gpu': gpu_count
+                            }
+                        }
+                    }],
+                    'volumes': [{
+                        'name': 'nvme-storage',
+                        'hostPath': {
+                            'path': '/mnt/nvme',
+                            'type': 'Directory'
+                        }
+                    }]
+                }
+            }
+        }
+    }
+    
+    return yaml.dump(deployment, Dumper=_YAMLDumper, default_flow_style=False)
+
 
-class VLLMHandler:
+class VLLMHandler(_CacheMixin):
     """Handles vLLM model operations."""
     
+    _cache_provider = 'vllm'
+    
     def __init__(self, config: Dict):
         """Initialize vLLM handler.
         
@@ -71,18 +188,68 @@ class VLLMHandler:
         except ValidationError as e:
             logger.error(f"Model ID validation failed for {model_id}: {e}")
             raise
-        from .huggingface import HuggingFaceHandler
+        # Create a temporary HF handler that downloads into the vLLM models dir
+        hf_handler = HuggingFaceHandler(self.config, models_dir=str(self.models_dir))
+        success = hf_handler.download(model_id, **kwargs)
+        if success:
+            self._cache_clear()
+        return success
+    
+    def _scan_one(self, model_dir: Path) -> Dict:
+        """Collect listing information for a single model directory.
+        
+        Args:
+            model_dir: Model directory path
+            
+        Returns:
+            Dict: Model information
+        """
+        model_info = {
+            'name': model_dir.name,
+            'path': str(model_dir),
+            'provider': 'vllm'
+        }
         
-        # Create a temporary HF handler with vLLM paths
-        hf_config = self.config.copy()
-        hf_config['providers']['huggingface']['models_dir'] = str(self.models_dir)
+        # Check for vLLM compatibility
+        config_file = model_dir / 'config.json'
+        if config_file.exists():
+            try:
+                config = _json_loads(config_file.read_bytes())
+                model_info['model_type'] = config.get('model_type', 'unknown')
+                model_info['architectures'] = config.get('architectures', [])
+                
+                # Check if model is vLLM compatible
+                model_info['vllm_compatible'] = any(
+                    arch in _VLLM_SUPPORTED_ARCHS
+                    for arch in model_info['architectures']
+                )
+                
+            except Exception as e:
+                logger.debug(f"Could not read config for {model_dir.name}: {e}")
         
-        hf_handler = HuggingFaceHandler(hf_config)
-        return hf_handler.download(model_id, **kwargs)
+        # Calculate size
+        size = _dir_size(str(model_dir))
+        model_info['size_gb'] = round(size / (1024**3), 2) if size is not None else 0
+        
+        return model_info
     
-    def list_models(self) -> List[Dict]:
+    def _cache_key(self) -> List:
+        """Return the listing cache key for the models directory.
+        
+        The directory mtime changes whenever a model is added, removed or
+        renamed, so one stat validates the cache. Changes inside an existing
+        model directory are not seen; use ``list_models(refresh=True)``.
+        """
+        return [str(self.models_dir), _mtime_ns(self.models_dir)]
+    
+    def list_models(self, refresh: bool = False) -> List[Dict]:
         """List vLLM-compatible models.
         
+        Model directories are scanned concurrently; results are ordered by name.
+        
+        Args:
+            refresh: Ignore any cached listing and rescan
+        
         Returns:
             list: List of model information dictionaries
         """
@@ -91,60 +258,36 @@ class VLLMHandler:
         if not self.models_dir.exists():
             return models
         
-        for model_dir in self.models_dir.iterdir():
-            if model_dir.is_dir() and not model_dir.name.startswith('.'):
-                model_info = {
-                    'name': model_dir.name,
-                    'path': str(model_dir),
-                    'provider': 'vllm'
-                }
-                
-                # Check for vLLM compatibility
-                config_file = model_dir / 'config.json'
-                if config_file.exists():
-                    try:
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
-                            model_info['model_type'] = config.get('model_type', 'unknown')
-                            model_info['architectures'] = config.get('architectures', [])
-                            
-                            # Check if model is vLLM compatible
-                            supported_architectures = [
-                                'LlamaForCausalLM',
-                                'MistralForCausalLM',
-                                'GPT2LMHeadModel',
-                                'GPTNeoXForCausalLM',
-                                'FalconForCausalLM',
-                                'MPTForCausalLM',
-                                'BaichuanForCausalLM',
-                                'QWenLMHeadModel'
-                            ]
-                            
-                            is_compatible = any(
-                                arch in supported_architectures 
-                                for arch in model_info['architectures']
-                            )
-                            model_info['vllm_compatible'] = is_compatible
-                            
-                    except Exception as e:
-                        logger.debug(f"Could not read config for {model_dir.name}: {e}")
-                
-                # Calculate size
-                try:
-                    size = sum(f.stat().st_size for f in model_dir.rglob('*') if f.is_file())
-                    model_info['size_gb'] = round(size / (1024**3), 2)
-                except:
-                    model_info['size_gb'] = 0
-                
-                models.append(model_info)
+        cache_key = self._cache_key()
+        if not refresh:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
         
+        with os.scandir(self.models_dir) as entries:
+            model_dirs = sorted(
+                (entry for entry in entries
+                 if entry.is_dir() and not entry.name.startswith('.')),
+                key=lambda entry: entry.name
+            )
+        
+        if model_dirs:
+            # Scans are dominated by stat/open latency, so threads overlap well
+            with ThreadPoolExecutor(max_workers=min(16, len(model_dirs))) as executor:
+                models = list(executor.map(
+                    self._scan_one, [Path(entry.path) for entry in model_dirs]
+                ))
+        
+        self._cache_set(cache_key, models)
         return models
     
-    def verify_model(self, model_name: str) -> Dict:
+    def verify_model(self, model_name: str, cached_info: Optional[Dict] = None) -> Dict:
         """Verify a model for vLLM compatibility.
         
         Args:
             model_name: Model directory name
+            cached_info: This model's entry from list_models(); if it carries
+                architectures, config.json is not parsed again
             
         Returns:
             Dict: Verification results
@@ -163,6 +306,14 @@ class VLLMHandler:
         
         model_path = self.models_dir / model_name
         
+        # Track the worst check status as checks are added
+        worst = 0
+        
+        def add_check(check: Dict) -> None:
+            nonlocal worst
+            results['checks'].append(check)
+            worst = max(worst, _CHECK_RANK[check['status']])
+        
         # Check if model directory exists
         if not model_path.exists():
             results['status'] = 'error'
@@ -173,115 +324,100 @@ class VLLMHandler:
             })
             return results
         
-        results['checks'].append({
+        add_check({
             'check': 'exists',
             'status': 'passed',
             'message': f'Model directory exists: {model_path}'
         })
         
+        # Classify the directory contents in a single pass
+        try:
+            with os.scandir(model_path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        
         # Check for required files
-        required_files = ['config.json']
-        for file_name in required_files:
-            file_path = model_path / file_name
-            if file_path.exists():
-                results['checks'].append({
-                    'check': f'file_{file_name}',
-                    'status': 'passed',
-                    'message': f'{file_name} found'
-                })
-            else:
-                results['checks'].append({
-                    'check': f'file_{file_name}',
-                    'status': 'failed',
-                    'message': f'{file_name} not found'
-                })
+        has_config = 'config.json' in names
+        if has_config:
+            add_check({
+                'check': 'file_config.json',
+                'status': 'passed',
+                'message': 'config.json found'
+            })
+        else:
+            add_check({
+                'check': 'file_config.json',
+                'status': 'failed',
+                'message': 'config.json not found'
+            })
         
         # Check vLLM compatibility
         config_file = model_path / 'config.json'
-        if config_file.exists():
+        if has_config:
             try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                
-                architectures = config.get('architectures', [])
-                supported = [
-                    'LlamaForCausalLM',
-                    'MistralForCausalLM',
-                    'GPT2LMHeadModel',
-                    'GPTNeoXForCausalLM',
-                    'FalconForCausalLM',
-                    'MPTForCausalLM',
-                    'BaichuanForCausalLM',
-                    'QWenLMHeadModel'
-                ]
+                if cached_info is not None and 'architectures' in cached_info:
+                    architectures = cached_info['architectures']
+                else:
+                    config = _json_loads(config_file.read_bytes())
+                    architectures = config.get('architectures', [])
                 
-                is_compatible = any(arch in supported for arch in architectures)
+                is_compatible = any(arch in _VLLM_SUPPORTED_ARCHS for arch in architectures)
                 
                 if is_compatible:
-                    results['checks'].append({
+                    add_check({
                         'check': 'vllm_compatibility',
                         'status': 'passed',
                         'message': f'Model architecture supported: {architectures}'
                     })
                 else:
-                    results['checks'].append({
+                    add_check({
                         'check': 'vllm_compatibility',
                         'status': 'warning',
                         'message': f'Model architecture may not be supported: {architectures}'
                     })
                     
             except Exception as e:
-                results['checks'].append({
+                add_check({
                     'check': 'vllm_compatibility',
                     'status': 'warning',
                     'message': f'Could not check compatibility: {e}'
                 })
         
         # Check for model weights
-        weight_files = list(model_path.glob('*.safetensors')) + \
-                      list(model_path.glob('*.bin')) + \
-                      list(model_path.glob('*.pt'))
+        weight_count = sum(
+            1 for name in names
+            if name.endswith(_WEIGHT_SUFFIXES) and not name.startswith('.')
+        )
         
-        if weight_files:
-            results['checks'].append({
+        if weight_count:
+            add_check({
                 'check': 'weights',
                 'status': 'passed',
-                'message': f'Found {len(weight_files)} weight files'
+                'message': f'Found {weight_count} weight files'
             })
         else:
-            results['checks'].append({
+            add_check({
                 'check': 'weights',
                 'status': 'failed',
                 'message': 'No model weight files found'
             })
         
         # Check for tokenizer
-        tokenizer_files = ['tokenizer.json', 'tokenizer_config.json', 'tokenizer.model']
-        tokenizer_found = any((model_path / f).exists() for f in tokenizer_files)
-        
-        if tokenizer_found:
-            results['checks'].append({
+        if not names.isdisjoint(_TOKENIZER_FILES):
+            add_check({
                 'check': 'tokenizer',
                 'status': 'passed',
                 'message': 'Tokenizer files found'
             })
         else:
-            results['checks'].append({
+            add_check({
                 'check': 'tokenizer',
                 'status': 'warning',
                 'message': 'Tokenizer files not found (may use remote tokenizer)'
             })
         
-        # Determine overall status
-        failed = any(c['status'] == 'failed' for c in results['checks'])
-        warnings = any(c['status'] == 'warning' for c in results['checks'])
-        
-        if failed:
-            results['status'] = 'error'
-        elif warnings:
-            results['status'] = 'warning'
-        else:
-            results['status'] = 'success'
+        results['status'] = _OVERALL_STATUS[worst]
         
         return results
     
@@ -343,69 +479,16 @@ class VLLMHandler:
             logger.error(f"Model name validation failed for {model_name}: {e}")
             raise
         try:
-            deployment = {
-                'apiVersion': 'apps/v1',
-                'kind': 'Deployment',
-                'metadata': {
-                    'name': f'vllm-{model_name}',
-                    'labels': {
-                        'app': 'vllm',
-                        'model': model_name
-                    }
-                },
-                'spec': {
-                    'replicas': kwargs.get('replicas', 1),
-                    'selector': {
-                        'matchLabels': {
-                            'app': 'vllm',
-                            'model': model_name
-                        }
-                    },
-                    'template': {
-                        'metadata': {
-                            'labels': {
-                                'app': 'vllm',
-                                'model': model_name
-                            }
-                        },
-                        'spec': {
-                            'containers': [{
-                                'name': 'vllm',
-                                'image': kwargs.get('image', 'vllm/vllm-openai:latest'),
-                                'args': [
-                                    '--model', f'/mnt/nvme/models/{model_name}',
-                                    '--gpu-memory-utilization', str(kwargs.get('gpu_memory_utilization', 0.9)),
-                                    '--tensor-parallel-size', str(kwargs.get('tensor_parallel_size', 1))
-                                ],
-                                'ports': [{
-                                    'containerPort': 8000,
-                                    'name': 'http'
-                                }],
-                                'volumeMounts': [{
-                                    'name': 'nvme-storage',
-                                    'mountPath': '/mnt/nvme'
-                                }],
-                                'resources': {
-                                    'limits': {
-                                        'nvidia.com/gpu': kwargs.get('gpu_count', 1)
-                                    }
-                                }
-                            }],
-                            'volumes': [{
-                                'name': 'nvme-storage',
-                                'hostPath': {
-                                    'path': '/mnt/nvme',
-                                    'type': 'Directory'
-                                }
-                            }]
-                        }
-                    }
-                }
-            }
-            
-            import yaml
+            rendered = _render_deployment_yaml(
+                model_name,
+                kwargs.get('image', 'vllm/vllm-openai:latest'),
+                kwargs.get('replicas', 1),
+                kwargs.get('gpu_memory_utilization', 0.9),
+                kwargs.get('tensor_parallel_size', 1),
+                kwargs.get('gpu_count', 1)
+            )
             with open(output_file, 'w') as f:
-                yaml.safe_dump(deployment, f, default_flow_style=False)
+                f.write(rendered)
             
             logger.info(f"Exported deployment YAML to {output_file}")
             return True
@@ -1,19 +1,274 @@
 """NVMe storage operations module."""
 
 import os
+import re
 import json
 import shutil
+import stat
 import subprocess
 import tempfile
 import fcntl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List, TypeVar
 import logging
 
+from . import _statmount
 from .validators import SecurityValidator
 
 logger = logging.getLogger(__name__)
 
+S = TypeVar('S')
+T = TypeVar('T')
+
+# Mount table of the current process and how long a parsed copy stays valid
+_MOUNTINFO_PATH = '/proc/self/mountinfo'
+_MOUNTINFO_TTL = 2.0
+
+# sysfs roots used to map a device number to its disk
+_SYS_DEV_BLOCK = '/sys/dev/block'
+_SYS_BLOCK = '/sys/block'
+
+# Partition suffix of NVMe namespaces, e.g. the "p2" in nvme0n1p2
+_PARTITION_SUFFIX_RE = re.compile(r'(?<=\d)p\d+$')
+
+# File extensions counted as model weights
+_MODEL_EXTS = frozenset({'.safetensors', '.bin', '.gguf', '.pt', '.pth'})
+
+# Octal escapes the kernel uses for whitespace and backslashes in mountinfo
+_MOUNT_ESCAPE_RE = re.compile(rb'\\([0-7]{3})')
+
+# Common traversal and absolute-path shapes, rejected before the full
+# SecurityValidator check: "../" or "..\", a leading "/", a drive letter, a UNC prefix
+_TRAVERSAL_RE = re.compile(r'\.\.[\\/]|^/|^[A-Za-z]:|^\\\\')
+
+# Bytes per GiB, the unit of every *_gb value
+_GIB = 1 << 30
+
+# Seconds a statvfs result is reused by get_disk_usage and check_disk_space
+_DISK_USAGE_TTL = 1.0
+
+# Subtree walks only use a thread pool past this many subtrees
+_PARALLEL_WALK_MIN_SUBTREES = 4
+_PARALLEL_WALK_MAX_WORKERS = 8
+
+
+def _unescape_mount_field(field: bytes) -> str:
+    """Decode an octal-escaped mountinfo field such as ``/mnt/my\\040disk``."""
+    return os.fsdecode(_MOUNT_ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 8)]), field))
+
+
+def _human(num_bytes: int) -> str:
+    """Format a byte count the way ``du -h`` does, e.g. ``4.0K`` or ``13G``."""
+    size = float(num_bytes)
+    for unit in ('', 'K', 'M', 'G', 'T'):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = 'P'
+    if unit and size < 10:
+        return f'{size:.1f}{unit}'
+    return f'{size:.0f}{unit}'
+
+
+def _map_subtrees(func: Callable[[S], T], subtrees: List[S]) -> List[T]:
+    """Apply ``func`` to each subtree, on a thread pool when there are many.
+    
+    Directory walks spend their time in scandir/stat syscalls, which release
+    the GIL, so separate subtrees can be read in parallel.
+    
+    Args:
+        func: Function taking one subtree root
+        subtrees: Subtree roots, as paths or scandir entries
+    
+    Returns:
+        Results in the order of ``subtrees``
+    """
+    if len(subtrees) <= _PARALLEL_WALK_MIN_SUBTREES:
+        return [func(subtree) for subtree in subtrees]
+    with ThreadPoolExecutor(max_workers=min(_PARALLEL_WALK_MAX_WORKERS, len(subtrees))) as executor:
+        return list(executor.map(func, subtrees))
+
+
+def _list_level(path: str) -> Tuple[int, List[str]]:
+    """Count model files directly in ``path`` and list its visible subdirectories.
+    
+    Args:
+        path: Directory path
+    
+    Returns:
+        (model file count, subdirectory paths not starting with a dot)
+    """
+    count = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith('.'):
+                        subdirs.append(entry.path)
+                elif name[name.rfind('.'):] in _MODEL_EXTS:
+                    count += 1
+    except OSError as e:
+        logger.debug(f"Error scanning {path}: {e}")
+    return count, subdirs
+
+
+def _count_models_under(path: str) -> int:
+    """Count model files below ``path`` by name, skipping hidden directories."""
+    count = 0
+    stack = [path]
+    while stack:
+        level_count, subdirs = _list_level(stack.pop())
+        count += level_count
+        stack.extend(subdirs)
+    return count
+
+
+def _walk_stats(path: str, count_models: bool = True,
+                follow_file_links: bool = False) -> Tuple[Dict[str, int], Optional[int], int]:
+    """Sum file sizes, count entries and count model files by extension in one walk.
+    
+    Symlinked directories are never descended into. Other symlinks count
+    at their own size, or with ``follow_file_links`` at the size of the
+    regular file they point to (links to anything else, or dangling ones,
+    add nothing). A link with a model extension is counted as a model file
+    either way since HF snapshots link weight files to hash-named blobs.
+    Model files under hidden directories such as ``.locks`` or ``.tmp_*``
+    are not counted.
+    
+    Args:
+        path: Directory to walk
+        count_models: Whether to count model files at all
+        follow_file_links: Size symlinks by their targets
+    
+    Returns:
+        (model file count by extension, total bytes or None if part of
+        the tree could not be read, number of entries below ``path``)
+    """
+    counts: Dict[str, int] = {}
+    total = 0
+    entry_count = 0
+    stack = [(path, count_models)]
+    while stack:
+        dir_path, count_here = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, count_here and not name.startswith('.')))
+                        continue
+                    if follow_file_links and entry.is_symlink():
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            st = None
+                        if st is not None and stat.S_ISREG(st.st_mode):
+                            total += st.st_size
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+                    if count_here:
+                        # A name without a dot yields its last character, never a model extension
+                        ext = name[name.rfind('.'):]
+                        if ext in _MODEL_EXTS:
+                            counts[ext] = counts.get(ext, 0) + 1
+        except OSError as e:
+            logger.debug(f"Error scanning {dir_path}: {e}")
+            return counts, None, entry_count
+    return counts, total, entry_count
+
+
+@lru_cache(maxsize=64)
+def _block_disk_name(major_minor: str) -> Optional[str]:
+    """Return the whole-disk name for a ``major:minor`` block device number.
+    
+    Device numbers of mounted filesystems do not change while they stay
+    mounted, so lookups are cached for the life of the process.
+    
+    Args:
+        major_minor: Device number as listed in mountinfo, e.g. ``259:2``
+    
+    Returns:
+        Disk name such as ``nvme0n1``, or None if sysfs has no entry
+    """
+    try:
+        dev_link = os.readlink(os.path.join(_SYS_DEV_BLOCK, major_minor))
+    except OSError:
+        return None
+    return _PARTITION_SUFFIX_RE.sub('', os.path.basename(dev_link))
+
+
+def _parse_mountinfo(data: bytes) -> List[Tuple[str, str, str]]:
+    """Parse the contents of a mountinfo file.
+    
+    Args:
+        data: Raw ``/proc/<pid>/mountinfo`` contents
+    
+    Returns:
+        List of (mount_point, major_minor, source_device) tuples in mount order
+    """
+    entries = []
+    for line in data.splitlines():
+        # Field 3 is major:minor, field 5 is the mount point and the
+        # mount source follows the filesystem type after the "-" separator
+        fields = line.split()
+        try:
+            source = fields[fields.index(b'-', 6) + 2]
+        except (ValueError, IndexError):
+            continue
+        entries.append((
+            _unescape_mount_field(fields[4]),
+            fields[2].decode(),
+            _unescape_mount_field(source),
+        ))
+    return entries
+
+
+class _MountInfoCache:
+    """Process-wide parsed copy of ``/proc/self/mountinfo``.
+    
+    Every mount lookup in this module goes through the shared ``_MOUNTINFO``
+    instance, so all storage managers in a process share one parse. A copy
+    is reused while the file's mtime is unchanged, and for at most
+    ``_MOUNTINFO_TTL`` seconds since procfs does not bump that mtime when
+    the mount table changes.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._state: Optional[Tuple[int, float, List[Tuple[str, str, str]]]] = None
+    
+    def get(self) -> List[Tuple[str, str, str]]:
+        """Return the current mount table.
+        
+        Returns:
+            List of (mount_point, major_minor, source_device) tuples
+            
+        Raises:
+            OSError: If the mount table cannot be read
+        """
+        mtime_ns = os.stat(_MOUNTINFO_PATH).st_mtime_ns
+        now = time.monotonic()
+        state = self._state
+        if state and state[0] == mtime_ns and now - state[1] < _MOUNTINFO_TTL:
+            return state[2]
+        
+        with open(_MOUNTINFO_PATH, 'rb') as f:
+            entries = _parse_mountinfo(f.read())
+        
+        self._state = (mtime_ns, now, entries)
+        return entries
+
+
+_MOUNTINFO = _MountInfoCache()
+
 
 class SecurityException(Exception):
     """Exception raised for security-related validation failures."""
@@ -23,16 +278,83 @@ class SecurityException(Exception):
 class NVMeStorageManager:
     """Manages NVMe storage operations for AI models."""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, prefetch: bool = False, prefetch_scan: bool = True):
         """Initialize NVMe storage manager.
         
         Args:
             config: Configuration dictionary
+            prefetch: Start verify()'s mount check, disk usage and tree scan
+                in a background thread so they are warm when verify() runs
+            prefetch_scan: Include the tree scan in the prefetch; only a
+                deep verify() uses it
         """
         self.config = config
-        self.nvme_path = Path(config['storage']['nvme_path'])
+        self.nvme_path = config['storage']['nvme_path']
         self.require_mount = config['storage'].get('require_mount', True)
+        self.trust_path = config['storage'].get('trust_path', False)
         self.min_free_space_gb = config['storage'].get('min_free_space_gb', 50)
+        self._mount_check_cache: Optional[Tuple[int, float, Tuple[bool, Optional[Dict]]]] = None
+        self._dir_size_cache: Dict[Tuple[str, int], str] = {}
+        self._disk_usage_cache: Optional[Tuple[float, Dict[str, int]]] = None
+        self._handlers: Dict[str, object] = {}
+        self._prefetched_scan: Optional[Dict] = None
+        self._prefetch: Optional[threading.Thread] = None
+        self._prefetch_scan = prefetch_scan
+        if prefetch:
+            self._prefetch = threading.Thread(target=self._warm_caches, name='nvme-prefetch', daemon=True)
+            self._prefetch.start()
+    
+    def _warm_caches(self):
+        """Run verify()'s slow checks ahead of time on the prefetch thread.
+        
+        The mount check and disk usage land in their own memo caches; the
+        tree scan is kept until verify() takes it.
+        """
+        try:
+            self.check_nvme_mounted()
+            self.get_disk_usage()
+            if self._prefetch_scan:
+                self._prefetched_scan = self._scan_tree()
+        except Exception as e:
+            logger.debug(f"Prefetch failed: {e}")
+    
+    def _join_prefetch(self):
+        """Wait for a running prefetch so callers see its results."""
+        thread = self._prefetch
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self._prefetch = None
+    
+    def _take_scan(self) -> Dict:
+        """Return the prefetched tree scan, or scan now if there is none."""
+        self._join_prefetch()
+        scan, self._prefetched_scan = self._prefetched_scan, None
+        return scan if scan is not None else self._scan_tree()
+    
+    @property
+    def nvme_path(self) -> Path:
+        """Base directory of the NVMe storage."""
+        return self._nvme_path
+    
+    @nvme_path.setter
+    def nvme_path(self, value):
+        """Set the base directory and refresh its cached string forms.
+        
+        The plain and resolved strings are used on every mount check and
+        path join, and the fixed cache directories by setup, verify and
+        list_models, so they are computed once here rather than per call.
+        """
+        self._nvme_path = Path(value)
+        self._nvme_path_str = str(self._nvme_path)
+        self._nvme_path_real = os.path.realpath(self._nvme_path_str)
+        
+        # Constant names cannot traverse, so these skip _safe_path_join;
+        # anything created under them is still boundary-checked
+        self._hf_cache_dir = self._nvme_path / 'hf-cache'
+        self._models_dir = self._nvme_path / 'models'
+        self._ollama_dir = self._nvme_path / 'ollama'
+        self._hf_cache_str = str(self._hf_cache_dir)
+        self._ollama_str = str(self._ollama_dir)
     
     def _validate_path_boundary(self, path: Path, base: Path) -> bool:
         """Validate that a path stays within base directory after resolution.
@@ -73,12 +395,12 @@ class NVMeStorageManager:
             
             # Skip validation for the base nvme_path if it's the first component
             # since it's already validated during initialization
-            if i == 0 and part_str == str(self.nvme_path):
+            if i == 0 and part_str == self._nvme_path_str:
                 validated_parts.append(part_str)
                 continue
             
             # Validate each component for path traversal attempts
-            if not SecurityValidator.validate_path_traversal(part_str):
+            if _TRAVERSAL_RE.search(part_str) or not SecurityValidator.validate_path_traversal(part_str):
                 raise SecurityException(
                     f"Path component at index {i} contains invalid pattern: '{part_str}'. "
                     f"Detected potential path traversal or absolute path attempt."
@@ -161,14 +483,105 @@ class NVMeStorageManager:
             except OSError:
                 pass
         
-    def check_nvme_mounted(self) -> Tuple[bool, Optional[Dict[str, str]]]:
+    def check_nvme_mounted(self, cache_ttl_s: float = 2.0) -> Tuple[bool, Optional[Dict[str, str]]]:
         """Check if NVMe is mounted at the configured path with detailed verification.
         
+        The result is reused for ``cache_ttl_s`` seconds as long as the mount
+        table's mtime is unchanged, so the repeated checks made while running
+        one command only inspect the mount once.
+        
+        Args:
+            cache_ttl_s: How long a previous result stays valid, 0 to force a fresh check
+            
         Returns:
             Tuple[bool, Optional[Dict]]: (is_mounted, error_details)
                 - is_mounted: True if properly mounted NVMe, False otherwise
                 - error_details: Dict with error information if check fails, None if successful
         """
+        self._join_prefetch()
+        try:
+            mtime_ns = os.stat(_MOUNTINFO_PATH).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        
+        cached = self._mount_check_cache
+        if (cached and mtime_ns is not None and cached[0] == mtime_ns
+                and time.monotonic() - cached[1] < cache_ttl_s):
+            return cached[2]
+        
+        result = self._check_nvme_mounted()
+        if mtime_ns is not None:
+            self._mount_check_cache = (mtime_ns, time.monotonic(), result)
+        return result
+    
+    @staticmethod
+    def _find_mount_entry(real_path: str) -> Optional[Tuple[str, str, str]]:
+        """Find the mount holding a resolved path.
+        
+        statmount(2) describes just that mount; kernels without it fall back
+        to scanning the whole mount table.
+        
+        Args:
+            real_path: Resolved absolute path
+            
+        Returns:
+            (mount_point, major_minor, source_device), or None if no mount matched
+            
+        Raises:
+            OSError: If the mount table cannot be read
+        """
+        mount_entry = _statmount.find_mount(real_path)
+        if mount_entry is not None:
+            return mount_entry
+        
+        mount_points = {entry[0]: entry for entry in _MOUNTINFO.get()}
+        
+        # The mount holding the path is its nearest ancestor in the mount table
+        mount_path = real_path
+        while mount_path not in mount_points and mount_path != os.sep:
+            mount_path = os.path.dirname(mount_path)
+        return mount_points.get(mount_path)
+    
+    def describe_nvme_mount(self) -> Dict[str, str]:
+        """Describe the device backing the configured path.
+        
+        Unlike check_nvme_mounted, this reads the drive's model and serial
+        from sysfs, so it is meant for diagnostics rather than routine checks.
+        
+        Returns:
+            Dict with whichever of mount_point, device, disk, model and serial
+            could be determined
+        """
+        info = {}
+        try:
+            mount_entry = self._find_mount_entry(self._nvme_path_real)
+        except OSError as e:
+            logger.warning(f"Failed to read mount table: {e}")
+            return info
+        if mount_entry is None:
+            return info
+        
+        info['mount_point'] = mount_entry[0]
+        info['device'] = mount_entry[2]
+        disk = _block_disk_name(mount_entry[1])
+        if not disk:
+            return info
+        
+        info['disk'] = disk
+        for attr in ('model', 'serial'):
+            try:
+                with open(os.path.join(_SYS_BLOCK, disk, 'device', attr), 'rb') as f:
+                    info[attr] = f.read().decode(errors='replace').strip()
+            except OSError as e:
+                logger.debug(f"Could not read {attr} for {disk}: {e}")
+        return info
+    
+    def _check_nvme_mounted(self) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """Run the mount and device checks behind check_nvme_mounted.
+        
+        Returns:
+            Tuple[bool, Optional[Dict]]: (is_mounted, error_details)
+        """
         error_details = {}
         
         try:
@@ -178,7 +591,7 @@ class NVMeStorageManager:
                 logger.error(error_msg)
                 error_details['error'] = 'path_not_found'
                 error_details['message'] = error_msg
-                error_details['path'] = str(self.nvme_path)
+                error_details['path'] = self._nvme_path_str
                 return False, error_details
             
             # Step 2: Check if it's a directory
@@ -187,144 +600,81 @@ class NVMeStorageManager:
                 logger.error(error_msg)
                 error_details['error'] = 'not_a_directory'
                 error_details['message'] = error_msg
-                error_details['path'] = str(self.nvme_path)
+                error_details['path'] = self._nvme_path_str
                 return False, error_details
             
+            # Hosts with a fixed, known-good layout can skip the device checks
+            if self.trust_path:
+                logger.debug(f"Trusting {self.nvme_path} as NVMe storage (trust_path is set)")
+                return True, None
+            
             # Step 3: Check if it's actually mounted
+            real_path = self._nvme_path_real
+            
+            # A directory on a different device than its parent is a mount
+            # point, and sysfs maps that device to its disk, so the common
+            # case needs two stats and no mount table. Bind mounts, btrfs
+            # subvolumes and non-NVMe disks take the detailed path below.
             try:
-                result = subprocess.run(
-                    ['mountpoint', '-q', str(self.nvme_path)],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    check=False  # We check returncode manually
-                )
-                
-                if result.returncode != 0:
-                    # Not a mount point - get more info
-                    mount_check = subprocess.run(
-                        ['mount'], 
-                        capture_output=True, 
-                        text=True,
-                        timeout=5,
-                        check=False
-                    )
-                    
-                    # Check if path appears in mount output
-                    is_mounted = str(self.nvme_path) in mount_check.stdout
-                    
-                    if not is_mounted:
-                        error_msg = f"Path exists but is not mounted: {self.nvme_path}"
-                        logger.warning(error_msg)
-                        error_details['error'] = 'not_mounted'
-                        error_details['message'] = error_msg
-                        error_details['path'] = str(self.nvme_path)
-                        # Don't return yet, check if it might be an NVMe device anyway
-                    
-            except subprocess.TimeoutExpired:
-                error_msg = "Mount check command timed out"
-                logger.error(error_msg)
-                error_details['error'] = 'mount_check_timeout'
-                error_details['message'] = error_msg
-                return False, error_details
-            except Exception as e:
-                error_msg = f"Failed to run mountpoint command: {e}"
+                st_dev = os.stat(real_path).st_dev
+                parent_dev = os.stat(os.path.dirname(real_path)).st_dev
+            except OSError:
+                st_dev = parent_dev = None
+            if st_dev != parent_dev:
+                disk = _block_disk_name(f'{os.major(st_dev)}:{os.minor(st_dev)}')
+                if disk and disk.startswith('nvme'):
+                    logger.info(f"Successfully verified NVMe mount at {self.nvme_path} ({disk})")
+                    return True, None
+            
+            try:
+                mount_entry = self._find_mount_entry(real_path)
+            except OSError as e:
+                error_msg = f"Failed to read mount table: {e}"
                 logger.error(error_msg)
                 error_details['error'] = 'mount_check_failed'
                 error_details['message'] = error_msg
                 error_details['exception'] = str(e)
-                # Continue to device check anyway
+                return False, error_details
+            
+            is_mountpoint = mount_entry is not None and mount_entry[0] == real_path
+            if not is_mountpoint:
+                error_msg = f"Path exists but is not mounted: {self.nvme_path}"
+                logger.warning(error_msg)
+                error_details['error'] = 'not_mounted'
+                error_details['message'] = error_msg
+                error_details['path'] = self._nvme_path_str
+                # Don't return yet, check if it might be an NVMe device anyway
             
             # Step 4: Verify it's an NVMe device
             is_nvme = False
             device_info = {}
             
             try:
-                # Get device for mount point
-                df_result = subprocess.run(
-                    ['df', str(self.nvme_path)],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    check=False
-                )
-                
-                if df_result.returncode == 0:
-                    lines = df_result.stdout.strip().split('\n')
-                    if len(lines) > 1:
-                        # Extract device from df output
-                        device = lines[1].split()[0]
-                        device_info['device'] = device
-                        
-                        # Check if device is NVMe
-                        if 'nvme' in device.lower():
-                            is_nvme = True
-                            logger.info(f"Detected NVMe device from path: {device}")
-                        else:
-                            # Check /sys/block for NVMe indicators
-                            sys_block_path = Path('/sys/block')
-                            if sys_block_path.exists():
-                                for block_dev in sys_block_path.iterdir():
-                                    if 'nvme' in block_dev.name:
-                                        model_path = block_dev / 'device' / 'model'
-                                        if model_path.exists():
-                                            try:
-                                                model = model_path.read_text().strip()
-                                                device_info['model'] = model
-                                                # Check if this device is related to our mount
-                                                dev_path = f"/dev/{block_dev.name}"
-                                                if dev_path in device or device.startswith(dev_path):
-                                                    is_nvme = True
-                                                    logger.info(f"Found NVMe device: {block_dev.name} - Model: {model}")
-                                                    break
-                                            except Exception as e:
-                                                logger.debug(f"Could not read model for {block_dev.name}: {e}")
-                
-                if not is_nvme:
-                    # Try alternative method: check lsblk
-                    try:
-                        lsblk_result = subprocess.run(
-                            ['lsblk', '-o', 'NAME,TYPE,MOUNTPOINT', '-J'],
-                            capture_output=True,
-                            text=True,
-                            timeout=5,
-                            check=False
-                        )
-                        
-                        if lsblk_result.returncode == 0:
-                            import json
-                            lsblk_data = json.loads(lsblk_result.stdout)
-                            
-                            # Search for our mount point in the tree
-                            def find_mount(devices, mount_path):
-                                for device in devices:
-                                    if device.get('mountpoint') == str(mount_path):
-                                        return device
-                                    if 'children' in device:
-                                        found = find_mount(device['children'], mount_path)
-                                        if found:
-                                            return found
-                                return None
-                            
-                            mount_device = find_mount(lsblk_data.get('blockdevices', []), self.nvme_path)
-                            if mount_device and 'nvme' in mount_device.get('name', '').lower():
-                                is_nvme = True
-                                device_info['lsblk_device'] = mount_device.get('name')
-                                logger.info(f"Found NVMe device via lsblk: {mount_device.get('name')}")
+                if mount_entry:
+                    device = mount_entry[2]
+                    device_info['device'] = device
                     
-                    except Exception as e:
-                        logger.debug(f"Could not check lsblk: {e}")
+                    # Check if device is NVMe
+                    if 'nvme' in device.lower():
+                        is_nvme = True
+                        logger.info(f"Detected NVMe device from path: {device}")
+                    else:
+                        # Resolve the backing disk through sysfs, e.g. /dev/root
+                        # or a by-uuid source that does not name the device
+                        disk = _block_disk_name(mount_entry[1])
+                        if disk and disk.startswith('nvme'):
+                            is_nvme = True
+                            device_info['disk'] = disk
+                            logger.info(f"Found NVMe device: {disk}")
                 
-            except subprocess.TimeoutExpired:
-                logger.warning("Device check timed out, assuming not NVMe")
             except Exception as e:
                 logger.warning(f"Could not verify NVMe device: {e}")
             
             # Final determination
-            if result.returncode == 0 and is_nvme:
+            if is_mountpoint and is_nvme:
                 logger.info(f"Successfully verified NVMe mount at {self.nvme_path}")
                 return True, None
-            elif result.returncode == 0 and not is_nvme:
+            elif is_mountpoint and not is_nvme:
                 warning_msg = f"Path is mounted but not detected as NVMe device: {self.nvme_path}"
                 logger.warning(warning_msg)
                 error_details['warning'] = 'not_nvme_device'
@@ -349,23 +699,65 @@ class NVMeStorageManager:
             error_details['details'] = str(e)
             return False, error_details
     
-    def get_disk_usage(self) -> Dict[str, int]:
+    def get_disk_usage(self, max_age_s: float = _DISK_USAGE_TTL) -> Dict[str, int]:
         """Get disk usage statistics for NVMe storage.
         
+        Uses a single ``os.statvfs`` call. The result is reused for
+        ``max_age_s`` seconds so that back-to-back checks, such as the
+        prefetch followed by verify(), stat the disk once.
+        
+        Args:
+            max_age_s: How long a previous result stays valid, 0 to force a fresh stat
+            
         Returns:
-            Dict containing total, used, and available space in GB
+            Dict containing total, used, and available space in GB and bytes
         """
+        self._join_prefetch()
+        cached = self._disk_usage_cache
+        if cached and time.monotonic() - cached[0] < max_age_s:
+            return cached[1]
+        
         try:
-            stat = shutil.disk_usage(self.nvme_path)
-            return {
-                'total_gb': stat.total // (1024**3),
-                'used_gb': stat.used // (1024**3),
-                'available_gb': stat.free // (1024**3),
-                'usage_percent': (stat.used / stat.total) * 100
-            }
+            st = os.statvfs(self._nvme_path_str)
         except Exception as e:
             logger.error(f"Failed to get disk usage: {e}")
-            return {'total_gb': 0, 'used_gb': 0, 'available_gb': 0, 'usage_percent': 0}
+            return {'total_gb': 0, 'used_gb': 0, 'available_gb': 0, 'usage_percent': 0,
+                    'total_bytes': 0, 'used_bytes': 0, 'available_bytes': 0}
+        
+        total = st.f_frsize * st.f_blocks
+        used = st.f_frsize * (st.f_blocks - st.f_bfree)
+        free = st.f_frsize * st.f_bavail
+        usage = {
+            'total_gb': total // _GIB,
+            'used_gb': used // _GIB,
+            'available_gb': free // _GIB,
+            'usage_percent': (used / total) * 100 if total else 0,
+            'total_bytes': total,
+            'used_bytes': used,
+            'available_bytes': free
+        }
+        self._disk_usage_cache = (time.monotonic(), usage)
+        return usage
+    
+    def _available_bytes(self) -> int:
+        """Get the space available to unprivileged users on the NVMe.
+        
+        Reads a fresh get_disk_usage() result if there is one, otherwise
+        asks statvfs for just this figure without building the usage dict.
+        
+        Returns:
+            Available bytes, 0 if the filesystem cannot be queried
+        """
+        cached = self._disk_usage_cache
+        if cached and time.monotonic() - cached[0] < _DISK_USAGE_TTL:
+            return cached[1]['available_bytes']
+        
+        try:
+            st = os.statvfs(self._nvme_path_str)
+        except OSError as e:
+            logger.error(f"Failed to get disk usage: {e}")
+            return 0
+        return st.f_frsize * st.f_bavail
     
     def check_disk_space(self, required_gb: int) -> bool:
         """Check if sufficient disk space is available.
@@ -376,8 +768,7 @@ class NVMeStorageManager:
         Returns:
             bool: True if sufficient space, False otherwise
         """
-        usage = self.get_disk_usage()
-        return usage['available_gb'] >= required_gb
+        return self._available_bytes() >= required_gb * _GIB
     
     def setup_nvme(self) -> bool:
         """Set up NVMe directory structure and environment.
@@ -397,6 +788,10 @@ class NVMeStorageManager:
                 elif error_details and 'warning' in error_details:
                     logger.warning(f"Mount check warning: {error_details.get('message', 'Unknown warning')}")
             
+            if self._is_already_setup():
+                logger.info(f"NVMe storage at {self.nvme_path} is already set up")
+                return True
+            
             # Create directory structure
             directories = [
                 self._safe_path_join(self.nvme_path, 'hf-cache'),
@@ -404,9 +799,9 @@ class NVMeStorageManager:
                 self._safe_path_join(self.nvme_path, 'ollama')
             ]
             
-            for directory in directories:
-                directory.mkdir(parents=True, exist_ok=True)
-                logger.info(f"Created directory: {directory}")
+            # Independent creations, so a slow mount allocates the inodes in parallel
+            with ThreadPoolExecutor(max_workers=len(directories)) as executor:
+                list(executor.map(self._make_directory, directories))
             
             # Set up environment variables
             self._setup_environment_variables()
@@ -414,22 +809,66 @@ class NVMeStorageManager:
             # Create symlinks for compatibility
             self._create_symlinks()
             
+            # The tree just changed, so the next usage and size checks stat it again
+            self._disk_usage_cache = None
+            self._dir_size_cache.clear()
+            
             return True
             
         except Exception as e:
             logger.error(f"Failed to set up NVMe: {e}")
             return False
     
+    @staticmethod
+    def _make_directory(directory: Path) -> None:
+        """Create a directory and any missing parents."""
+        directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Created directory: {directory}")
+    
+    def _is_already_setup(self) -> bool:
+        """Check whether setup_nvme has nothing left to do.
+        
+        Costs one stat per directory and one readlink per symlink, so
+        re-running setup on a configured host touches nothing. When
+        NVME_MODELS_ENV_FILE is set the full setup always runs, and it only
+        rewrites the file if it is stale.
+        
+        Returns:
+            bool: True if directories, environment and symlinks are all in place
+        """
+        if os.environ.get('NVME_MODELS_ENV_FILE'):
+            return False
+        
+        hf_cache = self._hf_cache_str
+        ollama_dir = self._ollama_str
+        try:
+            for directory in (self._hf_cache_dir, self._models_dir, self._ollama_dir):
+                if not stat.S_ISDIR(os.stat(directory).st_mode):
+                    return False
+            
+            home = Path.home()
+            if (os.readlink(home / '.cache' / 'huggingface') != hf_cache
+                    or os.readlink(home / '.ollama') != ollama_dir):
+                return False
+        except OSError:
+            return False
+        
+        return (os.environ.get('HF_HOME') == hf_cache
+                and os.environ.get('TRANSFORMERS_CACHE') == hf_cache
+                and os.environ.get('HUGGINGFACE_HUB_CACHE') == hf_cache
+                and os.environ.get('OLLAMA_MODELS') == ollama_dir)
+    
     def _setup_environment_variables(self):
         """Set up environment variables for model caching.
         
         Note: Does not modify ~/.bashrc to respect systemd sandboxing.
         """
+        hf_cache = self._hf_cache_str
         env_vars = {
-            'HF_HOME': str(self._safe_path_join(self.nvme_path, 'hf-cache')),
-            'TRANSFORMERS_CACHE': str(self._safe_path_join(self.nvme_path, 'hf-cache')),
-            'HUGGINGFACE_HUB_CACHE': str(self._safe_path_join(self.nvme_path, 'hf-cache')),
-            'OLLAMA_MODELS': str(self._safe_path_join(self.nvme_path, 'ollama'))
+            'HF_HOME': hf_cache,
+            'TRANSFORMERS_CACHE': hf_cache,
+            'HUGGINGFACE_HUB_CACHE': hf_cache,
+            'OLLAMA_MODELS': self._ollama_str
         }
         
         # Update current environment
@@ -447,9 +886,19 @@ class NVMeStorageManager:
                     logger.warning(f"Environment file path outside /etc: {env_file_path}")
                     return
                 
+                content = ''.join(f'{key}={value}\n' for key, value in env_vars.items())
+                try:
+                    with open(env_file, 'r') as f:
+                        up_to_date = f.read() == content
+                except FileNotFoundError:
+                    up_to_date = False
+                
+                if up_to_date:
+                    logger.info(f"Environment file {env_file_path} is already up to date")
+                    return
+                
                 with open(env_file, 'w') as f:
-                    for key, value in env_vars.items():
-                        f.write(f'{key}={value}\n')
+                    f.write(content)
                 logger.info(f"Wrote environment variables to {env_file_path}")
             except Exception as e:
                 logger.warning(f"Could not write environment file: {e}")
@@ -459,40 +908,51 @@ class NVMeStorageManager:
     def _create_symlinks(self):
         """Create symlinks for backward compatibility."""
         symlinks = [
-            (Path.home() / '.cache' / 'huggingface', self._safe_path_join(self.nvme_path, 'hf-cache')),
-            (Path.home() / '.ollama', self._safe_path_join(self.nvme_path, 'ollama'))
+            (Path.home() / '.cache' / 'huggingface', self._hf_cache_dir),
+            (Path.home() / '.ollama', self._ollama_dir)
         ]
         
         for link_path, target_path in symlinks:
             try:
-                # Create parent directory if needed
-                link_path.parent.mkdir(parents=True, exist_ok=True)
+                # One lstat tells whether anything is there and what it is,
+                # without following a link to a possibly slow target. A link
+                # that is already correct needs nothing else, so re-runs stop
+                # at lstat + readlink.
+                try:
+                    st = os.lstat(link_path)
+                except FileNotFoundError:
+                    st = None
+                
+                if st is not None and stat.S_ISLNK(st.st_mode) and os.readlink(link_path) == str(target_path):
+                    continue
                 
                 # Validate symlink target stays within base
                 if not self._validate_path_boundary(target_path, self.nvme_path):
                     logger.warning(f"Skipping symlink with target outside base: {target_path}")
                     continue
                 
-                # Remove existing file/directory if it exists
-                if link_path.exists() and not link_path.is_symlink():
-                    if link_path.is_dir():
-                        shutil.rmtree(link_path)
-                    else:
-                        link_path.unlink()
+                if st is None:
+                    # Create parent directory if needed
+                    link_path.parent.mkdir(parents=True, exist_ok=True)
+                elif stat.S_ISDIR(st.st_mode):
+                    shutil.rmtree(link_path)
+                else:
+                    os.unlink(link_path)
+                
+                os.symlink(target_path, link_path)
+                logger.info(f"Created symlink: {link_path} -> {target_path}")
                 
-                # Create symlink if it doesn't exist
-                if not link_path.exists():
-                    link_path.symlink_to(target_path)
-                    logger.info(f"Created symlink: {link_path} -> {target_path}")
-                    
             except Exception as e:
                 logger.warning(f"Failed to create symlink {link_path}: {e}")
     
-    def verify(self, output_format: str = 'text') -> Dict:
+    def verify(self, output_format: str = 'text', deep: bool = False) -> Dict:
         """Verify NVMe storage configuration.
         
         Args:
             output_format: Output format ('text' or 'json')
+            deep: Also walk the tree for directory sizes and model counts.
+                Without it those fields are None and the check only costs
+                a few stats.
             
         Returns:
             Dict containing verification results
@@ -505,8 +965,15 @@ class NVMeStorageManager:
             'summary': {}
         }
         
+        # The mount check, tree walk and disk usage are independent and mostly
+        # wait on the filesystem, so run them side by side
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            mount_future = executor.submit(self.check_nvme_mounted)
+            scan_future = executor.submit(self._take_scan) if deep else None
+            usage_future = executor.submit(self.get_disk_usage)
+        
         # Check mount status
-        is_mounted, mount_details = self.check_nvme_mounted()
+        is_mounted, mount_details = mount_future.result()
         if is_mounted:
             if mount_details and 'warning' in mount_details:
                 results['warnings'].append({
@@ -530,18 +997,19 @@ class NVMeStorageManager:
             results['summary']['mount_error'] = mount_details.get('error') if mount_details else 'unknown'
             results['status'] = 'error'
         
+        # One walk of the tree provides both directory sizes and model counts
+        scan = scan_future.result() if scan_future is not None else None
+        
         # Check directories
-        directories = ['hf-cache', 'models', 'ollama']
+        directories = [('hf-cache', self._hf_cache_dir), ('models', self._models_dir), ('ollama', self._ollama_dir)]
         all_dirs_exist = True
-        for dir_name in directories:
-            dir_path = self._safe_path_join(self.nvme_path, dir_name)
+        for dir_name, dir_path in directories:
             if dir_path.exists():
-                size = self._get_dir_size(dir_path)
-                results['success'].append({
-                    'check': 'directory',
-                    'message': f'{dir_path} exists',
-                    'size': size
-                })
+                entry = {'check': 'directory', 'message': f'{dir_path} exists'}
+                if scan is not None:
+                    size_bytes = scan['dir_sizes'].get(dir_name)
+                    entry['size'] = _human(size_bytes) if size_bytes is not None else 'unknown'
+                results['success'].append(entry)
             else:
                 results['errors'].append({
                     'check': 'directory',
@@ -556,10 +1024,11 @@ class NVMeStorageManager:
         env_vars = ['HF_HOME', 'TRANSFORMERS_CACHE', 'OLLAMA_MODELS']
         all_env_set = True
         for var in env_vars:
-            if os.environ.get(var):
+            value = os.environ.get(var)
+            if value:
                 results['success'].append({
                     'check': 'env_var',
-                    'message': f'{var} = {os.environ[var]}'
+                    'message': f'{var} = {value}'
                 })
             else:
                 results['warnings'].append({
@@ -571,7 +1040,7 @@ class NVMeStorageManager:
         results['summary']['environment_configured'] = all_env_set
         
         # Check disk usage
-        usage = self.get_disk_usage()
+        usage = usage_future.result()
         results['summary']['disk_usage'] = usage
         
         if usage['available_gb'] < self.min_free_space_gb:
@@ -586,19 +1055,22 @@ class NVMeStorageManager:
             })
         
         # Count model files
-        model_count = self._count_model_files()
-        results['summary']['model_files_found'] = model_count
-        
-        if model_count > 0:
-            results['success'].append({
-                'check': 'models',
-                'message': f'Found {model_count} model files'
-            })
+        if scan is None:
+            results['summary']['model_files_found'] = None
         else:
-            results['warnings'].append({
-                'check': 'models',
-                'message': 'No model files found yet'
-            })
+            model_count = sum(scan['model_counts_by_ext'].values())
+            results['summary']['model_files_found'] = model_count
+            
+            if model_count > 0:
+                results['success'].append({
+                    'check': 'models',
+                    'message': f'Found {model_count} model files'
+                })
+            else:
+                results['warnings'].append({
+                    'check': 'models',
+                    'message': 'No model files found yet'
+                })
         
         # Set overall status
         if results['errors']:
@@ -611,42 +1083,121 @@ class NVMeStorageManager:
     def _get_dir_size(self, path: Path) -> str:
         """Get human-readable size of a directory.
         
+        Sums file sizes with an in-process ``os.scandir`` walk rather than
+        running ``du``. Symlinks are counted as links and never followed.
+        Results are remembered per directory mtime until this manager next
+        sets up or downloads into the tree. Only the top-level mtime is
+        checked, so a change made below it by another process is not seen
+        until then.
+        
         Args:
             path: Directory path
             
         Returns:
             str: Human-readable size
         """
+        path_str = os.fspath(path)
         try:
-            result = subprocess.run(
-                ['du', '-sh', str(path)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False
-            )
-            if result.returncode == 0:
-                return result.stdout.split()[0]
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+            key = (path_str, os.stat(path_str).st_mtime_ns)
+        except OSError as e:
             logger.debug(f"Failed to get directory size: {e}")
-        return 'unknown'
+            return 'unknown'
+        
+        cached = self._dir_size_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        _, total, _ = _walk_stats(path_str, count_models=False)
+        if total is None:
+            return 'unknown'
+        
+        size = _human(total)
+        self._dir_size_cache[key] = size
+        return size
+    
+    def _scan_tree(self) -> Dict:
+        """Collect directory sizes and model file counts in one walk.
+        
+        Walks ``nvme_path`` once with _walk_stats, summing file sizes per
+        top-level directory and counting model files by extension along the
+        way. Top-level directories are walked in parallel when there are
+        enough of them.
+        
+        Returns:
+            Dict with 'dir_sizes' (top-level directory name -> bytes, or None
+            if part of it could not be read) and 'model_counts_by_ext'
+        """
+        dir_sizes: Dict[str, Optional[int]] = {}
+        model_counts: Dict[str, int] = {}
+        
+        try:
+            with os.scandir(self._nvme_path_str) as entries:
+                top_entries = list(entries)
+        except OSError as e:
+            logger.debug(f"Error scanning {self.nvme_path}: {e}")
+            return {'dir_sizes': dir_sizes, 'model_counts_by_ext': model_counts}
+        
+        top_dirs = []
+        for entry in top_entries:
+            if entry.is_dir(follow_symlinks=False):
+                top_dirs.append(entry)
+            else:
+                ext = entry.name[entry.name.rfind('.'):]
+                if ext in _MODEL_EXTS:
+                    model_counts[ext] = model_counts.get(ext, 0) + 1
+        
+        def walk(entry: os.DirEntry) -> Tuple[Dict[str, int], Optional[int], int]:
+            return _walk_stats(entry.path, count_models=not entry.name.startswith('.'))
+        
+        for entry, (counts, total, _) in zip(top_dirs, _map_subtrees(walk, top_dirs)):
+            dir_sizes[entry.name] = total
+            for ext, count in counts.items():
+                model_counts[ext] = model_counts.get(ext, 0) + count
+        
+        return {'dir_sizes': dir_sizes, 'model_counts_by_ext': model_counts}
     
     def _count_model_files(self) -> int:
         """Count model files in NVMe storage.
         
+        Counts by name alone, so unlike _scan_tree it never stats a file.
+        Hidden directories are skipped the same way. The tree is split at
+        its second level (e.g. one subtree per model under ``models``) and
+        large trees are walked in parallel.
+        
         Returns:
             int: Number of model files
         """
-        count = 0
-        extensions = ['.safetensors', '.bin', '.gguf', '.pt', '.pth']
+        count, top_dirs = _list_level(self._nvme_path_str)
+        subtrees = []
+        for top_dir in top_dirs:
+            level_count, subdirs = _list_level(top_dir)
+            count += level_count
+            subtrees.extend(subdirs)
+        return count + sum(_map_subtrees(_count_models_under, subtrees))
+    
+    def _get_handler(self, provider: str):
+        """Get the handler for a provider, reusing the one built earlier.
         
-        try:
-            for ext in extensions:
-                count += len(list(self.nvme_path.rglob(f'*{ext}')))
-        except Exception as e:
-            logger.debug(f"Error counting model files: {e}")
+        Handlers hold HTTP sessions and parsed provider settings, so one
+        instance per provider serves every download made by this manager.
         
-        return count
+        Args:
+            provider: Provider name ('hf', 'ollama', etc.)
+            
+        Returns:
+            Provider handler instance or None if the provider is unknown
+        """
+        handler = self._handlers.get(provider)
+        if handler is None:
+            from .models import get_provider_handler
+            handler = get_provider_handler(provider, self.config)
+            if handler:
+                self._handlers[provider] = handler
+        return handler
+    
+    def invalidate_handlers(self):
+        """Drop cached provider handlers, e.g. after the configuration changed."""
+        self._handlers.clear()
     
     def download_model(self, provider: str, model_id: str, **kwargs) -> bool:
         """Download a model through the specified provider.
@@ -660,9 +1211,7 @@ class NVMeStorageManager:
             bool: True if successful, False otherwise
         """
         # This will be implemented by provider-specific handlers
-        from .models import get_provider_handler
-        
-        handler = get_provider_handler(provider, self.config)
+        handler = self._get_handler(provider)
         if not handler:
             logger.error(f"Unknown provider: {provider}")
             return False
@@ -675,7 +1224,12 @@ class NVMeStorageManager:
             logger.error(f"Insufficient disk space. Required: {required_space}GB, Available: {self.get_disk_usage()['available_gb']}GB")
             return False
         
-        return handler.download(model_id, **kwargs)
+        try:
+            return handler.download(model_id, **kwargs)
+        finally:
+            # A nested write leaves the model directory's mtime unchanged
+            self._disk_usage_cache = None
+            self._dir_size_cache.clear()
     
     def _reserve_disk_space(self, size_gb: int) -> Optional[Path]:
         """Reserve disk space by creating a sparse file.
@@ -688,7 +1242,7 @@ class NVMeStorageManager:
         """
         try:
             reserve_file = self.nvme_path / f'.space_reserve_{os.getpid()}'
-            size_bytes = size_gb * (1024 ** 3)
+            size_bytes = size_gb * _GIB
             
             # Create sparse file
             with open(reserve_file, 'wb') as f:
@@ -696,7 +1250,7 @@ class NVMeStorageManager:
                 f.write(b'\0')
             
             # Verify space is actually available
-            usage = self.get_disk_usage()
+            usage = self.get_disk_usage(max_age_s=0)
             if usage['available_gb'] < self.min_free_space_gb:
                 reserve_file.unlink()
                 return None
@@ -759,8 +1313,7 @@ class NVMeStorageManager:
             logger.info(f"Created temporary directory for atomic download: {temp_dir_path}")
             
             # Get provider handler
-            from .models import get_provider_handler
-            handler = get_provider_handler(provider, self.config)
+            handler = self._get_handler(provider)
             if not handler:
                 raise ValueError(f"Unknown provider: {provider}")
             
@@ -829,6 +1382,27 @@ class NVMeStorageManager:
                     shutil.rmtree(temp_dir)
                 except Exception as cleanup_error:
                     logger.debug(f"Could not remove temp directory {temp_dir}: {cleanup_error}")
+            
+            # Free space and model sizes changed whether or not the download succeeded
+            self._disk_usage_cache = None
+            self._dir_size_cache.clear()
+    
+    @staticmethod
+    def _summarize_download(model_path: Path) -> Tuple[int, int, Optional[int]]:
+        """Walk a downloaded model directory with _walk_stats.
+        
+        Symlinked directories are not followed; symlinked files (the HF
+        snapshot layout) are sized by their targets.
+        
+        Args:
+            model_path: Downloaded model directory
+            
+        Returns:
+            Tuple of (entry count, model weight file count, total file bytes
+            or None if part of the directory could not be read)
+        """
+        counts, total, entry_count = _walk_stats(os.fspath(model_path), follow_file_links=True)
+        return entry_count, sum(counts.values()), total
     
     def _validate_download(self, model_path: Path, provider: str, model_id: str) -> bool:
         """Validate that a model was downloaded successfully.
@@ -846,6 +1420,8 @@ class NVMeStorageManager:
             logger.error(f"Download validation failed: {model_path} does not exist")
             return False
         
+        summary = None
+        
         # Check if it's a directory or file based on provider expectations
         if provider in ['hf', 'huggingface']:
             # HuggingFace models are typically directories with multiple files
@@ -853,19 +1429,15 @@ class NVMeStorageManager:
                 logger.error(f"Expected directory for HF model but got file: {model_path}")
                 return False
             
-            # Check for common HF model files
-            expected_extensions = ['.safetensors', '.bin', '.json', '.txt']
-            found_files = list(model_path.rglob('*'))
+            summary = self._summarize_download(model_path)
+            entry_count, model_file_count, _ = summary
             
-            if not found_files:
+            if not entry_count:
                 logger.error(f"No files found in downloaded model directory: {model_path}")
                 return False
             
             # Check if we have at least one model file
-            model_files = [f for f in found_files 
-                          if any(str(f).endswith(ext) for ext in ['.safetensors', '.bin', '.gguf', '.pt'])]
-            
-            if not model_files:
+            if not model_file_count:
                 logger.warning(f"No model weight files found in {model_path}")
                 # Don't fail validation - some models might have different structures
             
@@ -887,8 +1459,13 @@ class NVMeStorageManager:
                 logger.error(f"Downloaded file is empty: {model_path}")
                 return False
         elif model_path.is_dir():
-            # Check total size of directory
-            total_size = sum(f.stat().st_size for f in model_path.rglob('*') if f.is_file())
+            # Check total size of directory, reusing the HF walk if there was one
+            if summary is None:
+                summary = self._summarize_download(model_path)
+            total_size = summary[2]
+            if total_size is None:
+                logger.error(f"Could not read downloaded directory: {model_path}")
+                return False
             if total_size == 0:
                 logger.error(f"Downloaded directory is empty: {model_path}")
                 return False
@@ -896,6 +1473,103 @@ class NVMeStorageManager:
         logger.info(f"Download validation passed for {model_id}")
         return True
     
+    def _list_ollama_manifests(self, manifests_dir: Path, ollama_dir: Path) -> List[Dict]:
+        """List Ollama models by reading their manifest files.
+        
+        Manifests are stored as ``<registry>/<namespace>/<model>/<tag>`` JSON
+        files; names are rendered the way ``ollama list`` shows them and the
+        size is the sum of the layer sizes recorded in each manifest.
+        
+        Args:
+            manifests_dir: Ollama manifests directory
+            ollama_dir: Ollama models directory reported as the model path
+            
+        Returns:
+            List of model information dictionaries
+        """
+        models = []
+        stack = [(os.fspath(manifests_dir), ())]
+        while stack:
+            path, parts = stack.pop()
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            stack.append((entry.path, parts + (entry.name,)))
+                        elif len(parts) == 3:
+                            models.append(self._read_ollama_manifest(entry.path, parts + (entry.name,), ollama_dir))
+            except OSError as e:
+                logger.debug(f"Failed to read Ollama manifests in {path}: {e}")
+        
+        models.sort(key=lambda model: model['name'])
+        return models
+    
+    @staticmethod
+    def _read_ollama_manifest(manifest_path: str, parts: Tuple[str, ...], ollama_dir: Path) -> Dict:
+        """Build a model entry from one Ollama manifest file.
+        
+        Args:
+            manifest_path: Path of the manifest file
+            parts: (registry, namespace, model, tag) taken from the manifest path
+            ollama_dir: Ollama models directory reported as the model path
+            
+        Returns:
+            Model information dictionary
+        """
+        registry, namespace, model, tag = parts
+        if registry != 'registry.ollama.ai':
+            name = f'{registry}/{namespace}/{model}:{tag}'
+        elif namespace != 'library':
+            name = f'{namespace}/{model}:{tag}'
+        else:
+            name = f'{model}:{tag}'
+        
+        size = 'unknown'
+        try:
+            with open(manifest_path, 'rb') as f:
+                manifest = json.load(f)
+            layers = manifest.get('layers', []) + [manifest.get('config') or {}]
+            size = _human(sum(layer.get('size', 0) for layer in layers))
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.debug(f"Could not read Ollama manifest {manifest_path}: {e}")
+        
+        return {
+            'name': name,
+            'path': str(ollama_dir),
+            'size': size,
+            'provider': 'ollama'
+        }
+    
+    def _list_ollama_api(self, ollama_dir: Path) -> Optional[List[Dict]]:
+        """List Ollama models through the local server's /api/tags endpoint.
+        
+        Args:
+            ollama_dir: Ollama models directory reported as the model path
+            
+        Returns:
+            List of model information dictionaries, or None if the server
+            could not be reached
+        """
+        from urllib.request import urlopen
+        
+        ollama_config = self.config.get('providers', {}).get('ollama', {})
+        api_url = ollama_config.get('api_url', 'http://localhost:11434').rstrip('/')
+        try:
+            with urlopen(f'{api_url}/api/tags', timeout=0.5) as response:
+                data = json.load(response)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ollama API not available at {api_url}: {e}")
+            return None
+        
+        models = [{
+            'name': model['name'],
+            'path': str(ollama_dir),
+            'size': _human(model['size']) if 'size' in model else 'unknown',
+            'provider': 'ollama'
+        } for model in data.get('models', []) if 'name' in model]
+        models.sort(key=lambda model: model['name'])
+        return models
+    
     def list_models(self) -> List[Dict]:
         """List all downloaded models.
         
@@ -904,39 +1578,60 @@ class NVMeStorageManager:
         """
         models = []
         
-        # List models in /mnt/nvme/models
-        models_dir = self._safe_path_join(self.nvme_path, 'models')
-        if models_dir.exists():
-            for model_path in models_dir.iterdir():
-                if model_path.is_dir() and not model_path.name.startswith('.'):
-                    models.append({
-                        'name': model_path.name,
-                        'path': str(model_path),
-                        'size': self._get_dir_size(model_path),
-                        'provider': 'huggingface'
-                    })
-        
-        # List Ollama models
+        # List models in /mnt/nvme/models, using scandir's file types instead
+        # of a stat per entry
+        models_dir = self._models_dir
         try:
-            result = subprocess.run(
-                ['ollama', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines:
-                    parts = line.split()
-                    if parts:
-                        models.append({
-                            'name': parts[0],
-                            'path': str(self._safe_path_join(self.nvme_path, 'ollama')),
-                            'size': parts[1] if len(parts) > 1 else 'unknown',
-                            'provider': 'ollama'
-                        })
-        except Exception as e:
-            logger.debug(f"Failed to list Ollama models: {e}")
+            with os.scandir(models_dir) as entries:
+                model_entries = [entry for entry in entries
+                                 if not entry.name.startswith('.') and entry.is_dir()]
+        except OSError:
+            model_entries = []
+        model_paths = [entry.path for entry in model_entries]
+        for entry, size in zip(model_entries, _map_subtrees(self._get_dir_size, model_paths)):
+            models.append({
+                'name': entry.name,
+                'path': entry.path,
+                'size': size,
+                'provider': 'huggingface'
+            })
+        
+        # List Ollama models straight from their manifests, which live under
+        # $OLLAMA_MODELS or the ~/.ollama/models layout symlinked onto NVMe
+        ollama_dir = self._ollama_dir
+        for manifests_dir in (ollama_dir / 'manifests', ollama_dir / 'models' / 'manifests'):
+            if manifests_dir.is_dir():
+                models.extend(self._list_ollama_manifests(manifests_dir, ollama_dir))
+                break
+        else:
+            # No manifests on NVMe, ask a running Ollama server and, failing
+            # that, the ollama CLI
+            api_models = self._list_ollama_api(ollama_dir)
+            if api_models is not None:
+                models.extend(api_models)
+                return models
+            try:
+                # Own session so a hung CLI never receives our terminal's signals
+                result = subprocess.run(
+                    ['ollama', 'list'],
+                    capture_output=True,
+                    timeout=30,
+                    check=False,
+                    start_new_session=True
+                )
+                if result.returncode == 0:
+                    lines = result.stdout.strip().splitlines()[1:]  # Skip header
+                    for line in lines:
+                        # Columns are NAME ID SIZE MODIFIED, with SIZE like "4.7 GB"
+                        parts = line.split()
+                        if parts:
+                            models.append({
+                                'name': parts[0].decode(errors='replace'),
+                                'path': str(ollama_dir),
+                                'size': b' '.join(parts[2:4]).decode(errors='replace') if len(parts) >= 4 else 'unknown',
+                                'provider': 'ollama'
+                            })
+            except Exception as e:
+                logger.debug(f"Failed to list Ollama models: {e}")
         
         return models
\ No newline at end of file
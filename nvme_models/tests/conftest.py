@@ -0,0 +1,42 @@
+"""Shared fixtures for the nvme_models tests."""
+
+from unittest.mock import create_autospec
+
+import pytest
+
+from nvme_models.storage import NVMeStorageManager
+from nvme_models.validators import SecurityValidator
+
+
+@pytest.fixture(scope='module')
+def storage_manager():
+    """Storage manager on an unmounted /mnt/nvme, for tests that do not mutate it.
+    
+    Test classes that patch or populate the manager define their own
+    ``storage_manager`` fixture, which takes precedence over this one.
+    """
+    config = {
+        'storage': {
+            'nvme_path': '/mnt/nvme',
+            'require_mount': False,
+            'min_free_space_gb': 50
+        }
+    }
+    return NVMeStorageManager(config)
+
+
+@pytest.fixture(scope='session')
+def _validator_mock_template():
+    """Autospec of SecurityValidator, introspected once per session."""
+    return create_autospec(SecurityValidator)
+
+
+@pytest.fixture
+def validator_mock(_validator_mock_template):
+    """The shared SecurityValidator autospec with calls and configured results cleared.
+    
+    ``copy.copy`` of a mock shares its child mocks, so a copy would leak
+    calls between tests; resetting the one instance does not.
+    """
+    _validator_mock_template.reset_mock(return_value=True, side_effect=True)
+    return _validator_mock_template
@@ -1,8 +1,6 @@
 """Test cases for CLI commands."""
 
 import json
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 import pytest
@@ -17,11 +15,11 @@ def runner():
     return CliRunner()
 
 
-@pytest.fixture
-def temp_config():
-    """Create a temporary configuration file."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write("""
+@pytest.fixture(scope='session')
+def temp_config(tmp_path_factory):
+    """Create a temporary configuration file shared by all CLI tests."""
+    config_file = tmp_path_factory.mktemp('cfg') / 'config.yaml'
+    config_file.write_text("""
 storage:
   nvme_path: /tmp/test_nvme
   require_mount: false
@@ -38,7 +36,7 @@ providers:
 monitoring:
   log_level: INFO
 """)
-        return f.name
+    return str(config_file)
 
 
 class TestSetupCommand:
@@ -126,6 +124,28 @@ class TestVerifyCommand:
         assert result.exit_code == 0
         assert 'NVMe Storage Verification' in result.output
         assert 'All checks passed' in result.output
+        assert mock_storage_manager.call_args.kwargs['prefetch'] is True
+        assert mock_storage_manager.call_args.kwargs['prefetch_scan'] is False
+        mock_storage.verify.assert_called_once_with(output_format='text', deep=False)
+    
+    @patch('nvme_models.cli.NVMeStorageManager')
+    def test_verify_deep(self, mock_storage_manager, runner, temp_config):
+        """Test that --deep is passed through to verify()."""
+        mock_storage = Mock()
+        mock_storage.verify.return_value = {
+            'status': 'success',
+            'errors': [],
+            'warnings': [],
+            'success': [],
+            'summary': {'nvme_mounted': True, 'model_files_found': 5}
+        }
+        mock_storage_manager.return_value = mock_storage
+        
+        result = runner.invoke(cli, ['--config', temp_config, 'verify', '--deep'])
+        
+        assert result.exit_code == 0
+        assert 'Found 5 model files' in result.output
+        mock_storage.verify.assert_called_once_with(output_format='text', deep=True)
     
     @patch('nvme_models.cli.NVMeStorageManager')
     def test_verify_json_output(self, mock_storage_manager, runner, temp_config):
@@ -289,6 +309,24 @@ class TestListCommand:
         assert 'hf-model' in result.output
         assert 'ollama-model' in result.output
     
+    @patch('nvme_models.models.vllm.VLLMHandler')
+    @patch('nvme_models.models.ollama.OllamaHandler')
+    @patch('nvme_models.cli.NVMeStorageManager')
+    def test_list_no_cache_forces_refresh(self, mock_storage_manager, mock_ollama, mock_vllm, runner, temp_config):
+        """Test that --no-cache asks cached providers for a fresh listing."""
+        mock_ollama.return_value.list_models.return_value = []
+        mock_vllm.return_value.list_models.return_value = [
+            {'name': 'vllm-model', 'provider': 'vllm', 'size_gb': 1}
+        ]
+        
+        for provider in ('ollama', 'vllm'):
+            result = runner.invoke(cli, ['--config', temp_config, 'list', '--provider', provider,
+                                         '--no-verify-mount', '--no-cache'])
+            assert result.exit_code == 0
+        
+        mock_ollama.return_value.list_models.assert_called_once_with(refresh=True)
+        mock_vllm.return_value.list_models.assert_called_once_with(refresh=True)
+    
     @patch('nvme_models.models.huggingface.HuggingFaceHandler')
     @patch('nvme_models.cli.NVMeStorageManager')
     def test_list_filtered_by_provider(self, mock_storage_manager, mock_hf, runner, temp_config):
@@ -700,4 +738,29 @@ class TestInfoCommand:
         ])
         
         assert result.exit_code == 0
-        assert 'Model has warnings' in result.output
\ No newline at end of file
+        assert 'Model has warnings' in result.output
+    
+    @patch('nvme_models.models.get_provider_handler')
+    @patch('nvme_models.cli.NVMeStorageManager')
+    def test_info_shows_model_details_text(self, mock_storage_manager, mock_get_handler, runner, temp_config):
+        """Test that model details print as plain text, brackets included."""
+        mock_storage_manager.return_value = Mock()
+        mock_handler = Mock()
+        mock_handler.verify_model.return_value = {
+            'status': 'success',
+            'checks': [{'message': 'Model llama2:7b is available', 'status': 'passed'}],
+            'model_info': '  Model\n    architecture        llama\n\n  Parameters\n    stop                "[INST]"\n    stop                "[/INST]"'
+        }
+        mock_get_handler.return_value = mock_handler
+        
+        result = runner.invoke(cli, [
+            '--config', temp_config,
+            'info', 'llama2:7b',
+            '--provider', 'ollama'
+        ])
+        
+        assert result.exit_code == 0
+        assert 'Model Details:' in result.output
+        assert 'architecture        llama' in result.output
+        assert 'stop                "[INST]"' in result.output
+        assert 'stop                "[/INST]"' in result.output
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Test cases for config module."""
+
+import logging
+
+import pytest
+
+from nvme_models.config import Config
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Create a configuration rooted in a temporary directory."""
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text(f"""
+storage:
+  nvme_path: {tmp_path}
+  require_mount: false
+monitoring:
+  log_level: INFO
+  log_file: ${{nvme_path}}/logs/nvme-models.log
+""")
+    return Config(str(config_file))
+
+
+class TestConfigGet:
+    """Test cases for key-path lookups."""
+
+    def test_get_leaf_value(self, config, tmp_path):
+        """Test that leaf values are resolved after substitution."""
+        assert config.get('providers', 'huggingface', 'cache_dir') == f'{tmp_path}/hf-cache'
+        assert config.get('storage', 'require_mount') is False
+
+    def test_get_intermediate_dict(self, config):
+        """Test that intermediate sections are returned as dicts."""
+        section = config.get('providers', 'ollama')
+        assert section['default_tag'] == 'latest'
+        assert config.get() is config.config
+
+    def test_get_missing_returns_default(self, config):
+        """Test that missing paths fall back to the default."""
+        assert config.get('storage', 'missing') is None
+        assert config.get('storage', 'nvme_path', 'too_deep', default='x') == 'x'
+
+    def test_set_invalidates_lookup(self, config):
+        """Test that set() is visible to subsequent get() calls."""
+        config.set('storage', 'require_mount', value=True)
+        assert config.get('storage', 'require_mount') is True
+
+        config.set('custom', 'section', value={'key': 'value'})
+        assert config.get('custom', 'section', 'key') == 'value'
+
+    def test_get_section_is_live(self, config):
+        """Test that sections replaced outside set() are not served stale."""
+        config.config['storage'] = {'nvme_path': '/elsewhere'}
+        assert config.get('storage') is config.config['storage']
+
+        config.config = {'storage': {}}
+        assert config.get() is config.config
+        assert config.get('providers') is None
+
+
+class TestDefaultConfig:
+    """Test cases for default configuration handling."""
+
+    def test_defaults_not_shared_between_instances(self, config, tmp_path):
+        """Test that mutating one instance does not leak into defaults."""
+        config.config['providers']['huggingface']['use_symlinks'] = True
+        config.config['security']['allowed_domains'].append('evil.example')
+
+        assert Config.DEFAULT_CONFIG['providers']['huggingface']['use_symlinks'] is False
+        assert 'evil.example' not in Config.DEFAULT_CONFIG['security']['allowed_domains']
+
+        other = Config(str(tmp_path / 'config.yaml'))
+        assert other.get('providers', 'huggingface', 'use_symlinks') is False
+
+
+class TestSetupLogging:
+    """Test cases for logging setup."""
+
+    def test_file_handler_added_once(self, config, tmp_path):
+        """Test that repeated construction does not duplicate file handlers."""
+        log_file = str(tmp_path / 'logs' / 'nvme-models.log')
+        root_logger = logging.getLogger()
+
+        Config(str(tmp_path / 'config.yaml'))
+
+        handlers = [h for h in root_logger.handlers
+                    if getattr(h, 'baseFilename', None) == log_file]
+        try:
+            assert len(handlers) == 1
+        finally:
+            for handler in handlers:
+                root_logger.removeHandler(handler)
+                handler.close()
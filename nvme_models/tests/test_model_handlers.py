@@ -1,390 +1,739 @@
 """Tests for model handler security validation."""
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
-import tempfile
-import shutil
+import io
+import logging
+import subprocess
 from pathlib import Path
+from unittest.mock import Mock, MagicMock, patch
 
-from nvme_models.validators import ValidationError
-from nvme_models.models.huggingface import HuggingFaceHandler
+import pytest
+
+from nvme_models.validators import SecurityValidator, ValidationError
+from nvme_models.models.huggingface import HuggingFaceHandler, _dir_size
 from nvme_models.models.ollama import OllamaHandler
 from nvme_models.models.vllm import VLLMHandler
 
+# Successful subprocess.run result, read-only in every test that uses it
+_OK_RUN = Mock(returncode=0, stdout='', stderr='')
 
-class TestHuggingFaceHandler(unittest.TestCase):
-    """Test HuggingFace handler security validation."""
-    
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'providers': {
-                'huggingface': {
-                    'cache_dir': f'{self.temp_dir}/cache',
-                    'models_dir': f'{self.temp_dir}/models',
-                    'use_symlinks': False,
-                    'resume_downloads': True
-                }
+
+def _hf_config(root: Path) -> dict:
+    """Build a HuggingFace provider config rooted at ``root``."""
+    return {
+        'providers': {
+            'huggingface': {
+                'cache_dir': f'{root}/cache',
+                'models_dir': f'{root}/models',
+                'use_symlinks': False,
+                'resume_downloads': True
             }
         }
-        self.handler = HuggingFaceHandler(self.config)
-    
-    def tearDown(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_valid(self, mock_validate):
-        """Test estimate_model_size with valid model ID."""
-        mock_validate.return_value = None  # No exception means valid
-        
-        # Should not raise an exception
-        size = self.handler.estimate_model_size('bert-base-uncased')
-        self.assertIsInstance(size, int)
-        mock_validate.assert_called_once_with('bert-base-uncased', provider='huggingface')
-    
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_invalid(self, mock_validate):
-        """Test estimate_model_size with invalid model ID."""
-        mock_validate.side_effect = ValidationError("Invalid model ID: contains path traversal")
-        
-        with self.assertRaises(ValidationError) as context:
-            self.handler.estimate_model_size('../invalid/model')
-        
-        self.assertIn("Invalid model ID", str(context.exception))
-        mock_validate.assert_called_once_with('../invalid/model', provider='huggingface')
+    }
+
+
+def _ollama_config(root: Path) -> dict:
+    """Build an Ollama provider config rooted at ``root``."""
+    return {
+        'providers': {
+            'ollama': {
+                'models_dir': f'{root}/models',
+                'default_tag': 'latest'
+            }
+        }
+    }
+
+
+def _vllm_config(root: Path) -> dict:
+    """Build a vLLM provider config rooted at ``root``."""
+    return {
+        'providers': {
+            'vllm': {
+                'models_dir': f'{root}/models',
+                'cache_dir': f'{root}/cache'
+            },
+            'huggingface': {
+                'cache_dir': f'{root}/hf_cache',
+                'models_dir': f'{root}/hf_models'
+            }
+        }
+    }
+
+
+def _assert_validated(mock_validate: Mock, model_id: str, provider: str) -> None:
+    """Assert the handler validated ``model_id`` exactly once for ``provider``."""
+    mock_validate.assert_called_once_with(model_id, provider=provider)
+
+
+@pytest.fixture(autouse=True)
+def listing_cache(request, tmp_path_factory, monkeypatch):
+    """Give each test its own listing cache, created only if it is written."""
+    cache_dir = tmp_path_factory.getbasetemp() / 'listing-cache' / request.node.name
+    monkeypatch.setattr('nvme_models.models._cache.CACHE_DIR', cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def mock_validate(monkeypatch):
+    """Replace SecurityValidator.validate_model_id with a passing mock.
+    
+    The handler modules all import the same class, so one patch covers
+    every provider. Tests set ``side_effect`` to simulate a rejection.
+    """
+    mock = Mock(return_value=None)
+    monkeypatch.setattr(SecurityValidator, 'validate_model_id', mock)
+    return mock
+
+
+# Handlers are only shared by tests that leave no files or memoized state
+# behind; tests that populate models_dir or probe the service get a fresh one.
+
+@pytest.fixture(scope='session')
+def hf_handler(tmp_path_factory):
+    """Create a HuggingFace handler shared across the session."""
+    return HuggingFaceHandler(_hf_config(tmp_path_factory.mktemp('hf')))
+
+
+@pytest.fixture
+def fresh_hf_handler(tmp_path):
+    """Create a HuggingFace handler over an empty directory."""
+    return HuggingFaceHandler(_hf_config(tmp_path))
+
+
+@pytest.fixture(scope='session')
+def ollama_handler(tmp_path_factory):
+    """Create an Ollama handler shared across the session."""
+    return OllamaHandler(_ollama_config(tmp_path_factory.mktemp('ollama')))
+
+
+@pytest.fixture
+def fresh_ollama_handler(tmp_path):
+    """Create an Ollama handler with no memoized service state."""
+    return OllamaHandler(_ollama_config(tmp_path))
+
+
+@pytest.fixture(scope='session')
+def vllm_handler(tmp_path_factory):
+    """Create a vLLM handler shared across the session."""
+    return VLLMHandler(_vllm_config(tmp_path_factory.mktemp('vllm')))
+
+
+@pytest.fixture
+def fresh_vllm_handler(tmp_path):
+    """Create a vLLM handler over an empty directory."""
+    return VLLMHandler(_vllm_config(tmp_path))
+
+
+class TestHuggingFaceHandler:
+    """Test HuggingFace handler security validation."""
     
-    @patch('nvme_models.models.huggingface.subprocess.run')
-    @patch('nvme_models.models.huggingface.shutil.which')
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_download_valid_model(self, mock_validate, mock_which, mock_run):
+    def test_download_valid_model(self, fresh_hf_handler, mock_validate, mocker):
         """Test download with valid model ID."""
-        mock_validate.return_value = None
-        mock_which.return_value = '/usr/bin/huggingface-cli'
-        mock_run.return_value = Mock(returncode=0, stdout='', stderr='')
+        mocker.patch('nvme_models.models.huggingface.shutil.which', return_value='/usr/bin/huggingface-cli')
+        mocker.patch('nvme_models.models.huggingface.subprocess.run', return_value=_OK_RUN)
         
-        result = self.handler.download('facebook/opt-125m')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('facebook/opt-125m', provider='huggingface')
+        result = fresh_hf_handler.download('facebook/opt-125m')
+        assert result
+        _assert_validated(mock_validate, 'facebook/opt-125m', 'huggingface')
     
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_download_invalid_model(self, mock_validate):
+    def test_download_invalid_model(self, hf_handler, mock_validate):
         """Test download with invalid model ID."""
         mock_validate.side_effect = ValidationError("Invalid model ID")
         
-        result = self.handler.download('../../etc/passwd')
-        self.assertFalse(result)
-        mock_validate.assert_called_once_with('../../etc/passwd', provider='huggingface')
+        result = hf_handler.download('../../etc/passwd')
+        assert not result
+        _assert_validated(mock_validate, '../../etc/passwd', 'huggingface')
     
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_delete_model_valid(self, mock_validate):
+    def test_delete_model_valid(self, fresh_hf_handler, mock_validate):
         """Test delete_model with valid model name."""
-        mock_validate.return_value = None
-        
         # Create a mock model directory
-        model_dir = Path(self.temp_dir) / 'models' / 'test-model'
+        model_dir = fresh_hf_handler.models_dir / 'test-model'
         model_dir.mkdir(parents=True)
         
-        result = self.handler.delete_model('test-model')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('test-model', provider='huggingface')
+        result = fresh_hf_handler.delete_model('test-model')
+        assert result
+        _assert_validated(mock_validate, 'test-model', 'huggingface')
     
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_delete_model_invalid(self, mock_validate):
-        """Test delete_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.delete_model('../../../etc/passwd')
-        
-        mock_validate.assert_called_once_with('../../../etc/passwd', provider='huggingface')
-    
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_verify_model_valid(self, mock_validate):
+    def test_verify_model_valid(self, hf_handler, mock_validate, mocker):
         """Test verify_model with valid model name."""
-        mock_validate.return_value = None
-        
-        # Create a mock model directory with config
-        model_dir = Path(self.temp_dir) / 'models' / 'test-model'
-        model_dir.mkdir(parents=True)
-        (model_dir / 'config.json').write_text('{}')
+        # Present the model directory and every expected file without creating them
+        mocker.patch.object(Path, 'exists', return_value=True)
         
-        result = self.handler.verify_model('test-model')
-        self.assertIsInstance(result, dict)
-        self.assertIn('status', result)
-        mock_validate.assert_called_once_with('test-model', provider='huggingface')
+        result = hf_handler.verify_model('test-model')
+        assert isinstance(result, dict)
+        assert result['status'] == 'success'
+        _assert_validated(mock_validate, 'test-model', 'huggingface')
     
-    @patch('nvme_models.models.huggingface.SecurityValidator.validate_model_id')
-    def test_verify_model_invalid(self, mock_validate):
-        """Test verify_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.verify_model('../../malicious')
+    def test_list_models_reads_model_info(self, fresh_hf_handler):
+        """Test list_models merges stored model_info.json metadata."""
+        from nvme_models.models.huggingface import _json_dumps
         
-        mock_validate.assert_called_once_with('../../malicious', provider='huggingface')
+        model_dir = fresh_hf_handler.models_dir / 'facebook-opt-125m'
+        model_dir.mkdir(parents=True)
+        (model_dir / 'model_info.json').write_bytes(_json_dumps({
+            'model_id': 'facebook/opt-125m',
+            'provider': 'huggingface'
+        }))
+        
+        models = fresh_hf_handler.list_models()
+        assert len(models) == 1
+        assert models[0]['model_id'] == 'facebook/opt-125m'
+        assert models[0]['path'] == str(model_dir)
+    
+    def test_dir_size_walks_nested_directories(self, tmp_path):
+        """Test _dir_size sums nested files and resolves file symlinks only."""
+        root = tmp_path / 'sized'
+        (root / 'sub' / 'deeper').mkdir(parents=True)
+        (root / 'a.bin').write_bytes(b'x' * 10)
+        (root / 'sub' / 'deeper' / 'b.bin').write_bytes(b'x' * 5)
+        (root / 'link.bin').symlink_to(root / 'a.bin')
+        (root / 'loop').symlink_to(root, target_is_directory=True)
+        
+        assert _dir_size(str(root)) == 25
+        assert _dir_size(root / 'missing') is None
 
 
-class TestOllamaHandler(unittest.TestCase):
+class TestOllamaHandler:
     """Test Ollama handler security validation."""
     
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'providers': {
-                'ollama': {
-                    'models_dir': f'{self.temp_dir}/models',
-                    'default_tag': 'latest'
-                }
-            }
-        }
-        self.handler = OllamaHandler(self.config)
-    
-    def tearDown(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_valid(self, mock_validate):
-        """Test estimate_model_size with valid model name."""
-        mock_validate.return_value = None
-        
-        size = self.handler.estimate_model_size('llama2:7b')
-        self.assertIsInstance(size, int)
-        mock_validate.assert_called_once_with('llama2:7b', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_invalid(self, mock_validate):
-        """Test estimate_model_size with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.estimate_model_size('../malicious:tag')
-        
-        mock_validate.assert_called_once_with('../malicious:tag', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.subprocess.run')
-    @patch('nvme_models.models.ollama.OllamaHandler.start_ollama_service')
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_download_valid_model(self, mock_validate, mock_start_service, mock_run):
+    @pytest.mark.usefixtures('mock_validate')
+    @pytest.mark.parametrize('model_name,expected', [
+        ('llama2:13b', 8),
+        ('llama3.1:8b', 5),
+        ('mixtral:8x22b', 65),
+        ('phi:2.7b', 2),
+        ('qwen:14b', 9),
+        ('codellama-7b', 4),
+        ('llama2', -1),
+    ])
+    def test_estimate_model_size_table_lookup(self, ollama_handler, mocker, model_name, expected):
+        """Test that known family/size pairs resolve from the size table."""
+        mocker.patch('nvme_models.models.ollama.Validator.estimate_model_size', return_value=-1)
+        assert ollama_handler.estimate_model_size(model_name) == expected
+    
+    def test_download_valid_model(self, ollama_handler, mock_validate, mocker):
         """Test download with valid model name."""
-        mock_validate.return_value = None
-        mock_start_service.return_value = True
-        mock_run.return_value = Mock(returncode=0, stdout='', stderr='')
-        
-        result = self.handler.download('llama2:7b')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('llama2:7b', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_download_invalid_model(self, mock_validate):
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.start_ollama_service', return_value=True)
+        mock_popen = mocker.patch('nvme_models.models.ollama.subprocess.Popen')
+        mock_popen.return_value = Mock(returncode=0, stderr=iter(['pulling manifest\n', 'success\n']))
+        
+        with patch.object(ollama_handler, '_api_get', return_value={'models': []}):
+            result = ollama_handler.download('llama2:7b')
+        assert result
+        _assert_validated(mock_validate, 'llama2:7b', 'ollama')
+        assert mock_popen.call_args[1]['stdout'] == subprocess.DEVNULL
+    
+    @pytest.mark.usefixtures('mock_validate')
+    def test_download_reports_pull_error(self, ollama_handler, mocker, caplog):
+        """Test that a failed pull logs the last stderr line."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.start_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.subprocess.Popen', return_value=Mock(
+            returncode=1,
+            stderr=iter(['pulling manifest\n', 'Error: file does not exist\n', '\n'])
+        ))
+        
+        with caplog.at_level(logging.ERROR, logger='nvme_models.models.ollama'):
+            assert not ollama_handler.download('missing:7b')
+        assert 'Error: file does not exist' in caplog.records[0].getMessage()
+    
+    def test_download_invalid_model(self, ollama_handler, mock_validate):
         """Test download with invalid model name."""
         mock_validate.side_effect = ValidationError("Invalid model name")
         
-        result = self.handler.download('../../etc/passwd')
-        self.assertFalse(result)
-        mock_validate.assert_called_once_with('../../etc/passwd', provider='ollama')
+        result = ollama_handler.download('../../etc/passwd')
+        assert not result
+        _assert_validated(mock_validate, '../../etc/passwd', 'ollama')
     
-    @patch('nvme_models.models.ollama.subprocess.run')
-    @patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service')
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_delete_model_valid(self, mock_validate, mock_check_service, mock_run):
+    def test_delete_model_valid(self, ollama_handler, mock_validate, mocker):
         """Test delete_model with valid model name."""
-        mock_validate.return_value = None
-        mock_check_service.return_value = True
-        mock_run.return_value = Mock(returncode=0, stdout='', stderr='')
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.subprocess.run', return_value=_OK_RUN)
         
-        result = self.handler.delete_model('llama2:7b')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('llama2:7b', provider='ollama')
+        result = ollama_handler.delete_model('llama2:7b')
+        assert result
+        _assert_validated(mock_validate, 'llama2:7b', 'ollama')
     
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_delete_model_invalid(self, mock_validate):
-        """Test delete_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
+    def test_delete_model_decodes_stderr_on_failure(self, ollama_handler, mocker, caplog):
+        """Test that delete_model captures only stderr and decodes it on error."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mock_run = mocker.patch('nvme_models.models.ollama.subprocess.run',
+                                return_value=Mock(returncode=1, stderr=b'Error: model not found'))
         
-        with self.assertRaises(ValidationError):
-            self.handler.delete_model('../../malicious')
+        with caplog.at_level(logging.ERROR, logger='nvme_models.models.ollama'):
+            assert not ollama_handler.delete_model('llama2:7b')
         
-        mock_validate.assert_called_once_with('../../malicious', provider='ollama')
+        assert 'Error: model not found' in caplog.records[0].getMessage()
+        assert mock_run.call_args[1]['stdout'] == subprocess.DEVNULL
+        assert 'text' not in mock_run.call_args[1]
     
-    @patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service')
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_run_model_valid(self, mock_validate, mock_check_service):
+    def test_run_model_valid(self, ollama_handler, mock_validate, mocker):
         """Test run_model with valid model name."""
-        mock_validate.return_value = None
-        mock_check_service.return_value = False  # Service not running
-        
-        result = self.handler.run_model('llama2:7b', 'Hello world')
-        self.assertIsNone(result)  # Service not running
-        mock_validate.assert_called_once_with('llama2:7b', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_run_model_invalid(self, mock_validate):
-        """Test run_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.run_model('../../../etc/passwd', 'test prompt')
-        
-        mock_validate.assert_called_once_with('../../../etc/passwd', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.OllamaHandler.list_models')
-    @patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service')
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_verify_model_valid(self, mock_validate, mock_check_service, mock_list):
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service',
+                     return_value=False)  # Service not running
+        
+        result = ollama_handler.run_model('llama2:7b', 'Hello world')
+        assert result is None  # Service not running
+        _assert_validated(mock_validate, 'llama2:7b', 'ollama')
+    
+    def test_start_service_polls_with_backoff(self, fresh_ollama_handler, mocker):
+        """Test that start_ollama_service returns as soon as the API answers."""
+        import requests
+        mock_check_service = mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service',
+                                          return_value=False)
+        mock_popen = mocker.patch('nvme_models.models.ollama.subprocess.Popen')
+        mock_sleep = mocker.patch('nvme_models.models.ollama.time.sleep')
+        
+        with patch.object(fresh_ollama_handler, '_session') as mock_session:
+            mock_session.get.side_effect = [
+                requests.ConnectionError(),
+                requests.ConnectionError(),
+                Mock(status_code=200)
+            ]
+            assert fresh_ollama_handler.start_ollama_service()
+        
+        mock_popen.assert_called_once()
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.05, 0.1]
+        mock_check_service.assert_called_once()
+    
+    def test_check_service_uses_http(self, fresh_ollama_handler, mocker):
+        """Test that check_ollama_service probes the API without the CLI."""
+        mock_run = mocker.patch('nvme_models.models.ollama.subprocess.run')
+        
+        with patch.object(fresh_ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(status_code=200)
+            
+            assert fresh_ollama_handler.check_ollama_service()
+            mock_session.get.assert_called_once_with('http://localhost:11434', timeout=1)
+        mock_run.assert_not_called()
+    
+    def test_check_service_result_reused_briefly(self, fresh_ollama_handler):
+        """Test that a successful check is reused, and a failed one is not."""
+        with patch.object(fresh_ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(status_code=200)
+            assert fresh_ollama_handler.check_ollama_service()
+            assert fresh_ollama_handler.check_ollama_service()
+            assert mock_session.get.call_count == 1
+        
+        fresh_ollama_handler._service_ok_until = 0.0
+        with patch.object(fresh_ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(status_code=503)
+            assert not fresh_ollama_handler.check_ollama_service()
+            assert not fresh_ollama_handler.check_ollama_service()
+            assert mock_session.get.call_count == 2
+    
+    def test_list_models_reads_api_tags(self, ollama_handler, mocker):
+        """Test that list_models decodes /api/tags instead of CLI output."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mock_run = mocker.patch('nvme_models.models.ollama.subprocess.run')
+        tags = {'models': [{
+            'name': 'llama2:7b',
+            'size': 3 * 1024**3,
+            'modified_at': '2024-01-01T00:00:00Z',
+            'details': {'parameter_size': '7B', 'quantization_level': 'Q4_0'}
+        }]}
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(json=Mock(return_value=tags))
+            models = ollama_handler.list_models()
+        
+        mock_run.assert_not_called()
+        assert len(models) == 1
+        assert models[0]['name'] == 'llama2:7b'
+        assert models[0]['size_gb'] == 3
+        assert models[0]['parameter_size'] == '7B'
+        assert models[0]['quantization'] == 'Q4_0'
+        assert models[0]['modified'] == '2024-01-01T00:00:00Z'
+    
+    def test_list_models_cli_fallback(self, ollama_handler, mocker):
+        """Test that list_models reads names from the CLI when the API is unreachable."""
+        import requests
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.subprocess.run', return_value=Mock(
+            returncode=0,
+            stdout='NAME          ID            SIZE      MODIFIED\n'
+                   'llama2:7b     78e26419b446  3.8 GB    2 days ago\n'
+        ))
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.get.side_effect = requests.ConnectionError()
+            models = ollama_handler.list_models()
+        
+        assert [m['name'] for m in models] == ['llama2:7b']
+        assert 'size_gb' not in models[0]
+    
+    def test_list_models_cli_fallback_not_cached(self, ollama_handler, mocker):
+        """Test that a failed CLI fallback does not hide the API once it is back."""
+        import requests
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.subprocess.run', return_value=Mock(returncode=1, stdout=''))
+        tags = {'models': [{'name': 'llama2:7b', 'size': 1024**3}]}
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.get.side_effect = requests.ConnectionError()
+            assert ollama_handler.list_models() == []
+            
+            mock_session.get.side_effect = None
+            mock_session.get.return_value = Mock(json=Mock(return_value=tags))
+            assert [m['name'] for m in ollama_handler.list_models()] == ['llama2:7b']
+    
+    def test_list_models_served_from_cache(self, ollama_handler, mocker):
+        """Test that a warm cache skips /api/tags but not the service check."""
+        mock_check_service = mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service',
+                                          return_value=True)
+        tags = {'models': [{'name': 'llama2:7b', 'size': 1024**3}]}
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(json=Mock(return_value=tags))
+            first = ollama_handler.list_models()
+            second = ollama_handler.list_models()
+        
+        assert first == second
+        assert mock_check_service.call_count == 2
+        mock_session.get.assert_called_once()
+        
+        # A stopped service lists nothing, even with a warm cache
+        mock_check_service.return_value = False
+        assert ollama_handler.list_models() == []
+        
+        with patch.dict('os.environ', {'OLLAMA_DISABLE_CACHE': '1'}), \
+                patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.get.return_value = Mock(json=Mock(return_value={'models': []}))
+            assert ollama_handler.list_models() == []
+    
+    def test_run_model_streams_ndjson(self, ollama_handler, mocker):
+        """Test that run_model joins streamed /api/generate fragments."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        response = MagicMock()
+        response.iter_lines.return_value = iter([
+            b'{"response": "Hello", "done": false}',
+            b'',
+            b'{"response": " world", "done": false}',
+            b'{"response": "", "done": true}',
+            b'{"response": "ignored"}'
+        ])
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.return_value.__enter__.return_value = response
+            assert ollama_handler.run_model('llama2:7b', 'Hi') == 'Hello world'
+            assert mock_session.post.call_args[1]['stream']
+    
+    def test_run_model_stream_surfaces_server_error(self, ollama_handler):
+        """Test that an error object in the stream fails run_model."""
+        response = MagicMock()
+        response.iter_lines.return_value = iter([b'{"error": "model not found"}'])
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.return_value.__enter__.return_value = response
+            with pytest.raises(RuntimeError):
+                list(ollama_handler.run_model_stream('llama2:7b', 'Hi'))
+    
+    def test_run_batch_http_fallback(self, ollama_handler, mocker):
+        """Test run_batch over plain HTTP keeps order and isolates failures."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.AsyncClient', None)
+        
+        def fake_post(url, json, timeout):
+            if json['prompt'] == 'bad':
+                raise ValueError('boom')
+            assert json['options'] == {'temperature': 0.2}
+            return Mock(json=Mock(return_value={'response': json['prompt'].upper()}))
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.side_effect = fake_post
+            results = ollama_handler.run_batch('llama2:7b', ['a', 'bad', 'c'], temperature=0.2)
+        
+        assert results == ['A', None, 'C']
+    
+    def test_run_batch_async_client(self, ollama_handler, mocker):
+        """Test run_batch gathers prompts on the async client when available."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        
+        class FakeAsyncClient:
+            def __init__(self, host, timeout):
+                self.host = host
+            
+            async def generate(self, model, prompt, options):
+                return {'response': f'{model}:{prompt}'}
+        
+        mocker.patch('nvme_models.models.ollama.AsyncClient', FakeAsyncClient)
+        results = ollama_handler.run_batch('llama2:7b', ['x', 'y'])
+        
+        assert results == ['llama2:7b:x', 'llama2:7b:y']
+    
+    def test_verify_model_valid(self, ollama_handler, mock_validate, mocker):
         """Test verify_model with valid model name."""
-        mock_validate.return_value = None
-        mock_check_service.return_value = True
-        mock_list.return_value = [{'name': 'llama2:7b'}]
-        
-        result = self.handler.verify_model('llama2:7b')
-        self.assertIsInstance(result, dict)
-        self.assertIn('status', result)
-        mock_validate.assert_called_once_with('llama2:7b', provider='ollama')
-    
-    @patch('nvme_models.models.ollama.SecurityValidator.validate_model_id')
-    def test_verify_model_invalid(self, mock_validate):
-        """Test verify_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.verify_model('../../malicious')
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mock_list = mocker.patch('nvme_models.models.ollama.OllamaHandler.list_models',
+                                 return_value=[{'name': 'llama2:7b'}])
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.return_value = Mock(
+                status_code=200, json=Mock(return_value={'details': {'family': 'llama'}})
+            )
+            result = ollama_handler.verify_model('llama2:7b')
+        assert isinstance(result, dict)
+        assert 'status' in result
+        _assert_validated(mock_validate, 'llama2:7b', 'ollama')
+        
+        # A single /api/show call replaces the listing scan and ollama show
+        assert result['status'] == 'success'
+        assert result['model_info'] == '  Model\n    architecture        llama'
+        mock_session.post.assert_called_once()
+        mock_list.assert_not_called()
+    
+    def test_verify_model_summarizes_show_response(self, ollama_handler, mock_validate, mocker):
+        """Test that /api/show details become ollama show style text."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        show = {
+            'license': 'LLAMA 2 COMMUNITY LICENSE AGREEMENT',
+            'modelfile': 'FROM llama2:7b',
+            'template': '[INST] {{ .Prompt }} [/INST]',
+            'parameters': 'stop                           "[INST]"\nstop                           "[/INST]"',
+            'details': {'family': 'llama', 'parameter_size': '6.7B', 'quantization_level': 'Q4_0'},
+            'model_info': {'general.architecture': 'llama', 'llama.context_length': 4096},
+        }
         
-        mock_validate.assert_called_once_with('../../malicious', provider='ollama')
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.return_value = Mock(status_code=200, json=Mock(return_value=show))
+            result = ollama_handler.verify_model('llama2:7b')
+        
+        assert result['model_info'] == (
+            '  Model\n'
+            '    architecture        llama\n'
+            '    parameters          6.7B\n'
+            '    context length      4096\n'
+            '    quantization        Q4_0\n'
+            '\n'
+            '  Parameters\n'
+            '    stop                "[INST]"\n'
+            '    stop                "[/INST]"'
+        )
+    
+    def test_verify_model_cli_fallback_keeps_text(self, fresh_ollama_handler, mock_validate, mocker):
+        """Test that the ollama show fallback also yields text."""
+        import requests
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.list_models', return_value=[{'name': 'llama2:7b'}])
+        mocker.patch('nvme_models.models.ollama.subprocess.run',
+                     return_value=Mock(returncode=0, stdout='  Model\n    architecture        llama\n'))
+        
+        with patch.object(fresh_ollama_handler, '_session') as mock_session:
+            mock_session.post.side_effect = requests.ConnectionError()
+            result = fresh_ollama_handler.verify_model('llama2:7b')
+        
+        assert isinstance(result['model_info'], str)
+        assert 'architecture' in result['model_info']
+    
+    def test_verify_model_missing(self, ollama_handler, mocker):
+        """Test that a 404 from /api/show reports the model as not found."""
+        mocker.patch('nvme_models.models.ollama.OllamaHandler.check_ollama_service', return_value=True)
+        
+        with patch.object(ollama_handler, '_session') as mock_session:
+            mock_session.post.return_value = Mock(status_code=404)
+            result = ollama_handler.verify_model('llama2:7b')
+        
+        assert result['status'] == 'error'
+        assert result['checks'][-1]['check'] == 'exists'
+        assert result['checks'][-1]['status'] == 'failed'
 
 
-class TestVLLMHandler(unittest.TestCase):
+class TestVLLMHandler:
     """Test vLLM handler security validation."""
     
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config = {
-            'providers': {
-                'vllm': {
-                    'models_dir': f'{self.temp_dir}/models',
-                    'cache_dir': f'{self.temp_dir}/cache'
-                },
-                'huggingface': {
-                    'cache_dir': f'{self.temp_dir}/hf_cache',
-                    'models_dir': f'{self.temp_dir}/hf_models'
-                }
-            }
-        }
-        self.handler = VLLMHandler(self.config)
-    
-    def tearDown(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_valid(self, mock_validate):
-        """Test estimate_model_size with valid model ID."""
-        mock_validate.return_value = None
+    def test_download_valid_model(self, vllm_handler, mock_validate, mocker):
+        """Test download with valid model ID."""
+        mocker.patch('nvme_models.models.huggingface.HuggingFaceHandler.download', return_value=True)
         
-        size = self.handler.estimate_model_size('facebook/opt-125m')
-        self.assertIsInstance(size, int)
-        mock_validate.assert_called_once_with('facebook/opt-125m', provider='vllm')
+        result = vllm_handler.download('facebook/opt-125m')
+        assert result
+        _assert_validated(mock_validate, 'facebook/opt-125m', 'vllm')
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_estimate_model_size_invalid(self, mock_validate):
-        """Test estimate_model_size with invalid model ID."""
-        mock_validate.side_effect = ValidationError("Invalid model ID")
+    def test_download_leaves_config_untouched(self, vllm_handler, mocker):
+        """Test that download targets the vLLM dir without mutating config."""
+        mocker.patch('nvme_models.models.huggingface.HuggingFaceHandler.download', return_value=True)
+        hf_models_dir = vllm_handler.config['providers']['huggingface']['models_dir']
         
-        with self.assertRaises(ValidationError):
-            self.handler.estimate_model_size('../../../etc/passwd')
+        with patch('nvme_models.models.huggingface.HuggingFaceHandler.__init__',
+                   return_value=None) as mock_init:
+            assert vllm_handler.download('facebook/opt-125m')
         
-        mock_validate.assert_called_once_with('../../../etc/passwd', provider='vllm')
+        mock_init.assert_called_once_with(vllm_handler.config, models_dir=str(vllm_handler.models_dir))
+        assert vllm_handler.config['providers']['huggingface']['models_dir'] == hf_models_dir
+        assert hf_models_dir.endswith('/hf_models')
     
-    @patch('nvme_models.models.huggingface.HuggingFaceHandler.download')
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_download_valid_model(self, mock_validate, mock_hf_download):
-        """Test download with valid model ID."""
-        mock_validate.return_value = None
-        mock_hf_download.return_value = True
+    def test_verify_model_valid(self, vllm_handler, mock_validate, mocker):
+        """Test verify_model with valid model name."""
+        # Only the name is under test; directory contents are covered below
+        mocker.patch.object(Path, 'exists', return_value=True)
         
-        result = self.handler.download('facebook/opt-125m')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('facebook/opt-125m', provider='vllm')
+        result = vllm_handler.verify_model('test-model')
+        assert isinstance(result, dict)
+        assert 'status' in result
+        _assert_validated(mock_validate, 'test-model', 'vllm')
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_download_invalid_model(self, mock_validate):
-        """Test download with invalid model ID."""
-        mock_validate.side_effect = ValidationError("Invalid model ID")
+    def test_verify_model_classifies_directory_entries(self, fresh_vllm_handler):
+        """Test verify_model counts weights and finds tokenizer files."""
+        model_dir = fresh_vllm_handler.models_dir / 'full-model'
+        model_dir.mkdir(parents=True)
+        (model_dir / 'config.json').write_text('{"architectures": ["LlamaForCausalLM"]}')
+        for name in ('model-00001.safetensors', 'model-00002.safetensors', 'extra.bin', '.hidden.pt'):
+            (model_dir / name).write_bytes(b'')
+        (model_dir / 'tokenizer.model').write_bytes(b'')
         
-        with self.assertRaises(ValidationError):
-            self.handler.download('../../malicious/model')
+        result = fresh_vllm_handler.verify_model('full-model')
+        checks = {c['check']: c for c in result['checks']}
         
-        mock_validate.assert_called_once_with('../../malicious/model', provider='vllm')
+        assert result['status'] == 'success'
+        assert checks['weights']['message'] == 'Found 3 weight files'
+        assert checks['tokenizer']['status'] == 'passed'
+        assert checks['file_config.json']['status'] == 'passed'
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_verify_model_valid(self, mock_validate):
-        """Test verify_model with valid model name."""
-        mock_validate.return_value = None
-        
-        # Create a mock model directory
-        model_dir = Path(self.temp_dir) / 'models' / 'test-model'
+    def test_verify_model_reuses_listing_info(self, fresh_vllm_handler):
+        """Test that verify_model skips config.json when given list_models output."""
+        model_dir = fresh_vllm_handler.models_dir / 'listed-model'
         model_dir.mkdir(parents=True)
         (model_dir / 'config.json').write_text('{"architectures": ["LlamaForCausalLM"]}')
+        (model_dir / 'model.safetensors').write_bytes(b'')
+        (model_dir / 'tokenizer.json').write_bytes(b'')
+        
+        info = {m['name']: m for m in fresh_vllm_handler.list_models()}['listed-model']
+        with patch('nvme_models.models.vllm._json_loads', side_effect=AssertionError('reparsed')):
+            result = fresh_vllm_handler.verify_model('listed-model', cached_info=info)
         
-        result = self.handler.verify_model('test-model')
-        self.assertIsInstance(result, dict)
-        self.assertIn('status', result)
-        mock_validate.assert_called_once_with('test-model', provider='vllm')
+        checks = {c['check']: c for c in result['checks']}
+        assert checks['vllm_compatibility']['status'] == 'passed'
+        assert result['status'] == 'success'
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_verify_model_invalid(self, mock_validate):
-        """Test verify_model with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
+    def test_verify_model_overall_status_is_worst_check(self, fresh_vllm_handler):
+        """Test that warnings and failures set the overall status."""
+        model_dir = fresh_vllm_handler.models_dir / 'partial-model'
+        model_dir.mkdir(parents=True)
+        (model_dir / 'config.json').write_text('{"architectures": ["LlamaForCausalLM"]}')
+        (model_dir / 'model.safetensors').write_bytes(b'')
         
-        with self.assertRaises(ValidationError):
-            self.handler.verify_model('../../etc/passwd')
+        # Missing tokenizer is only a warning
+        assert fresh_vllm_handler.verify_model('partial-model')['status'] == 'warning'
         
-        mock_validate.assert_called_once_with('../../etc/passwd', provider='vllm')
+        # Missing weights is a failure, which outranks the warning
+        (model_dir / 'model.safetensors').unlink()
+        assert fresh_vllm_handler.verify_model('partial-model')['status'] == 'error'
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_generate_server_config_valid(self, mock_validate):
-        """Test generate_server_config with valid model name."""
-        mock_validate.return_value = None
+    def test_list_models_cache_invalidated_by_new_model(self, fresh_vllm_handler):
+        """Test that list_models reuses its cache until a model is added."""
+        first_dir = Path(fresh_vllm_handler.models_dir) / 'first-model'
+        first_dir.mkdir()
+        (first_dir / 'config.json').write_text('{"architectures": ["LlamaForCausalLM"]}')
         
-        config = self.handler.generate_server_config('test-model')
-        self.assertIsInstance(config, dict)
-        self.assertIn('model', config)
-        mock_validate.assert_called_once_with('test-model', provider='vllm')
-    
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_generate_server_config_invalid(self, mock_validate):
-        """Test generate_server_config with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
+        models = fresh_vllm_handler.list_models()
+        assert [m['name'] for m in models] == ['first-model']
+        assert models[0]['vllm_compatible']
         
-        with self.assertRaises(ValidationError):
-            self.handler.generate_server_config('../../../malicious')
+        with patch('nvme_models.models.vllm._dir_size', side_effect=AssertionError('cache miss')):
+            assert fresh_vllm_handler.list_models() == models
         
-        mock_validate.assert_called_once_with('../../../malicious', provider='vllm')
+        # Files added inside a model directory need an explicit refresh
+        (first_dir / 'model.safetensors').write_bytes(b'')
+        with patch('nvme_models.models.vllm._dir_size', return_value=2 * 1024**3) as mock_size:
+            assert fresh_vllm_handler.list_models() == models
+            mock_size.assert_not_called()
+            assert fresh_vllm_handler.list_models(refresh=True)[0]['size_gb'] == 2
+        
+        (Path(fresh_vllm_handler.models_dir) / 'second-model').mkdir()
+        (Path(fresh_vllm_handler.models_dir) / 'a-model').mkdir()
+        names = [m['name'] for m in fresh_vllm_handler.list_models()]
+        assert names == ['a-model', 'first-model', 'second-model']
     
-    @patch('builtins.open', new_callable=unittest.mock.mock_open)
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_export_deployment_yaml_valid(self, mock_validate, mock_open):
+    def test_generate_server_config_valid(self, vllm_handler, mock_validate):
+        """Test generate_server_config with valid model name."""
+        config = vllm_handler.generate_server_config('test-model')
+        assert isinstance(config, dict)
+        assert 'model' in config
+        _assert_validated(mock_validate, 'test-model', 'vllm')
+    
+    def test_export_deployment_yaml_valid(self, vllm_handler, mock_validate, monkeypatch):
         """Test export_deployment_yaml with valid model name."""
-        mock_validate.return_value = None
-        
-        result = self.handler.export_deployment_yaml('test-model', '/tmp/deployment.yaml')
-        self.assertTrue(result)
-        mock_validate.assert_called_once_with('test-model', provider='vllm')
+        # The written manifest is not inspected, so it goes to a throwaway buffer
+        monkeypatch.setattr('nvme_models.models.vllm.open', lambda *args, **kwargs: io.StringIO(),
+                            raising=False)
+        
+        result = vllm_handler.export_deployment_yaml('test-model', '/tmp/deployment.yaml')
+        assert result
+        _assert_validated(mock_validate, 'test-model', 'vllm')
+    
+    def test_export_deployment_yaml_reuses_render(self, vllm_handler, tmp_path):
+        """Test that identical exports share one rendered manifest."""
+        import yaml
+        from nvme_models.models.vllm import _render_deployment_yaml
+        _render_deployment_yaml.cache_clear()
+        first = tmp_path / 'first.yaml'
+        second = tmp_path / 'second.yaml'
+        
+        assert vllm_handler.export_deployment_yaml('test-model', str(first), replicas=2)
+        assert vllm_handler.export_deployment_yaml('test-model', str(second), replicas=2)
+        
+        assert first.read_text() == second.read_text()
+        assert _render_deployment_yaml.cache_info().hits == 1
+        deployment = yaml.safe_load(first.read_text())
+        assert deployment['spec']['replicas'] == 2
+        assert deployment['metadata']['name'] == 'vllm-test-model'
+    
+    def test_render_deployment_yaml_keeps_int_and_float_apart(self):
+        """Test that equal int, float and bool arguments get their own manifests."""
+        import yaml
+        from nvme_models.models.vllm import _render_deployment_yaml
+        _render_deployment_yaml.cache_clear()
+        
+        as_int = yaml.safe_load(_render_deployment_yaml('m', 'img', 1, 0.9, 1, 1))
+        as_float = yaml.safe_load(_render_deployment_yaml('m', 'img', 1, 0.9, True, 1.0))
+        
+        int_container = as_int['spec']['template']['spec']['containers'][0]
+        float_container = as_float['spec']['template']['spec']['containers'][0]
+        assert int_container['args'][-1] == '1'
+        assert float_container['args'][-1] == 'True'
+        assert int_container['resources']['limits']['nvidia.com/gpu'] == 1
+        assert isinstance(float_container['resources']['limits']['nvidia.com/gpu'], float)
+        assert _render_deployment_yaml.cache_info().hits == 0
+
+
+
+@pytest.mark.parametrize('handler_name,provider,model_id,should_raise', [
+    ('hf_handler', 'huggingface', 'bert-base-uncased', False),
+    ('hf_handler', 'huggingface', '../invalid/model', True),
+    ('ollama_handler', 'ollama', 'llama2:7b', False),
+    ('ollama_handler', 'ollama', '../malicious:tag', True),
+    ('vllm_handler', 'vllm', 'facebook/opt-125m', False),
+    ('vllm_handler', 'vllm', '../../../etc/passwd', True),
+])
+def test_estimate_model_size(request, mock_validate, handler_name, provider, model_id, should_raise):
+    """Test estimate_model_size with valid and invalid model IDs."""
+    handler = request.getfixturevalue(handler_name)
+    if should_raise:
+        mock_validate.side_effect = ValidationError("Invalid model ID")
+        with pytest.raises(ValidationError, match="Invalid model ID"):
+            handler.estimate_model_size(model_id)
+    else:
+        assert isinstance(handler.estimate_model_size(model_id), int)
     
-    @patch('nvme_models.models.vllm.SecurityValidator.validate_model_id')
-    def test_export_deployment_yaml_invalid(self, mock_validate):
-        """Test export_deployment_yaml with invalid model name."""
-        mock_validate.side_effect = ValidationError("Invalid model name")
-        
-        with self.assertRaises(ValidationError):
-            self.handler.export_deployment_yaml('../../malicious', '/tmp/deployment.yaml')
-        
-        mock_validate.assert_called_once_with('../../malicious', provider='vllm')
+    _assert_validated(mock_validate, model_id, provider)
 
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+@pytest.mark.parametrize('handler_name,provider,method,args', [
+    ('hf_handler', 'huggingface', 'delete_model', ('../../../etc/passwd',)),
+    ('hf_handler', 'huggingface', 'verify_model', ('../../malicious',)),
+    ('ollama_handler', 'ollama', 'delete_model', ('../../malicious',)),
+    ('ollama_handler', 'ollama', 'run_model', ('../../../etc/passwd', 'test prompt')),
+    ('ollama_handler', 'ollama', 'verify_model', ('../../malicious',)),
+    ('vllm_handler', 'vllm', 'download', ('../../malicious/model',)),
+    ('vllm_handler', 'vllm', 'verify_model', ('../../etc/passwd',)),
+    ('vllm_handler', 'vllm', 'generate_server_config', ('../../../malicious',)),
+    ('vllm_handler', 'vllm', 'export_deployment_yaml', ('../../malicious', '/tmp/deployment.yaml')),
+])
+def test_rejects_invalid_model_name(request, mock_validate, handler_name, provider, method, args):
+    """Test that handler methods taking a model name raise when validation fails."""
+    # Resolve only the handler this case needs
+    handler = request.getfixturevalue(handler_name)
+    mock_validate.side_effect = ValidationError("Invalid model name")
+    
+    with pytest.raises(ValidationError):
+        getattr(handler, method)(*args)
+    
+    _assert_validated(mock_validate, args[0], provider)
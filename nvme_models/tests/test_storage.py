@@ -1,146 +1,134 @@
 """Test cases for storage module."""
 
 import pytest
-import tempfile
-import shutil
 import fcntl
 import os
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch, Mock, call
-from nvme_models.storage import NVMeStorageManager, SecurityException
+from nvme_models import _statmount
+from nvme_models.storage import (
+    NVMeStorageManager, SecurityException, _MountInfoCache, _TRAVERSAL_RE, _block_disk_name
+)
 from nvme_models.validators import SecurityValidator
 
 
-class TestSafePathJoin:
-    """Test cases for the _safe_path_join method."""
-    
-    @pytest.fixture
-    def storage_manager(self):
-        """Create a storage manager instance for testing."""
-        config = {
-            'storage': {
-                'nvme_path': '/mnt/nvme',
-                'require_mount': False,
-                'min_free_space_gb': 50
-            }
-        }
-        return NVMeStorageManager(config)
-    
-    def test_safe_path_join_valid_paths(self, storage_manager):
-        """Test that valid paths are joined correctly."""
-        # Test simple path joining
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'models')
-        assert result == Path('/mnt/nvme/models')
-        
-        # Test multiple components
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'models', 'llama')
-        assert result == Path('/mnt/nvme/models/llama')
-        
-        # Test with nested paths
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'hf-cache', 'models', 'bert-base')
-        assert result == Path('/mnt/nvme/hf-cache/models/bert-base')
-    
-    def test_safe_path_join_with_path_objects(self, storage_manager):
-        """Test that Path objects are handled correctly."""
-        result = storage_manager._safe_path_join(Path('/mnt/nvme'), 'models')
-        assert result == Path('/mnt/nvme/models')
-        
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, Path('models'))
-        assert result == Path('/mnt/nvme/models')
-    
-    def test_safe_path_join_rejects_traversal_attempts(self, storage_manager):
-        """Test that path traversal attempts are rejected."""
-        # Test parent directory traversal
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, '../etc')
-        assert 'path traversal' in str(exc_info.value).lower()
-        
-        # Test nested traversal
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, 'models', '../../etc')
-        assert 'invalid pattern' in str(exc_info.value).lower()
-        
-        # Test Windows-style traversal
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, '..\\windows')
-        assert 'path traversal' in str(exc_info.value).lower()
-    
-    def test_safe_path_join_rejects_absolute_paths(self, storage_manager):
-        """Test that absolute paths in components are rejected."""
-        # Test Unix absolute path
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, '/etc/passwd')
-        assert 'absolute path' in str(exc_info.value).lower()
-        
-        # Test Windows absolute path
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, 'C:\\Windows')
-        assert 'invalid pattern' in str(exc_info.value).lower()
-    
-    def test_safe_path_join_empty_parts(self, storage_manager):
-        """Test handling of empty path components."""
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join()
-        assert 'No path components' in str(exc_info.value)
-    
-    @patch.object(SecurityValidator, 'validate_path_traversal')
-    def test_safe_path_join_uses_security_validator(self, mock_validate, storage_manager):
-        """Test that SecurityValidator is used for validation."""
-        # Set up mock to return True for valid paths
-        mock_validate.side_effect = [True, True]  # For two components (nvme_path is skipped)
-        
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'models', 'test')
-        
-        # Verify the validator was called for each component except nvme_path
-        # nvme_path is skipped because it's the base path and already validated
-        assert mock_validate.call_count == 2
-        assert result == Path('/mnt/nvme/models/test')
+# Valid _safe_path_join components and the path they should produce under /mnt/nvme
+_VALID_JOIN_CASES = (
+    # Simple, multi-component and nested joins
+    (('models',), Path('/mnt/nvme/models')),
+    (('models', 'llama'), Path('/mnt/nvme/models/llama')),
+    (('hf-cache', 'models', 'bert-base'), Path('/mnt/nvme/hf-cache/models/bert-base')),
+    # Path objects as components
+    ((Path('models'),), Path('/mnt/nvme/models')),
+    # Dots and slashes
+    (('./models',), Path('/mnt/nvme/./models')),
+    (('model.v1.0.bin',), Path('/mnt/nvme/model.v1.0.bin')),
+    (('models/llama/7b',), Path('/mnt/nvme/models/llama/7b')),
+    # Special characters
+    (('model-v1_0',), Path('/mnt/nvme/model-v1_0')),
+    (('model.checkpoint',), Path('/mnt/nvme/model.checkpoint')),
+)
+_VALID_JOIN_IDS = [
+    '+'.join(f'Path({part})' if isinstance(part, Path) else part for part in parts)
+    for parts, _ in _VALID_JOIN_CASES
+]
+
+
+def _join_under_base(manager, *parts):
+    """Call _safe_path_join with the manager's nvme_path as the first component."""
+    return manager._safe_path_join(manager.nvme_path, *parts)
+
+
+@pytest.mark.parametrize('parts,expected', _VALID_JOIN_CASES, ids=_VALID_JOIN_IDS)
+def test_safe_path_join_valid(storage_manager, parts, expected):
+    """Test that valid components are joined under nvme_path."""
+    assert _join_under_base(storage_manager, *parts) == expected
+
+
+def test_safe_path_join_with_path_object_base(storage_manager):
+    """Test that a Path base is handled like nvme_path itself."""
+    result = storage_manager._safe_path_join(Path('/mnt/nvme'), 'models')
+    assert result == Path('/mnt/nvme/models')
+
+
+@pytest.mark.parametrize('parts,message', [
+    # Parent directory traversal
+    (('../etc',), 'path traversal'),
+    (('models', '../../etc'), 'invalid pattern'),
+    # Windows-style traversal
+    (('..\\windows',), 'path traversal'),
+    # Unix and Windows absolute paths
+    (('/etc/passwd',), 'absolute path'),
+    (('C:\\Windows',), 'invalid pattern'),
+])
+def test_safe_path_join_rejects(storage_manager, parts, message):
+    """Test that traversal attempts and absolute components are rejected."""
+    with pytest.raises(SecurityException, match=f'(?i){message}'):
+        _join_under_base(storage_manager, *parts)
+
+
+@pytest.mark.parametrize('component,rejected', [
+    ('../etc', True),
+    ('../../etc', True),
+    ('..\\windows', True),
+    ('/etc/passwd', True),
+    ('C:\\Windows', True),
+    ('\\\\server\\share', True),
+    ('models', False),
+    ('./models', False),
+    ('model.v1.0.bin', False),
+    ('models/llama/7b', False),
+])
+def test_traversal_pattern_matches_validator(component, rejected):
+    """Test that the precompiled pattern agrees with SecurityValidator."""
+    assert bool(_TRAVERSAL_RE.search(component)) is rejected
+    assert SecurityValidator.validate_path_traversal(component) is not rejected
+
+
+def test_safe_path_join_empty_parts(storage_manager):
+    """Test handling of empty path components."""
+    with pytest.raises(SecurityException, match='No path components'):
+        storage_manager._safe_path_join()
+
+
+def test_safe_path_join_uses_security_validator(storage_manager, validator_mock, monkeypatch):
+    """Test that SecurityValidator is used for validation."""
+    validator_mock.validate_path_traversal.return_value = True
+    monkeypatch.setattr('nvme_models.storage.SecurityValidator', validator_mock)
     
-    @patch.object(SecurityValidator, 'validate_path_traversal')
-    def test_safe_path_join_validator_rejection(self, mock_validate, storage_manager):
-        """Test that validation failures from SecurityValidator are handled."""
-        # Set up mock to return False for the first component after nvme_path
-        mock_validate.side_effect = [False]
-        
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, 'malicious_path')
-        
-        assert 'invalid pattern' in str(exc_info.value).lower()
-        assert 'index 1' in str(exc_info.value)
+    result = _join_under_base(storage_manager, 'models', 'test')
     
-    def test_safe_path_join_with_dots_and_slashes(self, storage_manager):
-        """Test handling of various dot and slash combinations."""
-        # Valid current directory reference
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, './models')
-        assert result == Path('/mnt/nvme/./models')
-        
-        # Valid filename with dots
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'model.v1.0.bin')
-        assert result == Path('/mnt/nvme/model.v1.0.bin')
-        
-        # Valid nested path
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'models/llama/7b')
-        assert result == Path('/mnt/nvme/models/llama/7b')
+    # Verify the validator was called for each component except nvme_path
+    # nvme_path is skipped because it's the base path and already validated
+    assert validator_mock.validate_path_traversal.call_args_list == [call('models'), call('test')]
+    assert result == Path('/mnt/nvme/models/test')
+
+
+def test_safe_path_join_validator_rejection(storage_manager, validator_mock, monkeypatch):
+    """Test that validation failures from SecurityValidator are handled."""
+    # Reject the first component after nvme_path
+    validator_mock.validate_path_traversal.return_value = False
+    monkeypatch.setattr('nvme_models.storage.SecurityValidator', validator_mock)
     
-    def test_safe_path_join_special_characters(self, storage_manager):
-        """Test handling of special characters in path components."""
-        # Valid special characters
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'model-v1_0')
-        assert result == Path('/mnt/nvme/model-v1_0')
-        
-        result = storage_manager._safe_path_join(storage_manager.nvme_path, 'model.checkpoint')
-        assert result == Path('/mnt/nvme/model.checkpoint')
+    with pytest.raises(SecurityException, match='index 1 contains invalid pattern'):
+        _join_under_base(storage_manager, 'malicious_path')
+
+
+def test_safe_path_join_error_messages(storage_manager):
+    """Test that error messages contain helpful information."""
+    # Test error message includes the problematic component
+    with pytest.raises(SecurityException) as exc_info:
+        _join_under_base(storage_manager, 'valid', '../invalid')
     
-    def test_safe_path_join_error_messages(self, storage_manager):
-        """Test that error messages contain helpful information."""
-        # Test error message includes the problematic component
-        with pytest.raises(SecurityException) as exc_info:
-            storage_manager._safe_path_join(storage_manager.nvme_path, 'valid', '../invalid')
-        
-        error_msg = str(exc_info.value)
-        assert 'index 2' in error_msg  # Should indicate which component failed
-        assert '../invalid' in error_msg  # Should show the problematic path
-        assert 'path traversal' in error_msg.lower()  # Should explain the issue
+    error_msg = str(exc_info.value)
+    assert 'index 2' in error_msg  # Should indicate which component failed
+    assert '../invalid' in error_msg  # Should show the problematic path
+    assert 'path traversal' in error_msg.lower()  # Should explain the issue
 
 
 class TestDownloadAtomic:
@@ -396,38 +384,49 @@ class TestDownloadAtomic:
         result = storage_manager._validate_download(model_path, 'hf', 'test/model')
         assert result is False
     
-    def test_validate_download_hf_empty_directory(self, storage_manager):
+    def test_validate_download_hf_empty_directory(self, storage_manager, tmp_path):
         """Test validation fails for empty HF model directory."""
-        model_path = Mock(spec=Path)
-        model_path.exists.return_value = True
-        model_path.is_dir.return_value = True
-        model_path.rglob.return_value = []  # Empty directory
+        model_path = tmp_path / 'empty_model'
+        model_path.mkdir()
         
         result = storage_manager._validate_download(model_path, 'hf', 'test/model')
         assert result is False
     
-    def test_validate_download_hf_with_files(self, storage_manager):
+    def test_validate_download_hf_with_files(self, storage_manager, tmp_path):
         """Test validation passes for HF model with files."""
-        model_path = Mock(spec=Path)
-        model_path.exists.return_value = True
-        model_path.is_dir.return_value = True
-        
-        # Mock some files
-        mock_file1 = Mock()
-        mock_file1.is_file.return_value = True
-        mock_file1.stat.return_value.st_size = 1000
-        mock_file1.__str__ = lambda x: '/path/model.safetensors'
-        
-        mock_file2 = Mock()
-        mock_file2.is_file.return_value = True
-        mock_file2.stat.return_value.st_size = 500
-        mock_file2.__str__ = lambda x: '/path/config.json'
-        
-        model_path.rglob.return_value = [mock_file1, mock_file2]
+        model_path = tmp_path / 'model'
+        model_path.mkdir()
+        (model_path / 'model.safetensors').write_bytes(b'\0' * 1000)
+        (model_path / 'config.json').write_bytes(b'\0' * 500)
         
         result = storage_manager._validate_download(model_path, 'hf', 'test/model')
         assert result is True
     
+    def test_validate_download_hf_only_empty_files(self, storage_manager, tmp_path):
+        """Test validation fails when every file in the HF directory is empty."""
+        model_path = tmp_path / 'model'
+        (model_path / 'sub').mkdir(parents=True)
+        (model_path / 'sub' / 'model.safetensors').touch()
+        
+        result = storage_manager._validate_download(model_path, 'hf', 'test/model')
+        assert result is False
+    
+    def test_summarize_download_sizes_symlink_targets(self, storage_manager, tmp_path):
+        """Test that symlinked weights count their target size without following dir links."""
+        blobs = tmp_path / 'blobs'
+        blobs.mkdir()
+        (blobs / 'abc').write_bytes(b'\0' * 2048)
+        model_path = tmp_path / 'snapshot'
+        model_path.mkdir()
+        (model_path / 'model.gguf').symlink_to(blobs / 'abc')
+        (model_path / 'linked_dir').symlink_to(blobs)
+        (model_path / 'dangling.bin').symlink_to(tmp_path / 'missing')
+        (model_path / '.cache').mkdir()
+        (model_path / '.cache' / 'partial.safetensors').write_bytes(b'\0' * 16)
+        
+        entries, model_files, total = storage_manager._summarize_download(model_path)
+        assert (entries, model_files, total) == (5, 2, 2064)
+    
     def test_validate_download_empty_file(self, storage_manager):
         """Test validation fails for empty downloaded file."""
         model_path = Mock(spec=Path)
@@ -711,4 +710,770 @@ class TestFileLocking:
                 0o644
             )
             
-            assert result_fd == mock_fd
\ No newline at end of file
+            assert result_fd == mock_fd
+
+
+class TestCheckNvmeMounted:
+    """Test cases for check_nvme_mounted."""
+    
+    @pytest.fixture(autouse=True)
+    def fresh_mountinfo_cache(self, monkeypatch):
+        """Give each test its own mountinfo cache and keep statmount out of the way."""
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO', _MountInfoCache())
+        monkeypatch.setattr('nvme_models._statmount._HAVE_STATMOUNT', False)
+        _block_disk_name.cache_clear()
+    
+    @pytest.fixture
+    def storage_manager(self, tmp_path):
+        """Create a storage manager rooted in a temporary directory."""
+        config = {
+            'storage': {
+                'nvme_path': str(tmp_path / 'nvme'),
+                'require_mount': True,
+                'min_free_space_gb': 50
+            }
+        }
+        (tmp_path / 'nvme').mkdir()
+        return NVMeStorageManager(config)
+    
+    @pytest.fixture
+    def mountinfo(self, tmp_path, monkeypatch):
+        """Point the storage module at a fake mountinfo file."""
+        mountinfo_file = tmp_path / 'mountinfo'
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(mountinfo_file))
+        
+        def write(*mount_points):
+            lines = ['22 1 259:1 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p1 rw']
+            for i, mount_point in enumerate(mount_points):
+                escaped = str(mount_point).replace(' ', '\\040')
+                lines.append(f'{30 + i} 22 259:2 / {escaped} rw,relatime shared:2 - xfs /dev/nvme1n1 rw')
+            mountinfo_file.write_text('\n'.join(lines) + '\n')
+        
+        return write
+    
+    def test_mounted_nvme(self, storage_manager, mountinfo):
+        """Test that an NVMe mount is detected from mountinfo without subprocesses."""
+        mountinfo(storage_manager.nvme_path)
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is True
+        assert details is None
+        mock_run.assert_not_called()
+    
+    def test_not_mounted(self, storage_manager, mountinfo):
+        """Test that a plain directory reports the device of its parent mount."""
+        mountinfo()
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is False
+        assert details['error'] == 'not_mounted'
+        assert details['device_info']['device'] == '/dev/nvme0n1p1'
+        mock_run.assert_not_called()
+    
+    def test_source_after_optional_fields(self, storage_manager, tmp_path, monkeypatch):
+        """Test that the source device is found past a variable number of optional fields."""
+        mountinfo_file = tmp_path / 'mountinfo'
+        mountinfo_file.write_text(
+            f'30 22 259:2 / {storage_manager.nvme_path} rw shared:2 master:1 - xfs /dev/nvme1n1 rw\n'
+            f'31 22 0:5 / /proc rw - proc proc rw\n'
+        )
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(mountinfo_file))
+        
+        assert _MountInfoCache().get() == [
+            (str(storage_manager.nvme_path), '259:2', '/dev/nvme1n1'),
+            ('/proc', '0:5', 'proc'),
+        ]
+    
+    def test_mounted_not_nvme(self, storage_manager, tmp_path, monkeypatch):
+        """Test that a non-NVMe mount is reported with a warning and no lsblk fallback."""
+        mountinfo_file = tmp_path / 'mountinfo'
+        mountinfo_file.write_text(f'30 22 8:1 / {storage_manager.nvme_path} rw - ext4 /dev/sda1 rw\n')
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(mountinfo_file))
+        monkeypatch.setattr('nvme_models.storage._SYS_DEV_BLOCK', str(tmp_path / 'missing'))
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is True
+        assert details['warning'] == 'not_nvme_device'
+        assert details['device_info'] == {'device': '/dev/sda1'}
+        mock_run.assert_not_called()
+    
+    def test_nvme_resolved_through_sysfs(self, storage_manager, tmp_path, monkeypatch):
+        """Test that a source without "nvme" in its name is resolved via /sys/dev/block."""
+        mountinfo_file = tmp_path / 'mountinfo'
+        mountinfo_file.write_text(f'30 22 259:2 / {storage_manager.nvme_path} rw - ext4 /dev/root rw\n')
+        sys_dev_block = tmp_path / 'sys' / 'dev' / 'block'
+        sys_dev_block.mkdir(parents=True)
+        (sys_dev_block / '259:2').symlink_to('../../devices/pci0000:00/nvme/nvme0/nvme0n1/nvme0n1p2')
+        model_file = tmp_path / 'sys' / 'block' / 'nvme0n1' / 'device' / 'model'
+        model_file.parent.mkdir(parents=True)
+        model_file.write_text('Samsung SSD 990 PRO 2TB\n')
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(mountinfo_file))
+        monkeypatch.setattr('nvme_models.storage._SYS_DEV_BLOCK', str(sys_dev_block))
+        monkeypatch.setattr('nvme_models.storage._SYS_BLOCK', str(tmp_path / 'sys' / 'block'))
+        
+        with patch('nvme_models.storage.open', wraps=open, create=True) as mock_open:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is True
+        assert details is None
+        assert str(model_file) not in [str(c.args[0]) for c in mock_open.call_args_list]
+    
+    def test_describe_nvme_mount(self, storage_manager, tmp_path, monkeypatch):
+        """Test that describe_nvme_mount reads the drive's model and serial from sysfs."""
+        mountinfo_file = tmp_path / 'mountinfo'
+        mountinfo_file.write_text(f'30 22 259:2 / {storage_manager.nvme_path} rw - ext4 /dev/nvme0n1p2 rw\n')
+        sys_dev_block = tmp_path / 'sys' / 'dev' / 'block'
+        sys_dev_block.mkdir(parents=True)
+        (sys_dev_block / '259:2').symlink_to('../../devices/pci0000:00/nvme/nvme0/nvme0n1/nvme0n1p2')
+        device_dir = tmp_path / 'sys' / 'block' / 'nvme0n1' / 'device'
+        device_dir.mkdir(parents=True)
+        (device_dir / 'model').write_text('Samsung SSD 990 PRO 2TB\n')
+        (device_dir / 'serial').write_text('  S6Z2NF0W123456  \n')
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(mountinfo_file))
+        monkeypatch.setattr('nvme_models.storage._SYS_DEV_BLOCK', str(sys_dev_block))
+        monkeypatch.setattr('nvme_models.storage._SYS_BLOCK', str(tmp_path / 'sys' / 'block'))
+        
+        assert storage_manager.describe_nvme_mount() == {
+            'mount_point': str(storage_manager.nvme_path),
+            'device': '/dev/nvme0n1p2',
+            'disk': 'nvme0n1',
+            'model': 'Samsung SSD 990 PRO 2TB',
+            'serial': 'S6Z2NF0W123456',
+        }
+    
+    def test_device_number_fast_path(self, storage_manager, tmp_path, monkeypatch):
+        """Test that a path on its own NVMe device skips the mount table."""
+        sys_dev_block = tmp_path / 'sys' / 'dev' / 'block'
+        sys_dev_block.mkdir(parents=True)
+        (sys_dev_block / '259:2').symlink_to('../../devices/pci0000:00/nvme/nvme0/nvme0n1/nvme0n1p2')
+        monkeypatch.setattr('nvme_models.storage._SYS_DEV_BLOCK', str(sys_dev_block))
+        real_stat = os.stat
+        
+        def fake_stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if os.fspath(path) == storage_manager._nvme_path_real:
+                return Mock(st_dev=os.makedev(259, 2), st_mode=result.st_mode)
+            return result
+        
+        with patch('nvme_models.storage.os.stat', side_effect=fake_stat), \
+             patch('nvme_models._statmount.find_mount') as mock_find, \
+             patch.object(_MountInfoCache, 'get') as mock_get:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is True
+        assert details is None
+        mock_find.assert_not_called()
+        mock_get.assert_not_called()
+    
+    def test_escaped_mount_point(self, storage_manager, mountinfo, tmp_path):
+        """Test that octal escapes in mount points are decoded."""
+        storage_manager.nvme_path = tmp_path / 'my disk'
+        storage_manager.nvme_path.mkdir()
+        mountinfo(storage_manager.nvme_path)
+        
+        is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is True
+    
+    def test_mountinfo_read_once(self, storage_manager, mountinfo):
+        """Test that repeated checks reuse the parsed mount table."""
+        mountinfo(storage_manager.nvme_path)
+        
+        with patch('nvme_models.storage.open', wraps=open, create=True) as mock_open:
+            storage_manager.check_nvme_mounted(cache_ttl_s=0)
+            storage_manager.check_nvme_mounted(cache_ttl_s=0)
+        
+        assert mock_open.call_count == 1
+    
+    def test_mountinfo_shared_between_managers(self, storage_manager, mountinfo):
+        """Test that separate managers share one parse of the mount table."""
+        mountinfo(storage_manager.nvme_path)
+        other = NVMeStorageManager(storage_manager.config)
+        
+        with patch('nvme_models.storage.open', wraps=open, create=True) as mock_open:
+            assert storage_manager.check_nvme_mounted() == (True, None)
+            assert other.check_nvme_mounted() == (True, None)
+        
+        assert mock_open.call_count == 1
+    
+    def test_result_memoized(self, storage_manager, mountinfo):
+        """Test that the check result is reused until the TTL expires."""
+        mountinfo(storage_manager.nvme_path)
+        
+        with patch.object(storage_manager, '_check_nvme_mounted',
+                          wraps=storage_manager._check_nvme_mounted) as mock_check:
+            first = storage_manager.check_nvme_mounted()
+            second = storage_manager.check_nvme_mounted()
+            assert mock_check.call_count == 1
+            
+            third = storage_manager.check_nvme_mounted(cache_ttl_s=0)
+            assert mock_check.call_count == 2
+        
+        assert first == second == third == (True, None)
+    
+    def test_statmount_skips_mountinfo(self, storage_manager, monkeypatch):
+        """Test that a statmount answer is used without reading mountinfo."""
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', '/nonexistent/mountinfo')
+        entry = (str(storage_manager.nvme_path), '259:2', '/dev/nvme1n1')
+        
+        with patch('nvme_models._statmount.find_mount', return_value=entry) as mock_find:
+            is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        mock_find.assert_called_once_with(str(storage_manager.nvme_path))
+        assert is_mounted is True
+        assert details is None
+    
+    def test_statmount_matches_mountinfo(self, monkeypatch):
+        """Test that the statmount lookup agrees with mountinfo for the root mount."""
+        monkeypatch.setattr('nvme_models._statmount._HAVE_STATMOUNT', _statmount._statmount_supported())
+        entry = _statmount.find_mount('/')
+        if entry is None:
+            pytest.skip('statmount(2) is not available on this kernel')
+        
+        root_entries = [e for e in _MountInfoCache().get() if e[0] == '/']
+        assert entry[0] == '/'
+        assert entry[1] == root_entries[-1][1]
+    
+    @pytest.mark.parametrize('machine,supported', [
+        ('x86_64', True), ('aarch64', True), ('alpha', False), ('mips64', False),
+    ])
+    def test_statmount_only_on_generic_numbering(self, machine, supported):
+        """Test that statmount is skipped where the syscall has another number."""
+        with patch('nvme_models._statmount.sys.platform', 'linux'), \
+             patch('nvme_models._statmount.platform.machine', return_value=machine):
+            assert _statmount._statmount_supported() is supported
+    
+    def test_trust_path_skips_checks(self, storage_manager, monkeypatch):
+        """Test that trust_path accepts an existing directory without inspecting mounts."""
+        storage_manager.trust_path = True
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', '/nonexistent/mountinfo')
+        
+        with patch('nvme_models._statmount.find_mount') as mock_find:
+            assert storage_manager.check_nvme_mounted() == (True, None)
+        mock_find.assert_not_called()
+        
+        storage_manager.nvme_path = storage_manager.nvme_path / 'missing'
+        is_mounted, details = storage_manager.check_nvme_mounted(cache_ttl_s=0)
+        assert is_mounted is False
+        assert details['error'] == 'path_not_found'
+    
+    def test_unreadable_mountinfo(self, storage_manager, monkeypatch, tmp_path):
+        """Test that a missing mount table is reported as a failed check."""
+        monkeypatch.setattr('nvme_models.storage._MOUNTINFO_PATH', str(tmp_path / 'missing'))
+        
+        is_mounted, details = storage_manager.check_nvme_mounted()
+        
+        assert is_mounted is False
+        assert details['error'] == 'mount_check_failed'
+
+
+class TestGetDirSize:
+    """Test cases for the _get_dir_size method."""
+    
+    @pytest.fixture
+    def storage_manager(self, tmp_path):
+        """Create a storage manager rooted in a temporary directory."""
+        config = {
+            'storage': {
+                'nvme_path': str(tmp_path),
+                'require_mount': False,
+                'min_free_space_gb': 50
+            }
+        }
+        return NVMeStorageManager(config)
+    
+    def test_sums_nested_files_without_du(self, storage_manager, tmp_path):
+        """Test that sizes are summed in-process and formatted like du -h."""
+        model_dir = tmp_path / 'models' / 'llama'
+        (model_dir / 'snapshots').mkdir(parents=True)
+        (model_dir / 'config.json').write_bytes(b'x' * 1024)
+        (model_dir / 'snapshots' / 'model.safetensors').write_bytes(b'x' * 2048)
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            size = storage_manager._get_dir_size(model_dir)
+        
+        assert size == '3.0K'
+        mock_run.assert_not_called()
+    
+    def test_symlinks_not_followed(self, storage_manager, tmp_path):
+        """Test that symlinked directories are not descended into."""
+        big_dir = tmp_path / 'big'
+        big_dir.mkdir()
+        (big_dir / 'blob').write_bytes(b'x' * 1024 * 1024)
+        link_dir = tmp_path / 'links'
+        link_dir.mkdir()
+        (link_dir / 'big').symlink_to(big_dir)
+        
+        # Only the link itself is counted, which is well under 1K
+        assert storage_manager._get_dir_size(link_dir).isdigit()
+    
+    def test_cached_until_mtime_changes(self, storage_manager, tmp_path):
+        """Test that repeated calls reuse the result until the directory changes."""
+        model_dir = tmp_path / 'model'
+        model_dir.mkdir()
+        (model_dir / 'a.bin').write_bytes(b'x' * 1024)
+        
+        assert storage_manager._get_dir_size(model_dir) == '1.0K'
+        with patch('nvme_models.storage.os.scandir') as mock_scandir:
+            assert storage_manager._get_dir_size(model_dir) == '1.0K'
+        mock_scandir.assert_not_called()
+        
+        (model_dir / 'b.bin').write_bytes(b'x' * 1024)
+        os.utime(model_dir, ns=(0, os.stat(model_dir).st_mtime_ns + 1))
+        assert storage_manager._get_dir_size(model_dir) == '2.0K'
+    
+    def test_download_clears_cache(self, tmp_path):
+        """Test that a download drops sizes whose nested contents it may have changed."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        model_dir = tmp_path / 'models' / 'org--model'
+        (model_dir / 'weights').mkdir(parents=True)
+        assert manager._get_dir_size(model_dir) == '0'
+        
+        def download(model_id):
+            # Only the nested directory changes, so model_dir keeps its mtime
+            (model_dir / 'weights' / 'a.bin').write_bytes(b'x' * 1024)
+            return True
+        
+        handler = Mock()
+        handler.estimate_model_size.return_value = 1
+        handler.download.side_effect = download
+        with patch('nvme_models.models.get_provider_handler', return_value=handler), \
+             patch.object(manager, 'check_disk_space', return_value=True):
+            assert manager.download_model('hf', 'org/model') is True
+        
+        assert manager._get_dir_size(model_dir) == '1.0K'
+    
+    def test_missing_directory(self, storage_manager, tmp_path):
+        """Test that an unreadable directory reports 'unknown'."""
+        assert storage_manager._get_dir_size(tmp_path / 'missing') == 'unknown'
+
+
+class TestCountModelFiles:
+    """Test cases for the _count_model_files method."""
+    
+    def test_single_walk_counts_all_extensions(self, tmp_path):
+        """Test that all model extensions are counted, including snapshot symlinks."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        snapshot = tmp_path / 'hf-cache' / 'models--org--model' / 'snapshots' / 'abc'
+        blobs = tmp_path / 'hf-cache' / 'models--org--model' / 'blobs'
+        snapshot.mkdir(parents=True)
+        blobs.mkdir(parents=True)
+        (blobs / 'f00d').write_bytes(b'x')
+        (snapshot / 'model.safetensors').symlink_to(blobs / 'f00d')
+        for name in ('a.bin', 'b.gguf', 'c.pt', 'd.pth', 'config.json'):
+            (tmp_path / 'models' / name).parent.mkdir(exist_ok=True)
+            (tmp_path / 'models' / name).write_bytes(b'x')
+        hidden = tmp_path / '.tmp_partial'
+        hidden.mkdir()
+        (hidden / 'model.safetensors').write_bytes(b'x')
+        
+        with patch.object(Path, 'rglob') as mock_rglob:
+            assert manager._count_model_files() == 5
+        mock_rglob.assert_not_called()
+    
+    def test_large_tree_walked_in_parallel(self, tmp_path):
+        """Test that many model subtrees are counted on a thread pool."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        for i in range(6):
+            model_dir = tmp_path / 'models' / f'model-{i}' / 'weights'
+            model_dir.mkdir(parents=True)
+            (model_dir / 'model.safetensors').write_bytes(b'x')
+        (tmp_path / 'models' / 'loose.gguf').write_bytes(b'x')
+        
+        with patch('nvme_models.storage.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_pool:
+            assert manager._count_model_files() == 7
+        mock_pool.assert_called_once_with(max_workers=6)
+    
+    def test_small_tree_walked_serially(self, tmp_path):
+        """Test that a few subtrees do not start a thread pool."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        (tmp_path / 'models' / 'llama').mkdir(parents=True)
+        (tmp_path / 'models' / 'llama' / 'model.bin').write_bytes(b'x')
+        
+        with patch('nvme_models.storage.ThreadPoolExecutor') as mock_pool:
+            assert manager._count_model_files() == 1
+        mock_pool.assert_not_called()
+
+
+class TestScanTree:
+    """Test cases for the fused _scan_tree walk used by verify()."""
+    
+    @pytest.fixture
+    def storage_manager(self, tmp_path):
+        """Create a storage manager over a small model tree."""
+        (tmp_path / 'models' / 'llama').mkdir(parents=True)
+        (tmp_path / 'models' / 'llama' / 'model.safetensors').write_bytes(b'x' * 2048)
+        (tmp_path / 'models' / 'llama' / 'config.json').write_bytes(b'x' * 1024)
+        (tmp_path / 'ollama').mkdir()
+        (tmp_path / 'ollama' / 'model.gguf').write_bytes(b'x' * 1024)
+        (tmp_path / 'hf-cache' / '.locks').mkdir(parents=True)
+        (tmp_path / 'hf-cache' / '.locks' / 'stale.bin').write_bytes(b'x' * 1024)
+        return NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+    
+    def test_sizes_and_counts(self, storage_manager):
+        """Test that sizes and per-extension counts come from one walk."""
+        scan = storage_manager._scan_tree()
+        
+        assert scan['dir_sizes'] == {'models': 3072, 'ollama': 1024, 'hf-cache': 1024}
+        assert scan['model_counts_by_ext'] == {'.safetensors': 1, '.gguf': 1}
+    
+    def test_verify_walks_tree_once(self, storage_manager):
+        """Test that verify() derives sizes and model counts from a single scan."""
+        with patch.object(storage_manager, 'check_nvme_mounted', return_value=(True, None)), \
+             patch.object(storage_manager, '_scan_tree', wraps=storage_manager._scan_tree) as mock_scan, \
+             patch.object(storage_manager, '_safe_path_join') as mock_join, \
+             patch('nvme_models.storage.subprocess.run') as mock_run:
+            results = storage_manager.verify(deep=True)
+        
+        mock_scan.assert_called_once()
+        mock_run.assert_not_called()
+        mock_join.assert_not_called()
+        assert results['summary']['model_files_found'] == 2
+        sizes = {entry['message']: entry['size'] for entry in results['success'] if entry['check'] == 'directory'}
+        assert sizes[f"{storage_manager.nvme_path / 'models'} exists"] == '3.0K'
+    
+    def test_prefetched_scan_used_by_verify(self, storage_manager):
+        """Test that verify() consumes the scan started at construction."""
+        with patch.object(NVMeStorageManager, '_scan_tree', autospec=True,
+                          side_effect=NVMeStorageManager._scan_tree) as mock_scan:
+            manager = NVMeStorageManager(storage_manager.config, prefetch=True)
+            results = manager.verify(deep=True)
+        
+        mock_scan.assert_called_once()
+        assert manager._prefetch is None
+        assert results['summary']['model_files_found'] == 2
+    
+    def test_verify_runs_checks_concurrently(self, storage_manager):
+        """Test that the mount check, tree scan and disk usage overlap."""
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def arrive(result):
+            barrier.wait()
+            return result
+        
+        usage = {'total_gb': 100, 'used_gb': 10, 'available_gb': 90, 'usage_percent': 10.0}
+        with patch.object(storage_manager, 'check_nvme_mounted', side_effect=lambda: arrive((True, None))), \
+             patch.object(storage_manager, '_scan_tree',
+                          side_effect=lambda: arrive({'dir_sizes': {}, 'model_counts_by_ext': {'.bin': 3}})), \
+             patch.object(storage_manager, 'get_disk_usage', side_effect=lambda: arrive(usage)):
+            results = storage_manager.verify(deep=True)
+        
+        assert results['summary']['nvme_mounted'] is True
+        assert results['summary']['model_files_found'] == 3
+        assert results['summary']['disk_usage'] == usage
+    
+    def test_quick_verify_skips_scan(self, storage_manager):
+        """Test that verify() without deep leaves sizes and model counts uncomputed."""
+        with patch.object(storage_manager, 'check_nvme_mounted', return_value=(True, None)), \
+             patch.object(storage_manager, '_scan_tree') as mock_scan:
+            results = storage_manager.verify()
+        
+        mock_scan.assert_not_called()
+        assert results['summary']['model_files_found'] is None
+        assert not any(entry['check'] == 'models' for entry in results['success'] + results['warnings'])
+        assert all('size' not in entry for entry in results['success'] if entry['check'] == 'directory')
+    
+    def test_prefetch_without_scan(self, storage_manager):
+        """Test that prefetch_scan=False keeps the tree walk out of the prefetch."""
+        with patch.object(NVMeStorageManager, '_scan_tree', autospec=True) as mock_scan:
+            manager = NVMeStorageManager(storage_manager.config, prefetch=True, prefetch_scan=False)
+            manager._join_prefetch()
+        
+        mock_scan.assert_not_called()
+
+
+class TestListModels:
+    """Test cases for NVMeStorageManager.list_models."""
+    
+    @staticmethod
+    def _write_manifest(manifests_dir, registry, namespace, model, tag, sizes):
+        """Write an Ollama manifest with the given layer sizes."""
+        manifest_file = manifests_dir / registry / namespace / model / tag
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        manifest_file.write_text(json.dumps({
+            'config': {'size': sizes[0]},
+            'layers': [{'size': size} for size in sizes[1:]]
+        }))
+    
+    def test_ollama_models_read_from_manifests(self, tmp_path):
+        """Test that Ollama models are listed from manifests without running ollama."""
+        manifests_dir = tmp_path / 'ollama' / 'manifests'
+        self._write_manifest(manifests_dir, 'registry.ollama.ai', 'library', 'llama3', 'latest', [512, 2 * 1024 ** 3, 512])
+        self._write_manifest(manifests_dir, 'registry.ollama.ai', 'acme', 'coder', '7b', [1024])
+        self._write_manifest(manifests_dir, 'hf.co', 'org', 'model', 'Q4_K_M', [1024 ** 2])
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            models = manager.list_models()
+        
+        mock_run.assert_not_called()
+        assert [(m['name'], m['size'], m['provider']) for m in models] == [
+            ('acme/coder:7b', '1.0K', 'ollama'),
+            ('hf.co/org/model:Q4_K_M', '1.0M', 'ollama'),
+            ('llama3:latest', '2.0G', 'ollama'),
+        ]
+        assert models[0]['path'] == str(tmp_path / 'ollama')
+    
+    def test_ollama_cli_fallback_without_manifests(self, tmp_path):
+        """Test that the ollama CLI is only used when no manifests directory exists."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        output = b'NAME ID SIZE MODIFIED\nllama3:latest 365c0bd3c000 4.7 GB 2 days ago\n'
+        
+        with patch('urllib.request.urlopen', side_effect=ConnectionRefusedError), \
+             patch('nvme_models.storage.subprocess.run',
+                   return_value=Mock(returncode=0, stdout=output)) as mock_run:
+            models = manager.list_models()
+        
+        mock_run.assert_called_once()
+        assert mock_run.call_args.kwargs['start_new_session'] is True
+        assert [(m['name'], m['size']) for m in models] == [('llama3:latest', '4.7 GB')]
+    
+    def test_ollama_api_before_cli(self, tmp_path):
+        """Test that a running Ollama server is asked before forking the CLI."""
+        manager = NVMeStorageManager({
+            'storage': {'nvme_path': str(tmp_path)},
+            'providers': {'ollama': {'api_url': 'http://ollama.test:11434/'}}
+        })
+        body = json.dumps({'models': [
+            {'name': 'mistral:7b', 'size': 4109865159},
+            {'name': 'llama3:latest', 'size': 4661224676},
+        ]}).encode()
+        response = MagicMock()
+        response.__enter__.return_value = io.BytesIO(body)
+        
+        with patch('urllib.request.urlopen', return_value=response) as mock_urlopen, \
+             patch('nvme_models.storage.subprocess.run') as mock_run:
+            models = manager.list_models()
+        
+        mock_run.assert_not_called()
+        assert mock_urlopen.call_args.args[0] == 'http://ollama.test:11434/api/tags'
+        assert [(m['name'], m['size']) for m in models] == [('llama3:latest', '4.3G'), ('mistral:7b', '3.8G')]
+    
+    def test_model_directories_sized_without_du(self, tmp_path):
+        """Test that model directories are listed and sized in-process."""
+        (tmp_path / 'models' / 'llama').mkdir(parents=True)
+        (tmp_path / 'models' / 'llama' / 'model.safetensors').write_bytes(b'x' * 2048)
+        (tmp_path / 'models' / '.tmp_partial').mkdir()
+        (tmp_path / 'models' / 'README').write_text('not a model')
+        (tmp_path / 'ollama' / 'manifests').mkdir(parents=True)
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        
+        with patch('nvme_models.storage.subprocess.run') as mock_run:
+            models = manager.list_models()
+        
+        mock_run.assert_not_called()
+        assert models == [{
+            'name': 'llama',
+            'path': str(tmp_path / 'models' / 'llama'),
+            'size': '2.0K',
+            'provider': 'huggingface'
+        }]
+
+
+class TestSetupEnvironmentVariables:
+    """Test cases for _setup_environment_variables."""
+    
+    def test_env_file_written_once(self, tmp_path, monkeypatch):
+        """Test that the env file is written in one go and left alone when current."""
+        for var in ('HF_HOME', 'TRANSFORMERS_CACHE', 'HUGGINGFACE_HUB_CACHE', 'OLLAMA_MODELS'):
+            monkeypatch.setenv(var, '')
+        env_file = tmp_path / 'nvme-models.env'
+        monkeypatch.setenv('NVME_MODELS_ENV_FILE', str(env_file))
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        
+        with patch.object(manager, '_validate_path_boundary', return_value=True):
+            manager._setup_environment_variables()
+            assert env_file.read_text() == (
+                f'HF_HOME={tmp_path}/hf-cache\n'
+                f'TRANSFORMERS_CACHE={tmp_path}/hf-cache\n'
+                f'HUGGINGFACE_HUB_CACHE={tmp_path}/hf-cache\n'
+                f'OLLAMA_MODELS={tmp_path}/ollama\n'
+            )
+            
+            os.utime(env_file, ns=(0, 0))
+            manager._setup_environment_variables()
+        
+        assert env_file.stat().st_mtime_ns == 0
+        assert os.environ['OLLAMA_MODELS'] == f'{tmp_path}/ollama'
+
+
+class TestDiskUsage:
+    """Test cases for get_disk_usage and check_disk_space."""
+    
+    @pytest.fixture
+    def storage_manager(self, tmp_path):
+        """Create a storage manager rooted in a temporary directory."""
+        return NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+    
+    @staticmethod
+    def _statvfs(total_gb, free_gb):
+        """Build a fake statvfs result with 4K fragments."""
+        frsize = 4096
+        blocks = int(total_gb * 1024**3) // frsize
+        free = int(free_gb * 1024**3) // frsize
+        return Mock(f_frsize=frsize, f_blocks=blocks, f_bfree=free, f_bavail=free)
+    
+    def test_reports_bytes_and_gb_from_one_statvfs(self, storage_manager):
+        """Test that usage is derived from statvfs and memoized briefly."""
+        with patch('nvme_models.storage.os.statvfs', return_value=self._statvfs(100, 25.5)) as mock_statvfs:
+            usage = storage_manager.get_disk_usage()
+            assert storage_manager.get_disk_usage() is usage
+            assert mock_statvfs.call_count == 1
+            
+            storage_manager.get_disk_usage(max_age_s=0)
+            assert mock_statvfs.call_count == 2
+        
+        assert usage['total_gb'] == 100
+        assert usage['available_gb'] == 25
+        assert usage['used_gb'] == 74
+        assert usage['available_bytes'] == int(25.5 * 1024**3)
+        assert usage['usage_percent'] == pytest.approx(74.5)
+    
+    def test_check_disk_space_compares_bytes(self, storage_manager):
+        """Test that the requirement is checked against available bytes."""
+        with patch('nvme_models.storage.os.statvfs', return_value=self._statvfs(100, 10.5)):
+            assert storage_manager.check_disk_space(10) is True
+            assert storage_manager.check_disk_space(11) is False
+    
+    def test_check_disk_space_skips_usage_dict(self, storage_manager):
+        """Test that check_disk_space reads a fresh result or stats without building one."""
+        with patch('nvme_models.storage.os.statvfs', return_value=self._statvfs(100, 10.5)) as mock_statvfs, \
+             patch.object(storage_manager, 'get_disk_usage') as mock_usage:
+            assert storage_manager.check_disk_space(10) is True
+            mock_usage.assert_not_called()
+            assert storage_manager._disk_usage_cache is None
+            
+            storage_manager._disk_usage_cache = (time.monotonic(), {'available_bytes': 0})
+            assert storage_manager.check_disk_space(10) is False
+        
+        assert mock_statvfs.call_count == 1
+    
+    def test_check_disk_space_statvfs_failure(self, storage_manager):
+        """Test that an unreadable filesystem reports no space."""
+        with patch('nvme_models.storage.os.statvfs', side_effect=OSError('gone')):
+            assert storage_manager.check_disk_space(1) is False
+    
+    def test_setup_nvme_invalidates_usage(self, storage_manager):
+        """Test that setting up the tree forces the next usage check to stat again."""
+        storage_manager.require_mount = False
+        with patch('nvme_models.storage.os.statvfs', return_value=self._statvfs(100, 50)) as mock_statvfs, \
+             patch.object(storage_manager, '_setup_environment_variables'), \
+             patch.object(storage_manager, '_create_symlinks'):
+            storage_manager.get_disk_usage()
+            assert storage_manager.setup_nvme() is True
+            storage_manager.get_disk_usage()
+        
+        assert mock_statvfs.call_count == 2
+
+
+class TestDownloadModel:
+    """Test cases for download_model."""
+    
+    def test_handler_reused_across_downloads(self, tmp_path):
+        """Test that one handler per provider serves repeated downloads."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        handler = Mock()
+        handler.estimate_model_size.return_value = 1
+        handler.download.return_value = True
+        
+        with patch('nvme_models.models.get_provider_handler', return_value=handler) as mock_get, \
+             patch.object(manager, 'check_disk_space', return_value=True):
+            assert manager.download_model('hf', 'org/a') is True
+            assert manager.download_model('hf', 'org/b') is True
+            assert mock_get.call_count == 1
+            
+            manager.invalidate_handlers()
+            manager.download_model('hf', 'org/c')
+            assert mock_get.call_count == 2
+        
+        assert handler.download.call_count == 3
+    
+    def test_unknown_provider_not_cached(self, tmp_path):
+        """Test that a failed lookup is retried rather than remembered."""
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(tmp_path)}})
+        
+        with patch('nvme_models.models.get_provider_handler', return_value=None) as mock_get:
+            assert manager.download_model('nope', 'x') is False
+            assert manager.download_model('nope', 'x') is False
+        
+        assert mock_get.call_count == 2
+
+
+class TestCreateSymlinks:
+    """Test cases for _create_symlinks."""
+    
+    @pytest.fixture
+    def home(self, tmp_path, monkeypatch):
+        """Point Path.home() at a temporary directory."""
+        home_dir = tmp_path / 'home'
+        home_dir.mkdir()
+        monkeypatch.setattr('nvme_models.storage.Path.home', lambda: home_dir)
+        return home_dir
+    
+    @pytest.fixture
+    def storage_manager(self, tmp_path):
+        """Create a storage manager with its cache directories in place."""
+        nvme = tmp_path / 'nvme'
+        (nvme / 'hf-cache').mkdir(parents=True)
+        (nvme / 'ollama').mkdir()
+        return NVMeStorageManager({'storage': {'nvme_path': str(nvme)}})
+    
+    def test_creates_replaces_and_keeps_links(self, storage_manager, home, tmp_path):
+        """Test that stale entries are replaced and correct links left untouched."""
+        hf_link = home / '.cache' / 'huggingface'
+        hf_link.mkdir(parents=True)
+        (hf_link / 'old').write_text('x')
+        (home / '.ollama').symlink_to(tmp_path / 'elsewhere')
+        
+        storage_manager._create_symlinks()
+        
+        assert os.readlink(hf_link) == str(storage_manager.nvme_path / 'hf-cache')
+        assert os.readlink(home / '.ollama') == str(storage_manager.nvme_path / 'ollama')
+        
+        with patch('nvme_models.storage.os.symlink') as mock_symlink, \
+             patch.object(Path, 'mkdir') as mock_mkdir:
+            storage_manager._create_symlinks()
+        mock_symlink.assert_not_called()
+        mock_mkdir.assert_not_called()
+    
+    def test_setup_rerun_touches_nothing(self, storage_manager, home, monkeypatch):
+        """Test that a second setup_nvme finds everything in place and returns early."""
+        for var in ('HF_HOME', 'TRANSFORMERS_CACHE', 'HUGGINGFACE_HUB_CACHE', 'OLLAMA_MODELS'):
+            monkeypatch.setenv(var, '')
+        monkeypatch.delenv('NVME_MODELS_ENV_FILE', raising=False)
+        storage_manager.require_mount = False
+        
+        assert storage_manager._is_already_setup() is False
+        assert storage_manager.setup_nvme() is True
+        
+        with patch.object(storage_manager, '_setup_environment_variables') as mock_env, \
+             patch.object(storage_manager, '_create_symlinks') as mock_links:
+            assert storage_manager.setup_nvme() is True
+        mock_env.assert_not_called()
+        mock_links.assert_not_called()
+        
+        monkeypatch.setenv('OLLAMA_MODELS', '/elsewhere')
+        assert storage_manager._is_already_setup() is False
+    
+    def test_setup_creates_directories_under_missing_parent(self, home, tmp_path, monkeypatch):
+        """Test that the concurrent creations share a missing parent without racing."""
+        monkeypatch.delenv('NVME_MODELS_ENV_FILE', raising=False)
+        nvme = tmp_path / 'fresh' / 'nvme'
+        manager = NVMeStorageManager({'storage': {'nvme_path': str(nvme), 'require_mount': False}})
+        
+        with patch.object(manager, '_setup_environment_variables'):
+            assert manager.setup_nvme() is True
+        
+        assert sorted(p.name for p in nvme.iterdir()) == ['hf-cache', 'models', 'ollama']
+    
+    def test_creates_missing_parent(self, storage_manager, home):
+        """Test that a link whose parent directory is missing is still created."""
+        storage_manager._create_symlinks()
+        
+        assert os.readlink(home / '.cache' / 'huggingface') == str(storage_manager.nvme_path / 'hf-cache')
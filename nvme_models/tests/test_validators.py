@@ -1,7 +1,9 @@
 """Test cases for validators module."""
 
 import pytest
-from nvme_models.validators import SecurityValidator
+from unittest.mock import Mock, patch
+
+from nvme_models.validators import SecurityValidator, Validator, ValidationError
 
 
 class TestSecurityValidator:
@@ -298,4 +300,25 @@ class TestSecurityValidator:
         # Null byte injection
         is_valid, error = SecurityValidator.validate_model_id("model\x00malicious", "huggingface")
         assert is_valid is False
-        assert "dangerous character" in error
\ No newline at end of file
+        assert "dangerous character" in error
+
+
+class TestValidateDiskSpace:
+    """Test cases for Validator.validate_disk_space."""
+    
+    @staticmethod
+    def _statvfs(available_bytes):
+        """Build a fake statvfs result with 4K fragments."""
+        return Mock(f_frsize=4096, f_bavail=available_bytes // 4096)
+    
+    def test_uses_one_statvfs(self):
+        """Test that free space comes straight from statvfs."""
+        with patch('nvme_models.validators.os.statvfs', return_value=self._statvfs(10 << 30)) as mock_statvfs:
+            assert Validator.validate_disk_space(10, '/mnt/nvme') is True
+        mock_statvfs.assert_called_once_with('/mnt/nvme')
+    
+    def test_compares_bytes_not_rounded_gb(self):
+        """Test that 10.5GB free does not satisfy an 11GB requirement."""
+        with patch('nvme_models.validators.os.statvfs', return_value=self._statvfs(int(10.5 * (1 << 30)))):
+            with pytest.raises(ValidationError, match='Available: 10GB'):
+                Validator.validate_disk_space(11, '/mnt/nvme')
@@ -2,6 +2,7 @@
 
 import re
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 import subprocess
@@ -48,6 +49,15 @@ class Validator:
     HF_MODEL_PATTERN = re.compile(r'^[\w\-\.]+/[\w\-\.]+$')
     OLLAMA_MODEL_PATTERN = re.compile(r'^[\w\-\.:]+$')
     SAFE_PATH_PATTERN = re.compile(r'^[\w\-\./]+$')
+    UNSAFE_CHARS_PATTERN = re.compile(r'[^\w\-\.]')
+    UNDERSCORE_RUN_PATTERN = re.compile(r'_+')
+    
+    # Parameter count hints in model names, with their multiplier to billions
+    SIZE_PATTERNS = (
+        (re.compile(r'(\d+)b'), 1),  # e.g., "7b" -> multiply by 1
+        (re.compile(r'(\d+\.\d+)b'), 1),  # e.g., "6.7b" -> multiply by 1
+        (re.compile(r'(\d+)m'), 0.001),  # e.g., "350m" -> multiply by 0.001
+    )
     
     @classmethod
     def validate_hf_model_id(cls, model_id: str) -> bool:
@@ -222,10 +232,10 @@ class Validator:
             str: Sanitized string
         """
         # Remove or replace dangerous characters
-        sanitized = re.sub(r'[^\w\-\.]', '_', input_string)
+        sanitized = cls.UNSAFE_CHARS_PATTERN.sub('_', input_string)
         
         # Remove multiple underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
+        sanitized = cls.UNDERSCORE_RUN_PATTERN.sub('_', sanitized)
         
         # Remove leading/trailing underscores
         sanitized = sanitized.strip('_')
@@ -254,16 +264,15 @@ class Validator:
         Raises:
             ValidationError: If insufficient space
         """
-        import shutil
-        
         try:
-            stat = shutil.disk_usage(path)
-            available_gb = stat.free // (1024**3)
+            # One statvfs, counting only the blocks unprivileged users may use
+            st = os.statvfs(path)
+            available = st.f_frsize * st.f_bavail
             
-            if available_gb < required_gb:
+            if available < required_gb * (1 << 30):
                 raise ValidationError(
                     f"Insufficient disk space. Required: {required_gb}GB, "
-                    f"Available: {available_gb}GB"
+                    f"Available: {available >> 30}GB"
                 )
             
             return True
@@ -319,15 +328,8 @@ class Validator:
         # Extract size hints from model name
         model_lower = model_id.lower()
         
-        # Common size patterns
-        size_patterns = [
-            (r'(\d+)b', 1),  # e.g., "7b" -> multiply by 1
-            (r'(\d+\.\d+)b', 1),  # e.g., "6.7b" -> multiply by 1
-            (r'(\d+)m', 0.001),  # e.g., "350m" -> multiply by 0.001
-        ]
-        
-        for pattern, multiplier in size_patterns:
-            match = re.search(pattern, model_lower)
+        for pattern, multiplier in cls.SIZE_PATTERNS:
+            match = pattern.search(model_lower)
             if match:
                 size = float(match.group(1))
                 # Rough estimate: 2GB per billion parameters for fp16
@@ -352,6 +354,11 @@ class Validator:
 class SecurityValidator:
     """Security-focused validation for inputs to prevent common vulnerabilities."""
     
+    HF_MODEL_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9._-]+$')
+    OLLAMA_MODEL_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+(:[a-zA-Z0-9._-]+)?$')
+    URL_SCHEME_PATTERN = re.compile(r'(?:https?|ftp|file)://', re.IGNORECASE)
+    FILESYSTEM_UNSAFE_PATTERN = re.compile(r'[^a-zA-Z0-9._\-]')
+    
     @staticmethod
     def validate_path_traversal(path: str) -> bool:
         """Validate that a path doesn't contain directory traversal attempts.
@@ -383,6 +390,7 @@ class SecurityValidator:
         return True
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def validate_command_injection(input_str: str) -> bool:
         """Validate that input doesn't contain shell metacharacters.
         
@@ -431,7 +439,7 @@ class SecurityValidator:
         
         # Replace characters not in allowed set with underscores
         # Allowed: alphanumeric, dot, underscore, hyphen
-        sanitized = re.sub(r'[^a-zA-Z0-9._\-]', '_', name)
+        sanitized = SecurityValidator.FILESYSTEM_UNSAFE_PATTERN.sub('_', name)
         
         # Remove leading dots (hidden files) and trailing dots
         sanitized = sanitized.lstrip('.').rstrip('.')
@@ -450,6 +458,9 @@ class SecurityValidator:
     def validate_model_id(model_id: str, provider: str) -> Tuple[bool, str]:
         """Validate model ID based on provider-specific patterns.
         
+        The checks are pure, so their outcome is cached per (model_id,
+        provider); every rejection is still logged.
+        
         Args:
             model_id: Model identifier to validate
             provider: Provider type ('huggingface' or 'ollama')
@@ -457,17 +468,31 @@ class SecurityValidator:
         Returns:
             tuple: (is_valid, error_message) where error_message is empty if valid
         """
-        # Check for empty model ID
-        if not model_id:
-            error_msg = "Model ID cannot be empty"
+        error_msg = SecurityValidator._model_id_error(model_id, provider)
+        if error_msg:
             logger.warning(f"Validation failed: {error_msg}")
             return False, error_msg
+        return True, ""
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _model_id_error(model_id: str, provider: str) -> str:
+        """Run the validate_model_id checks.
+        
+        Args:
+            model_id: Model identifier to validate
+            provider: Provider type ('huggingface' or 'ollama')
+            
+        Returns:
+            str: Reason the model ID is rejected, empty if it is valid
+        """
+        # Check for empty model ID
+        if not model_id:
+            return "Model ID cannot be empty"
         
         # Check length constraint
         if len(model_id) > 256:
-            error_msg = f"Model ID exceeds maximum length of 256 characters: {len(model_id)}"
-            logger.warning(f"Validation failed: {error_msg}")
-            return False, error_msg
+            return f"Model ID exceeds maximum length of 256 characters: {len(model_id)}"
         
         # Check for command injection attempts
         dangerous_chars = [
@@ -477,43 +502,29 @@ class SecurityValidator:
         for char in dangerous_chars:
             if char in model_id:
                 char_repr = repr(char) if ord(char) < 32 else char
-                error_msg = (
+                return (
                     f"Model ID contains dangerous character {char_repr}: "
                     f"potential command injection attempt"
                 )
-                logger.warning(f"Validation failed: {error_msg}")
-                return False, error_msg
         
         # Check for path traversal attempts
         if '..' in model_id or model_id.startswith('/') or model_id.startswith('\\'):
-            error_msg = f"Model ID contains path traversal pattern: {model_id}"
-            logger.warning(f"Validation failed: {error_msg}")
-            return False, error_msg
+            return f"Model ID contains path traversal pattern: {model_id}"
         
         # Check for URL schemes that could be malicious
-        if any(scheme in model_id.lower() for scheme in ['http://', 'https://', 'ftp://', 'file://']):
-            error_msg = f"Model ID contains URL scheme: {model_id}"
-            logger.warning(f"Validation failed: {error_msg}")
-            return False, error_msg
+        if SecurityValidator.URL_SCHEME_PATTERN.search(model_id):
+            return f"Model ID contains URL scheme: {model_id}"
         
         # Provider-specific validation
         if provider.lower() == 'huggingface':
             # HuggingFace pattern: organization/model-name
-            pattern = re.compile(r'^[a-zA-Z0-9_-]+/[a-zA-Z0-9._-]+$')
-            if not pattern.match(model_id):
-                error_msg = f"Invalid HuggingFace model ID format: {model_id}. Expected pattern: 'organization/model-name'"
-                logger.warning(f"Validation failed: {error_msg}")
-                return False, error_msg
+            if not SecurityValidator.HF_MODEL_ID_PATTERN.match(model_id):
+                return f"Invalid HuggingFace model ID format: {model_id}. Expected pattern: 'organization/model-name'"
         elif provider.lower() == 'ollama':
             # Ollama pattern: model-name or model-name:tag
-            pattern = re.compile(r'^[a-zA-Z0-9_-]+(:[a-zA-Z0-9._-]+)?$')
-            if not pattern.match(model_id):
-                error_msg = f"Invalid Ollama model ID format: {model_id}. Expected pattern: 'model-name' or 'model-name:tag'"
-                logger.warning(f"Validation failed: {error_msg}")
-                return False, error_msg
+            if not SecurityValidator.OLLAMA_MODEL_ID_PATTERN.match(model_id):
+                return f"Invalid Ollama model ID format: {model_id}. Expected pattern: 'model-name' or 'model-name:tag'"
         else:
-            error_msg = f"Unknown provider: {provider}. Supported providers: 'huggingface', 'ollama'"
-            logger.warning(f"Validation failed: {error_msg}")
-            return False, error_msg
+            return f"Unknown provider: {provider}. Supported providers: 'huggingface', 'ollama'"
         
-        return True, ""
\ No newline at end of file
+        return ""
\ No newline at end of file
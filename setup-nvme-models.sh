@@ -26,42 +26,42 @@ sudo mkdir -p ${NVME_BASE}/{hf-cache,models,ollama}
 sudo chown -R ${USER_NAME}:${USER_NAME} ${NVME_BASE}
 echo "✓ Directories created and permissions set"
 
-# Step 2: Configure Hugging Face environment
-echo "Configuring Hugging Face environment..."
-
-# Add to user's bashrc
-if ! grep -q "HF_HOME=${NVME_BASE}/hf-cache" ~/.bashrc; then
-    cat >> ~/.bashrc << 'EOF'
-
-# Hugging Face NVMe cache configuration
-export HF_HOME=/mnt/nvme/hf-cache
-export TRANSFORMERS_CACHE=/mnt/nvme/hf-cache
-export HUGGINGFACE_HUB_CACHE=/mnt/nvme/hf-cache
-EOF
-    echo "✓ Added HF environment variables to ~/.bashrc"
+# Step 2: Configure Hugging Face and Ollama environment
+echo "Configuring Hugging Face and Ollama environment..."
+
+ENV_VARS=(
+    "HF_HOME=${NVME_BASE}/hf-cache"
+    "TRANSFORMERS_CACHE=${NVME_BASE}/hf-cache"
+    "HUGGINGFACE_HUB_CACHE=${NVME_BASE}/hf-cache"
+    "OLLAMA_MODELS=${NVME_BASE}/ollama"
+)
+
+# Print the given lines that are not already in a file, reading it once
+missing_lines() {
+    local file="$1"
+    shift
+    if [ -f "$file" ]; then
+        printf '%s\n' "$@" | grep -vxF -f "$file" || true
+    else
+        printf '%s\n' "$@"
+    fi
+}
+
+# Add to user's bashrc in a single append
+BASHRC_MISSING="$(missing_lines ~/.bashrc "${ENV_VARS[@]/#/export }")"
+if [ -n "$BASHRC_MISSING" ]; then
+    printf '\n# NVMe model cache configuration\n%s\n' "$BASHRC_MISSING" >> ~/.bashrc
+    echo "✓ Added environment variables to ~/.bashrc"
 else
-    echo "✓ HF environment variables already configured"
+    echo "✓ Environment variables already configured"
 fi
 
-# Add to system-wide environment
-if ! grep -q "HF_HOME=${NVME_BASE}/hf-cache" /etc/environment; then
+# Step 3: Add to system-wide environment with a single sudo tee
+ENVIRONMENT_MISSING="$(missing_lines /etc/environment "${ENV_VARS[@]}")"
+if [ -n "$ENVIRONMENT_MISSING" ]; then
     echo "Adding system-wide environment variables..."
-    echo "HF_HOME=${NVME_BASE}/hf-cache" | sudo tee -a /etc/environment
-    echo "TRANSFORMERS_CACHE=${NVME_BASE}/hf-cache" | sudo tee -a /etc/environment
-    echo "HUGGINGFACE_HUB_CACHE=${NVME_BASE}/hf-cache" | sudo tee -a /etc/environment
-    echo "✓ Added HF environment variables to /etc/environment"
-fi
-
-# Step 3: Configure Ollama
-echo "Configuring Ollama..."
-if ! grep -q "OLLAMA_MODELS=${NVME_BASE}/ollama" ~/.bashrc; then
-    echo "export OLLAMA_MODELS=${NVME_BASE}/ollama" >> ~/.bashrc
-    echo "✓ Added OLLAMA_MODELS to ~/.bashrc"
-fi
-
-if ! grep -q "OLLAMA_MODELS=${NVME_BASE}/ollama" /etc/environment; then
-    echo "OLLAMA_MODELS=${NVME_BASE}/ollama" | sudo tee -a /etc/environment
-    echo "✓ Added OLLAMA_MODELS to /etc/environment"
+    printf '%s\n' "$ENVIRONMENT_MISSING" | sudo tee -a /etc/environment
+    echo "✓ Added environment variables to /etc/environment"
 fi
 
 # Step 4: Create symlinks for compatibility
@@ -50,6 +50,12 @@ setup(
         "vllm": [
             "vllm>=0.2.0",
         ],
+        "fast": [
+            "orjson>=3.6.0",
+        ],
+        "ollama": [
+            "ollama>=0.2.0",
+        ],
     },
     entry_points={
         "console_scripts": [